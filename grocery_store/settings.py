@@ -50,13 +50,18 @@ REST_FRAMEWORK = {
 }
 
 MIDDLEWARE = [
+    'grocery_store_app.middleware.MetricsMiddleware',
+    'grocery_store_app.middleware.SlowQueryMiddleware',
+    'grocery_store_app.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'grocery_store_app.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'grocery_store_app.middleware.PricingMiddleware',
 ]
 
 ROOT_URLCONF = 'grocery_store.urls'
@@ -96,6 +101,29 @@ DATABASES = {
 }
 
 
+# The cached grids and prices are dropped by bumping version keys in the default cache,
+# so a deployment with several worker processes needs a shared backend such as Redis
+# or Memcached, `manage.py check --deploy` fails with the process-local default.
+CACHES = {
+    'default': {
+        'BACKEND': getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': getenv('CACHE_LOCATION', ''),
+    },
+}
+
+SQL_INSTRUMENTATION = getenv('SQL_INSTRUMENTATION', 'false').lower() == 'true'
+
+PROFILING_DIRECTORY = getenv('PROFILING_DIRECTORY', '')
+
+METRICS = getenv('METRICS', 'true').lower() == 'true'
+METRICS_DIRECTORY = getenv('METRICS_DIRECTORY', '')
+INTERNAL_IPS = getenv('INTERNAL_IPS', '127.0.0.1').split(',')
+
+SLOW_QUERY_THRESHOLD_MS = float(getenv('SLOW_QUERY_THRESHOLD_MS', '500'))
+SLOW_QUERY_EXPLAIN_RATE = float(getenv('SLOW_QUERY_EXPLAIN_RATE', '0.1'))
+SLOW_QUERY_LOG_SIZE = int(getenv('SLOW_QUERY_LOG_SIZE', '1000'))
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -3,7 +3,7 @@
 from django.contrib import admin
 
 from .models import (Category, Client, ClientToProduct, Product,
-                     ProductToPromotion, Promotion, Review)
+                     ProductToPromotion, Promotion, Review, SlowQuery)
 
 
 class ProductToPromotionInline(admin.TabularInline):
@@ -31,6 +31,9 @@ class ProductAdmin(admin.ModelAdmin):
 
     model = Product
     inlines = (ProductToPromotionInline, ClientToProductInline)
+    readonly_fields = (
+        'max_discount_amount', 'discounted_price', 'priced_on', 'rating_count', 'rating_sum',
+    )
 
 
 @admin.register(Promotion)
@@ -55,3 +58,36 @@ class ClientAdmin(admin.ModelAdmin):
 
     model = Client
     inlines = (ClientToProductInline,)
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Browse the slow queries in the admin panel without changing them."""
+
+    model = SlowQuery
+    list_display = ('created_datetime', 'duration', 'view', 'frame', 'sql')
+    list_filter = ('view',)
+    search_fields = ('sql', 'view', 'path')
+    readonly_fields = (
+        'created_datetime',
+        'duration',
+        'view',
+        'path',
+        'frame',
+        'sql',
+        'statement_arguments',
+        'stack',
+        'plan',
+    )
+
+    def has_add_permission(self, request):
+        """
+        Forbid adding slow queries by hand.
+
+        Args:
+            request (django.http.HttpRequest): The incoming HTTP request.
+
+        Returns:
+            bool: False.
+        """
+        return False
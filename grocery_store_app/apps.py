@@ -1,6 +1,7 @@
 """Apps module."""
 
 from django.apps import AppConfig
+from django.core import checks
 
 
 class GroceryStoreAppConfig(AppConfig):
@@ -8,3 +9,9 @@ class GroceryStoreAppConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'grocery_store_app'
+
+    def ready(self):
+        """Connect the signal receivers of the app and register its deployment checks."""
+        from . import signals  # noqa: F401, WPS433
+        from .checks import check_shared_cache  # noqa: WPS433
+        checks.register(check_shared_cache, checks.Tags.caches, deploy=True)
@@ -0,0 +1,166 @@
+"""Benchmarking module."""
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from statistics import quantiles
+from time import perf_counter
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY)
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.handlers.wsgi import WSGIHandler
+from django.middleware.csrf import CSRF_ALLOWED_CHARS, CSRF_SECRET_LENGTH
+from django.utils.crypto import get_random_string
+
+PERCENTILES = (50, 95, 99)
+
+
+def get_session_cookie(user) -> str:
+    """
+    Create a session of a logged in user.
+
+    Args:
+        user (django.contrib.auth.models.User): User of the session.
+
+    Returns:
+        str: Cookie with the session key.
+    """
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+
+
+def get_csrf_headers(session_cookie: str) -> dict[str, str]:
+    """
+    Build the headers of a client that passes the CSRF checks of POST requests.
+
+    Args:
+        session_cookie (str): Cookie with the session key.
+
+    Returns:
+        dict[str, str]: Cookie and CSRF token headers by their WSGI names.
+    """
+    secret = get_random_string(CSRF_SECRET_LENGTH, CSRF_ALLOWED_CHARS)
+    return {
+        'HTTP_COOKIE': f'{session_cookie}; {settings.CSRF_COOKIE_NAME}={secret}',
+        settings.CSRF_HEADER_NAME: secret,
+    }
+
+
+def get_host() -> str:
+    """
+    Get a host name the store accepts.
+
+    Returns:
+        str: First plain host of ALLOWED_HOSTS, localhost if there is none.
+    """
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+def get_environ(url: str, headers: dict[str, str], form: dict | None = None) -> dict:
+    """
+    Build the WSGI environment of a GET request, or of a POST request of a form.
+
+    Args:
+        url (str): Path with the query string.
+        headers (dict[str, str]): Request headers by their WSGI names.
+        form (dict | None): Posted form fields, a GET request if not given.
+
+    Returns:
+        dict: WSGI environment.
+    """
+    path, _, query_string = url.partition('?')
+    environ = {'PATH_INFO': path, 'QUERY_STRING': query_string, 'HTTP_HOST': get_host(), **headers}
+    if form is not None:
+        body = urlencode(form).encode()
+        environ.update({
+            'REQUEST_METHOD': 'POST',
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+        })
+    setup_testing_defaults(environ)
+    return environ
+
+
+def send(application: WSGIHandler, environ: dict) -> tuple[float, int]:
+    """
+    Send a request through the WSGI handler and read the whole response.
+
+    Args:
+        application (WSGIHandler): WSGI application of the store.
+        environ (dict): WSGI environment of the request, copied with a fresh copy of its input.
+
+    Returns:
+        tuple[float, int]: Latency in seconds and status code.
+    """
+    statuses = []
+    started = perf_counter()
+    response = application(
+        {**environ, 'wsgi.input': BytesIO(environ['wsgi.input'].getvalue())},
+        lambda status, _: statuses.append(status),
+    )
+    b''.join(response)
+    response.close()
+    return perf_counter() - started, int(statuses[0].split()[0])
+
+
+def get_latency_report(latencies: list[float], seconds: float) -> dict:
+    """
+    Summarize the latencies of the requests to a route.
+
+    A single latency is every percentile of itself.
+
+    Args:
+        latencies (list[float]): Latencies of the requests in seconds.
+        seconds (float): Wall time of all requests.
+
+    Returns:
+        dict: Number of requests, requests per second and latency percentiles in ms.
+    """
+    if len(latencies) == 1:
+        cut_points = latencies * max(PERCENTILES)
+    else:
+        cut_points = quantiles(latencies, n=100, method='inclusive')
+    return {
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / seconds, 1),
+        **{
+            f'p{percentile}_ms': round(cut_points[percentile - 1] * 1000, 2)
+            for percentile in PERCENTILES
+        },
+    }
+
+
+def load_route(environ: dict, requests: int, concurrency: int, warmup: int = 0) -> dict:
+    """
+    Send concurrent requests to a route in process after warming it up.
+
+    Every thread uses its own database connection, closed after each request
+    like under a WSGI server.
+
+    Args:
+        environ (dict): WSGI environment of the requests.
+        requests (int): Number of measured requests.
+        concurrency (int): Number of concurrent requests.
+        warmup (int): Number of unmeasured requests sent first.
+
+    Returns:
+        dict: Latency report with the number of failed requests.
+    """
+    application = WSGIHandler()
+    for _ in range(warmup):
+        send(application, environ)
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        responses = list(executor.map(lambda _: send(application, environ), range(requests)))
+    report = get_latency_report([latency for latency, _ in responses], perf_counter() - started)
+    report['errors'] = sum(status >= 400 for _, status in responses)
+    return report
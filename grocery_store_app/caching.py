@@ -0,0 +1,54 @@
+"""Caching module."""
+
+from contextlib import contextmanager
+from uuid import uuid4
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+CATALOG_VERSION_KEY = 'catalog-version'
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_version(version_key: str) -> str:
+    """
+    Get the current version of a group of cache keys.
+
+    Args:
+        version_key (str): Cache key of the version.
+
+    Returns:
+        str: Version to put into the keys of the group.
+    """
+    return cache.get_or_set(version_key, uuid4().hex, timeout=None)
+
+
+def bump_version(version_key: str) -> None:
+    """
+    Drop a group of cached values by switching its keys to a new version.
+
+    Args:
+        version_key (str): Cache key of the version.
+    """
+    cache.set(version_key, uuid4().hex, timeout=None)
+
+
+@contextmanager
+def isolated_cache():
+    """
+    Swap the default cache of the current thread for an empty private one.
+
+    Work that is rolled back, like the generated benchmark datasets, bumps the versions of
+    the private cache instead of dropping the cached values shared by the processes.
+
+    Yields:
+        LocMemCache: Private cache.
+    """
+    shared_cache = caches[DEFAULT_CACHE_ALIAS]
+    private_cache = LocMemCache(f'isolated-{uuid4().hex}', {})
+    caches[DEFAULT_CACHE_ALIAS] = private_cache
+    try:
+        yield private_cache
+    finally:
+        private_cache.clear()
+        caches[DEFAULT_CACHE_ALIAS] = shared_cache
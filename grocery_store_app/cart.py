@@ -0,0 +1,101 @@
+"""Cart module."""
+
+from uuid import UUID
+
+from .checkout import checkout
+from .models import Product
+from .pricing import get_product_prices
+
+CART_SESSION_KEY = 'cart'
+
+
+class Cart:
+    """Session-backed cart with quantities by product ids."""
+
+    def __init__(self, session):
+        """
+        Load the cart from the session.
+
+        Args:
+            session (django.contrib.sessions.backends.base.SessionBase): Session of the client.
+        """
+        self.session = session
+        self.quantities = dict(session.get(CART_SESSION_KEY, {}))
+
+    def add(self, product_id: str, quantity: int) -> bool:
+        """
+        Add a quantity of an existing product to the cart.
+
+        Args:
+            product_id (str): Id of the product.
+            quantity (int): Added quantity.
+
+        Returns:
+            bool: Whether the product exists and the quantity is positive.
+        """
+        try:
+            product_id = str(UUID(str(product_id)))
+        except ValueError:
+            return False
+        exists = quantity > 0 and Product.objects.filter(id=product_id).exists()
+        if exists:
+            self.quantities[product_id] = self.quantities.get(product_id, 0) + quantity
+            self.save()
+        return exists
+
+    def remove(self, product_id: str) -> None:
+        """
+        Remove a product from the cart.
+
+        Args:
+            product_id (str): Id of the product.
+        """
+        if self.quantities.pop(str(product_id), None) is not None:
+            self.save()
+
+    def save(self) -> None:
+        """Store the cart in the session."""
+        self.session[CART_SESSION_KEY] = self.quantities
+
+    def get_products(self):
+        """
+        Get the products of the cart with their current prices.
+
+        Returns:
+            QuerySet: Products of the cart with only the fields shown in the cart.
+        """
+        return Product.objects.filter(id__in=self.quantities).only(
+            'id', 'title', 'discounted_price',
+        )
+
+    def get_lines(self) -> list[tuple]:
+        """
+        Get the lines of the cart priced through the price cache.
+
+        Products deleted since they were added are left out.
+
+        Returns:
+            list[tuple]: Product ids, prices and quantities.
+        """
+        prices = get_product_prices(self.quantities)
+        return [
+            (product_id, prices[product_id], quantity)
+            for product_id, quantity in self.quantities.items()
+            if product_id in prices
+        ]
+
+    def checkout(self, user_id: int) -> bool:
+        """
+        Buy all lines of the cart in one statement and clear it on success.
+
+        Args:
+            user_id (int): Id of the user of the client.
+
+        Returns:
+            bool: Whether the client had enough money and the order was recorded.
+        """
+        ordered = checkout(user_id, self.get_lines())
+        if ordered:
+            self.quantities = {}
+            self.save()
+        return ordered
@@ -0,0 +1,196 @@
+"""Checkout module."""
+
+import logging
+from collections import Counter
+from decimal import Decimal
+from time import perf_counter
+from typing import Iterable
+
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
+
+from .metrics import ORDER_CANCELLATIONS, ORDERS, registry
+from .models import (QUANTITY_MAX, Client, ClientToProduct,
+                     get_current_datetime, uuid7)
+
+logger = logging.getLogger(__name__)
+
+CHECKOUT_SQL = """
+WITH line (id, product_id, price, quantity) AS (VALUES {lines}),
+debited AS (
+    UPDATE "grocery_store"."clients"
+    SET money = money - %s, modified_datetime = %s
+    WHERE user_id = %s AND money >= %s AND NOT EXISTS (
+        SELECT 1
+        FROM "grocery_store"."client_to_product" AS purchase
+        JOIN line ON purchase.product_id = line.product_id AND purchase.price = line.price
+        WHERE purchase.client_id = "grocery_store"."clients".id
+            AND purchase.quantity::integer + line.quantity > %s
+    )
+    RETURNING id
+)
+INSERT INTO "grocery_store"."client_to_product"
+    (id, client_id, product_id, price, quantity, created_datetime)
+SELECT line.id, debited.id, line.product_id, line.price, line.quantity, %s
+FROM debited CROSS JOIN line
+ON CONFLICT (client_id, product_id, price)
+DO UPDATE SET quantity = LEAST(
+    "grocery_store"."client_to_product".quantity::integer + EXCLUDED.quantity, %s
+)
+RETURNING id
+"""
+CHECKOUT_LINE_SQL = '(%s::uuid, %s::uuid, %s::numeric(6, 2), %s::smallint)'
+
+
+def merge_lines(lines: Iterable[tuple]) -> Counter:
+    """
+    Merge the lines of an order bought at the same price.
+
+    Args:
+        lines (Iterable[tuple]): Product ids, prices and quantities.
+
+    Returns:
+        Counter: Quantities by product ids and prices.
+    """
+    quantities = Counter()
+    for product_id, price, quantity in lines:
+        quantities[str(product_id), Decimal(price)] += quantity
+    return quantities
+
+
+def get_checkout_arguments(user_id: int, quantities: Counter) -> list:
+    """
+    Validate the lines of an order and build the arguments of the checkout statement.
+
+    A ValidationError is raised if a price or a merged quantity does not fit its column.
+
+    Args:
+        user_id (int): Id of the user of the client.
+        quantities (Counter): Quantities by product ids and prices.
+
+    Returns:
+        list: Arguments of the checkout statement.
+    """
+    total = sum(price * quantity for (_, price), quantity in quantities.items())
+    now = get_current_datetime()
+    statement_arguments = []
+    for (product_id, price), quantity in quantities.items():
+        ClientToProduct(price=price, quantity=quantity).clean_fields(
+            exclude=('id', 'client', 'product', 'created_datetime'),
+        )
+        statement_arguments.extend((uuid7(), product_id, price, quantity))
+    statement_arguments.extend((total, now, user_id, total, QUANTITY_MAX, now, QUANTITY_MAX))
+    return statement_arguments
+
+
+def checkout(user_id: int, lines: Iterable[tuple]) -> bool:
+    """
+    Debit the client and record the purchases in one statement.
+
+    The debit is a conditional update that matches no client without enough money,
+    so concurrent orders cannot overdraw the client, and the purchases are upserted
+    on the unique client, product and price key. Orders with invalid lines or that would
+    push a purchased quantity over QUANTITY_MAX are declined.
+
+    Args:
+        user_id (int): Id of the user of the client.
+        lines (Iterable[tuple]): Product ids, prices and quantities of the order.
+
+    Returns:
+        bool: Whether the client had enough money and the order was recorded.
+    """
+    started = perf_counter()
+    quantities = merge_lines(lines)
+    if not quantities:
+        return False
+    try:
+        statement_arguments = get_checkout_arguments(user_id, quantities)
+    except ValidationError:
+        statement_arguments = None
+    ordered = False
+    if statement_arguments is not None:
+        sql = CHECKOUT_SQL.format(lines=', '.join(CHECKOUT_LINE_SQL for _ in quantities))
+        with connection.cursor() as cursor:
+            cursor.execute(sql, statement_arguments)
+            ordered = bool(cursor.fetchall())
+    registry.increment(ORDERS, (('result', 'ordered' if ordered else 'declined'),))
+    logger.info(
+        'Checkout of %d lines by user %s: ordered=%s in %.2f ms',
+        len(quantities),
+        user_id,
+        ordered,
+        (perf_counter() - started) * 1000,
+    )
+    return ordered
+
+
+def get_returns(purchases: models.QuerySet, quantity: int) -> list[tuple]:
+    """
+    Pick the purchased items to return, starting from the newest purchase.
+
+    Args:
+        purchases (models.QuerySet): Purchases of a product by a client.
+        quantity (int): Requested returned quantity.
+
+    Returns:
+        list[tuple]: Purchases and their returned quantities.
+    """
+    returns = []
+    for purchase in purchases.order_by('-created_datetime', '-price'):
+        if quantity <= 0:
+            break
+        returned_quantity = min(quantity, purchase.quantity)
+        returns.append((purchase, returned_quantity))
+        quantity -= returned_quantity
+    return returns
+
+
+def cancel(
+    user_id: int, product_id: str, quantity: int, price: Decimal | None = None,
+) -> Decimal:
+    """
+    Return purchased items of a product and refund the prices they were bought at.
+
+    Args:
+        user_id (int): Id of the user of the client.
+        product_id (str): Id of the product.
+        quantity (int): Requested returned quantity.
+        price (Decimal | None): Only return items bought at this price, if given.
+
+    Returns:
+        Decimal: Refunded money.
+    """
+    started = perf_counter()
+    purchases = ClientToProduct.objects.select_for_update().filter(
+        client__user_id=user_id, product_id=product_id,
+    )
+    if price is not None:
+        purchases = purchases.filter(price=price)
+    with transaction.atomic():
+        returns = get_returns(purchases, quantity)
+        refund = sum(
+            (purchase.price * returned_quantity for purchase, returned_quantity in returns),
+            Decimal(0),
+        )
+        emptied_ids = []
+        for purchase, returned_quantity in returns:
+            if returned_quantity == purchase.quantity:
+                emptied_ids.append(purchase.id)
+                continue
+            ClientToProduct.objects.filter(id=purchase.id).update(
+                quantity=models.F('quantity') - returned_quantity,
+            )
+        ClientToProduct.objects.filter(id__in=emptied_ids).delete()
+        if refund:
+            Client.objects.filter(user_id=user_id).update(
+                money=models.F('money') + refund, modified_datetime=get_current_datetime(),
+            )
+    registry.increment(ORDER_CANCELLATIONS, amount=len(returns))
+    logger.info(
+        'Cancel of %d purchases by user %s: refund=%s in %.2f ms',
+        len(returns),
+        user_id,
+        refund,
+        (perf_counter() - started) * 1000,
+    )
+    return refund
@@ -0,0 +1,31 @@
+"""Checks module."""
+
+from django.conf import settings
+from django.core import checks
+
+PROCESS_LOCAL_CACHE_BACKENDS = frozenset((
+    'django.core.cache.backends.locmem.LocMemCache',
+))
+
+
+def check_shared_cache(app_configs, **kwargs) -> list[checks.CheckMessage]:
+    """
+    Check that the default cache is shared by the worker processes.
+
+    The cached grids and prices are dropped by bumping a version key in the default cache,
+    and a bump in a process-local cache never reaches the other workers.
+
+    Args:
+        app_configs (list | None): Checked app configs, all of them if None.
+        **kwargs: Arbitrary keyword arguments.
+
+    Returns:
+        list[checks.CheckMessage]: Error if the default cache is process-local.
+    """
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+    return [checks.Error(
+        'The default cache is process-local, so other workers keep serving stale content.',
+        hint='Set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis or Memcached.',
+        id='grocery_store_app.E001',
+    )]
@@ -0,0 +1,138 @@
+"""Exporting module."""
+
+import csv
+import json
+from types import MappingProxyType
+from typing import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from . import models
+
+EXPORT_FORMATS = MappingProxyType({
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+})
+EXPORT_CHUNK_SIZE = 2000
+PRODUCT_COLUMNS = (
+    'id',
+    'title',
+    'description',
+    'price',
+    'discounted_price',
+    'max_discount_amount',
+    'image',
+    'category_id',
+    'category__title',
+    'rating_count',
+    'rating_sum',
+    'created_datetime',
+    'modified_datetime',
+)
+PROMOTION_COLUMNS = (
+    'id',
+    'title',
+    'description',
+    'discount_amount',
+    'start_date',
+    'end_date',
+    'image',
+    'created_datetime',
+    'modified_datetime',
+)
+REVIEW_COLUMNS = (
+    'id',
+    'product_id',
+    'client_id',
+    'rating',
+    'text',
+    'created_datetime',
+    'modified_datetime',
+)
+PURCHASE_COLUMNS = ('id', 'client_id', 'product_id', 'price', 'quantity', 'created_datetime')
+EXPORTS = MappingProxyType({
+    'products': (models.Product, PRODUCT_COLUMNS),
+    'promotions': (models.Promotion, PROMOTION_COLUMNS),
+    'reviews': (models.Review, REVIEW_COLUMNS),
+    'purchases': (models.ClientToProduct, PURCHASE_COLUMNS),
+})
+
+
+class EchoBuffer:
+    """File-like object that returns what is written instead of storing it."""
+
+    def write(self, line: str) -> str:
+        """
+        Return the written line.
+
+        Args:
+            line (str): Written line.
+
+        Returns:
+            str: The same line.
+        """
+        return line
+
+
+def iter_export_rows(name: str) -> Iterator[tuple]:
+    """
+    Stream the rows of an export from the database in chunks.
+
+    Args:
+        name (str): Name of the export, one of EXPORTS.
+
+    Returns:
+        Iterator[tuple]: Iterator over the rows with the columns of the export.
+    """
+    model_class, columns = EXPORTS[name]
+    return model_class.objects.order_by().values_list(*columns).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE,
+    )
+
+
+def iter_csv(name: str) -> Iterator[str]:
+    """
+    Stream an export as CSV lines with a header.
+
+    Args:
+        name (str): Name of the export, one of EXPORTS.
+
+    Yields:
+        str: CSV line.
+    """
+    writer = csv.writer(EchoBuffer())
+    yield writer.writerow(EXPORTS[name][1])
+    yield from (writer.writerow(row) for row in iter_export_rows(name))
+
+
+def iter_ndjson(name: str) -> Iterator[str]:
+    """
+    Stream an export as newline delimited JSON objects.
+
+    Args:
+        name (str): Name of the export, one of EXPORTS.
+
+    Yields:
+        str: JSON line.
+    """
+    columns = EXPORTS[name][1]
+    yield from (
+        f'{json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder)}\n'
+        for row in iter_export_rows(name)
+    )
+
+
+def iter_export(name: str, file_format: str) -> Iterator[str]:
+    """
+    Stream an export in a format.
+
+    Args:
+        name (str): Name of the export, one of EXPORTS.
+        file_format (str): Format of the export, one of EXPORT_FORMATS.
+
+    Returns:
+        Iterator[str]: Iterator over the lines of the export.
+    """
+    if file_format == 'csv':
+        return iter_csv(name)
+    return iter_ndjson(name)
@@ -0,0 +1,382 @@
+"""Generating module."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from random import Random
+from typing import Callable, Iterable, Iterator
+from uuid import uuid4
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from . import models
+from .caching import CATALOG_VERSION_KEY, bump_version
+from .importing import iter_chunks
+from .pricing import refresh_product_prices
+
+GENERATION_BATCH_SIZE = 5000
+GENERATED_CATEGORY_TITLES = (
+    'Колбасы',
+    'Молочные продукты',
+    'Соки',
+    'Сыры',
+    'Хлеб',
+    'Овощи',
+    'Фрукты',
+    'Мясо',
+    'Рыба',
+    'Крупы',
+    'Напитки',
+    'Сладости',
+)
+RATING_WEIGHTS = (5, 5, 10, 30, 50)
+QUANTITY_WEIGHTS = (60, 20, 10, 5, 5)
+DISCOUNT_AMOUNTS = (5, 10, 15, 20, 25, 30, 50)
+HISTORY_SECONDS = 365 * 24 * 60 * 60
+PROMOTION_MAX_PRODUCTS = 50
+
+
+def get_dataset_sizes(rows: int) -> dict[str, int]:
+    """
+    Split a number of rows between the tables like in a grown store.
+
+    Args:
+        rows (int): Approximate number of generated rows.
+
+    Returns:
+        dict[str, int]: Numbers of generated rows by their kinds.
+    """
+    return {
+        'clients': max(rows // 50, 2),
+        'products': max(rows // 100, 10),
+        'promotions': max(rows // 1000, 3),
+        'reviews': rows * 3 // 10,
+        'purchases': rows * 6 // 10,
+    }
+
+
+def pick_skewed(rng: Random, population: list, skew: float):
+    """
+    Pick an item with the first items of the population being the most popular.
+
+    Args:
+        rng (Random): Seeded random generator.
+        population (list): Items to pick from.
+        skew (float): Power of the skew, 1 picks uniformly.
+
+    Returns:
+        Any: Picked item.
+    """
+    return population[int(len(population) * rng.random() ** skew)]
+
+
+def get_past_datetime(rng: Random, now: datetime) -> datetime:
+    """
+    Pick a moment of the last year.
+
+    Args:
+        rng (Random): Seeded random generator.
+        now (datetime): Current datetime.
+
+    Returns:
+        datetime: Moment of the last year.
+    """
+    return now - timedelta(seconds=rng.randrange(HISTORY_SECONDS))
+
+
+def build_products(rng: Random, size: int, categories: list) -> list[models.Product]:
+    """
+    Build products with log-normally distributed prices, around 150 RUB.
+
+    Args:
+        rng (Random): Seeded random generator.
+        size (int): Number of products.
+        categories (list): Categories of the products.
+
+    Returns:
+        list[models.Product]: Unsaved products.
+    """
+    products = []
+    for number in range(size):
+        category = rng.choice(categories)
+        price = min(max(rng.lognormvariate(5, 1), 1), 9999)
+        products.append(models.Product(
+            title=f'{category.title} {number}',
+            price=Decimal(f'{price:.2f}'),
+            category=category,
+        ))
+    return products
+
+
+def build_promotions(rng: Random, size: int, now: datetime) -> list[models.Promotion]:
+    """
+    Build promotions of the last year and the next month.
+
+    Every second promotion starts during the previous one, so their discounts stack.
+
+    Args:
+        rng (Random): Seeded random generator.
+        size (int): Number of promotions.
+        now (datetime): Current datetime.
+
+    Returns:
+        list[models.Promotion]: Unsaved promotions.
+    """
+    promotions = []
+    for number in range(size):
+        if number % 2:
+            previous = promotions[-1]
+            start_date = previous.start_date + timedelta(
+                days=rng.randint(0, (previous.end_date - previous.start_date).days),
+            )
+        else:
+            start_date = (now + timedelta(days=rng.randint(-365, 30))).date()
+        promotions.append(models.Promotion(
+            title=f'Promotion {number}',
+            discount_amount=rng.choice(DISCOUNT_AMOUNTS),
+            start_date=start_date,
+            end_date=start_date + timedelta(days=rng.randint(1, 60)),
+        ))
+    return promotions
+
+
+def iter_product_promotions(rng: Random, promotions: list, products: list) -> Iterator:
+    """
+    Link every promotion to a random sample of products.
+
+    Args:
+        rng (Random): Seeded random generator.
+        promotions (list): Promoted promotions.
+        products (list): Products to sample.
+
+    Yields:
+        models.ProductToPromotion: Unsaved link.
+    """
+    for promotion in promotions:
+        size = rng.randint(1, min(PROMOTION_MAX_PRODUCTS, len(products)))
+        yield from (
+            models.ProductToPromotion(product=product, promotion=promotion)
+            for product in rng.sample(products, size)
+        )
+
+
+def iter_reviews(rng: Random, size: int, products: list, client_ids: list) -> Iterator:
+    """
+    Generate mostly positive reviews, most of them on a few popular products.
+
+    Args:
+        rng (Random): Seeded random generator.
+        size (int): Number of reviews.
+        products (list): Reviewed products, the first ones the most popular.
+        client_ids (list): Ids of the reviewing clients.
+
+    Yields:
+        models.Review: Unsaved review.
+    """
+    now = models.get_current_datetime()
+    for number in range(size):
+        created_datetime = get_past_datetime(rng, now)
+        yield models.Review(
+            text=f'Review {number}',
+            rating=rng.choices(range(1, 6), RATING_WEIGHTS)[0],
+            product=pick_skewed(rng, products, 3),
+            client_id=rng.choice(client_ids),
+            created_datetime=created_datetime,
+            modified_datetime=created_datetime,
+        )
+
+
+def iter_purchases(rng: Random, size: int, products: list, client_ids: list) -> Iterator:
+    """
+    Generate the purchase histories of regular and occasional clients.
+
+    Some purchases are made at a discount, and repeated purchases of a product
+    at the same price by a client are left out by the unique key.
+
+    Args:
+        rng (Random): Seeded random generator.
+        size (int): Number of purchases.
+        products (list): Bought products, the first ones the most popular.
+        client_ids (list): Ids of the buying clients, the first ones the most regular.
+
+    Yields:
+        models.ClientToProduct: Unsaved purchase.
+    """
+    now = models.get_current_datetime()
+    for _ in range(size):
+        product = pick_skewed(rng, products, 2)
+        discount_amount = rng.choice(DISCOUNT_AMOUNTS) if rng.randrange(10) < 3 else 0
+        yield models.ClientToProduct(
+            client_id=pick_skewed(rng, client_ids, 2),
+            product=product,
+            price=models.get_discounted_price(product.price, discount_amount),
+            quantity=rng.choices(range(1, 6), QUANTITY_WEIGHTS)[0],
+            created_datetime=get_past_datetime(rng, now),
+        )
+
+
+class DatasetGenerator:
+    """Generator of a realistic store written with bulk_create in batches."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        batch_size: int = GENERATION_BATCH_SIZE,
+        progress: Callable[[str, int, int], None] | None = None,
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            seed (int): Seed of the random generator.
+            batch_size (int): Number of rows per insert.
+            progress (Callable | None): Callback with a table name, written and total rows.
+        """
+        self.rng = Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress or (lambda *_: None)
+
+    def generate(self, rows: int) -> dict[str, int]:
+        """
+        Generate the store, refresh its ratings and prices and drop the cached catalog.
+
+        Args:
+            rows (int): Approximate number of generated rows.
+
+        Returns:
+            dict[str, int]: Numbers of generated rows by their kinds, the purchases
+                without the repeated ones left out by the unique key.
+        """
+        sizes = get_dataset_sizes(rows)
+        client_ids = self.create_clients(sizes['clients'])
+        products = self.create_catalog(sizes)
+        self.write(
+            models.Review,
+            iter_reviews(self.rng, sizes['reviews'], products, client_ids),
+            sizes['reviews'],
+        )
+        sizes['purchases'] = self.write(
+            models.ClientToProduct,
+            iter_purchases(self.rng, sizes['purchases'], products, client_ids),
+            sizes['purchases'],
+        )
+        models.Product.objects.rebuild_ratings()
+        refresh_product_prices()
+        bump_version(CATALOG_VERSION_KEY)
+        return sizes
+
+    def create_clients(self, size: int) -> list:
+        """
+        Create users without usable passwords and their clients.
+
+        The users get unique names with a random prefix, so a database can hold
+        several generated datasets.
+
+        Args:
+            size (int): Number of clients.
+
+        Returns:
+            list: Ids of the clients.
+        """
+        prefix = uuid4().hex[:8]
+        users = [
+            User(username=f'generated-{prefix}-{number}', password=make_password(None))
+            for number in range(size)
+        ]
+        self.write(User, users, size)
+        clients = [
+            models.Client(user=user, money=Decimal(self.rng.randrange(100000))) for user in users
+        ]
+        self.write(models.Client, clients, size)
+        return [client.id for client in clients]
+
+    def create_catalog(self, sizes: dict[str, int]) -> list[models.Product]:
+        """
+        Create the categories, the products and the promotions of the products.
+
+        Args:
+            sizes (dict[str, int]): Numbers of generated rows by their kinds.
+
+        Returns:
+            list[models.Product]: Created products.
+        """
+        categories = self.create_categories()
+        products = build_products(self.rng, sizes['products'], categories)
+        self.write(models.Product, products, len(products))
+        promotions = build_promotions(
+            self.rng, sizes['promotions'], models.get_current_datetime(),
+        )
+        self.write(models.Promotion, promotions, len(promotions))
+        links = list(iter_product_promotions(self.rng, promotions, products))
+        self.write(models.ProductToPromotion, links, len(links))
+        return products
+
+    def create_categories(self) -> list[models.Category]:
+        """
+        Create the generated categories missing from the store and reuse the existing ones.
+
+        Category titles are not unique, so the categories are matched by title like
+        the imported ones, and repeated runs do not add copies of them.
+
+        Returns:
+            list[models.Category]: Categories in the order of GENERATED_CATEGORY_TITLES.
+        """
+        categories_by_title = {
+            category.title: category
+            for category in models.Category.objects.filter(
+                title__in=GENERATED_CATEGORY_TITLES,
+            ).order_by('-created_datetime', '-id')
+        }
+        missing = [
+            models.Category(title=title)
+            for title in GENERATED_CATEGORY_TITLES if title not in categories_by_title
+        ]
+        self.write(models.Category, missing, len(missing))
+        categories_by_title.update((category.title, category) for category in missing)
+        return [categories_by_title[title] for title in GENERATED_CATEGORY_TITLES]
+
+    def write(self, model_class: type, instances: Iterable, total: int) -> int:
+        """
+        Insert instances with bulk_create in batches and report the progress after each one.
+
+        Every batch is committed on its own. Conflicts on unique keys are skipped,
+        except for users whose ids are needed by their clients, so the inserted rows
+        of every batch are counted by their ids.
+
+        Args:
+            model_class (type): Model class of the instances.
+            instances (Iterable): Unsaved instances.
+            total (int): Number of instances.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        written = 0
+        for batch in iter_chunks(instances, self.batch_size):
+            model_class.objects.bulk_create(batch, ignore_conflicts=model_class is not User)
+            written += model_class.objects.filter(
+                pk__in=[instance.pk for instance in batch],
+            ).count()
+            self.progress(model_class.__name__, written, total)
+        return written
+
+
+def generate_dataset(
+    rows: int,
+    seed: int = 0,
+    batch_size: int = GENERATION_BATCH_SIZE,
+    progress: Callable[[str, int, int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Generate a realistic store of a given scale, the same for the same seed.
+
+    Args:
+        rows (int): Approximate number of generated rows.
+        seed (int): Seed of the random generator.
+        batch_size (int): Number of rows per insert.
+        progress (Callable | None): Callback with a table name, written and total rows.
+
+    Returns:
+        dict[str, int]: Numbers of generated rows by their kinds.
+    """
+    return DatasetGenerator(seed, batch_size, progress).generate(rows)
@@ -0,0 +1,187 @@
+"""Importing module."""
+
+import csv
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+
+from . import models
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+ROW_ERRORS = (KeyError, TypeError, ValueError, InvalidOperation, ValidationError)
+
+
+def read_rows(path: str, file_format: str) -> Iterator[dict[str, Any]]:
+    """
+    Stream the rows of a CSV file with a header or of a JSON Lines file.
+
+    Args:
+        path (str): Path to the file.
+        file_format (str): Format of the file, one of IMPORT_FORMATS.
+
+    Yields:
+        dict[str, Any]: Row of the file by column names.
+    """
+    with open(path, encoding='utf-8', newline='') as import_file:
+        if file_format == 'csv':
+            yield from csv.DictReader(import_file)
+            return
+        for line in import_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_chunks(rows: Iterable, chunk_size: int) -> Iterator[list]:
+    """
+    Split rows into chunks without reading ahead of the current chunk.
+
+    Args:
+        rows (Iterable): Rows to split.
+        chunk_size (int): Maximum number of rows in a chunk.
+
+    Yields:
+        list: Chunk of rows.
+    """
+    rows = iter(rows)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, chunk_size))
+
+
+def build_product(
+    row: dict[str, Any], category_ids: dict[str, Any], today: date,
+) -> models.Product:
+    """
+    Build a validated, priced product from an imported row.
+
+    Args:
+        row (dict[str, Any]): Row with title, price, category and optional description and image.
+        category_ids (dict[str, Any]): Category ids by their titles.
+        today (date): Date the product is priced on.
+
+    Returns:
+        models.Product: Unsaved product.
+
+    Raises:
+        ValueError: If the row has no title.
+    """
+    if not row['title']:
+        raise ValueError('The title is required')
+    price = Decimal(str(row['price']))
+    models.check_price(price)
+    return models.Product(
+        title=row['title'],
+        description=row.get('description') or None,
+        price=price,
+        image=row.get('image') or models.DEFAULT_IMAGE,
+        category_id=category_ids[row['category']],
+        discounted_price=models.get_discounted_price(price, 0),
+        priced_on=today,
+    )
+
+
+def build_promotion(row: dict[str, Any], today: date) -> models.Promotion:
+    """
+    Build a validated promotion from an imported row.
+
+    Args:
+        row (dict[str, Any]): Row with title, discount amount and optional description and dates.
+        today (date): Default start and end date.
+
+    Returns:
+        models.Promotion: Unsaved promotion.
+
+    Raises:
+        ValueError: If the row has no title or ends before it starts.
+    """
+    if not row['title']:
+        raise ValueError('The title is required')
+    discount_amount = int(row['discount_amount'])
+    models.check_discount_amount(discount_amount)
+    start_date = date.fromisoformat(row['start_date']) if row.get('start_date') else today
+    end_date = date.fromisoformat(row['end_date']) if row.get('end_date') else start_date
+    models.check_start_date(start_date)
+    models.check_end_date(end_date)
+    if start_date > end_date:
+        raise ValueError('The end date should be greater than or equal to the start date')
+    return models.Promotion(
+        title=row['title'],
+        description=row.get('description') or None,
+        discount_amount=discount_amount,
+        start_date=start_date,
+        end_date=end_date,
+        image=row.get('image') or models.DEFAULT_IMAGE,
+    )
+
+
+class ProductImporter:
+    """Builder of products that resolves categories by title through an in-memory map."""
+
+    model = models.Product
+
+    def __init__(self):
+        """Load the ids of the existing categories by their titles."""
+        self.category_ids = dict(models.Category.objects.values_list('title', 'id'))
+
+    def build(self, chunk: list[dict], first_row: int) -> tuple[list, list[str]]:
+        """
+        Build the products of a chunk, creating missing categories in bulk.
+
+        Args:
+            chunk (list[dict]): Imported rows.
+            first_row (int): Number of the first row of the chunk.
+
+        Returns:
+            tuple[list, list[str]]: Valid products and errors of the invalid rows.
+        """
+        titles = {row.get('category') for row in chunk} - self.category_ids.keys() - {None, ''}
+        categories = models.Category.objects.bulk_create(
+            [models.Category(title=title) for title in titles],
+        )
+        self.category_ids.update((category.title, category.id) for category in categories)
+        products, errors = [], []
+        today = models.get_current_date()
+        for row_number, row in enumerate(chunk, start=first_row):
+            try:
+                products.append(build_product(row, self.category_ids, today))
+            except ROW_ERRORS as error:
+                errors.append(f'row {row_number}: {error!r}')
+        return products, errors
+
+
+class PromotionImporter:
+    """Builder of promotions."""
+
+    model = models.Promotion
+
+    def build(self, chunk: list[dict], first_row: int) -> tuple[list, list[str]]:
+        """
+        Build the promotions of a chunk.
+
+        Args:
+            chunk (list[dict]): Imported rows.
+            first_row (int): Number of the first row of the chunk.
+
+        Returns:
+            tuple[list, list[str]]: Valid promotions and errors of the invalid rows.
+        """
+        promotions, errors = [], []
+        today = models.get_current_date()
+        for row_number, row in enumerate(chunk, start=first_row):
+            try:
+                promotions.append(build_promotion(row, today))
+            except ROW_ERRORS as error:
+                errors.append(f'row {row_number}: {error!r}')
+        return promotions, errors
+
+
+IMPORTERS = MappingProxyType({
+    'products': ProductImporter,
+    'promotions': PromotionImporter,
+})
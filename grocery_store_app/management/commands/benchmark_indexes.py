@@ -0,0 +1,139 @@
+"""Benchmark indexes command module."""
+
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from grocery_store_app.caching import isolated_cache
+from grocery_store_app.generating import generate_dataset
+from grocery_store_app.models import (Category, Client, ClientToProduct,
+                                      Product, ProductToPromotion, Promotion,
+                                      Review, get_current_date)
+from grocery_store_app.pricing import get_active_promotions
+
+INDEXED_MODELS = (Product, Promotion, Review)
+GENERATED_MODELS = (
+    User, Client, Category, Product, Promotion, ProductToPromotion, Review, ClientToProduct,
+)
+LOCKS_WARNING = ' '.join((
+    'The indexes are dropped inside the transaction, which holds ACCESS EXCLUSIVE locks',
+    'on the products, promotions and reviews until the benchmark ends.',
+))
+
+
+def get_benchmark_queries() -> dict:
+    """
+    Build the hot lookups of the store for a generated purchase and the most reviewed product.
+
+    Returns:
+        dict: Querysets by their descriptions.
+    """
+    today = get_current_date()
+    purchase = ClientToProduct.objects.order_by('-created_datetime').first()
+    product_id = purchase.product_id
+    reviewed_product_id = Product.objects.order_by('-rating_count').values_list(
+        'id', flat=True,
+    ).first()
+    return {
+        'Active promotions of a product': get_active_promotions(today).filter(
+            product_id=product_id,
+        ).select_related('promotion'),
+        'Active promotions': Promotion.objects.filter(start_date__lte=today, end_date__gte=today),
+        'Newest reviews of a product': Review.objects.filter(
+            product_id=reviewed_product_id,
+        ).order_by('-created_datetime', 'id')[:11],
+        'Top rated reviews of a product': Review.objects.filter(
+            product_id=reviewed_product_id,
+        ).order_by('-rating')[:10],
+        'Purchase of a product at a price': ClientToProduct.objects.filter(
+            client_id=purchase.client_id, product_id=product_id, price=purchase.price,
+        ),
+        'Stale discounted products': Product.objects.filter(
+            priced_on__lt=today, max_discount_amount__gt=0,
+        ),
+    }
+
+
+def analyze_tables() -> None:
+    """Refresh the planner statistics of the generated tables."""
+    with connection.cursor() as cursor:
+        for model_class in GENERATED_MODELS:
+            cursor.execute(f'ANALYZE {model_class._meta.db_table}')
+
+
+def drop_indexes() -> None:
+    """Drop the indexes declared on the models and refresh the planner statistics."""
+    with connection.schema_editor() as editor:
+        for model_class in INDEXED_MODELS:
+            for index in model_class._meta.indexes:
+                editor.remove_index(model_class, index)
+    analyze_tables()
+
+
+class Command(BaseCommand):
+    """Compare the query plans of the hot lookups with and without the lookup indexes."""
+
+    help = ' '.join((
+        'Generate the store in a rolled back transaction and explain the hot lookups.',
+        LOCKS_WARNING,
+        'Run it on a scratch database and confirm with --i-know-this-locks.',
+    ))
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser of the command arguments.
+        """
+        parser.add_argument('--rows', type=int, default=1000000, help='Reviews and purchases')
+        parser.add_argument(
+            '--i-know-this-locks',
+            action='store_true',
+            help='Confirm that the tables of the database can be locked for the whole run',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Generate the store, explain the lookups, drop the indexes and explain them again.
+
+        Nothing is kept: the generated rows and the dropped indexes are rolled back, and the
+        cache versions bumped by the generation are kept in a private cache.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Raises:
+            CommandError: If locking the tables is not confirmed.
+        """
+        if not options['i_know_this_locks']:
+            raise CommandError(f'{LOCKS_WARNING} Confirm it with --i-know-this-locks.')
+        with isolated_cache():
+            with transaction.atomic():
+                started = perf_counter()
+                sizes = generate_dataset(options['rows'])
+                analyze_tables()
+                self.stdout.write(f'Generated {sizes} in {perf_counter() - started:.1f} s')
+                queries = get_benchmark_queries()
+                indexed_plans = self.explain(queries)
+                drop_indexes()
+                plans = zip(queries, self.explain(queries), indexed_plans)
+                for description, plan_before, plan_after in plans:
+                    self.stdout.write(self.style.MIGRATE_HEADING(description))
+                    self.stdout.write(f'Before:\n{plan_before}\nAfter:\n{plan_after}\n')
+                transaction.set_rollback(True)
+
+    def explain(self, queries):
+        """
+        Run and explain the lookups.
+
+        Args:
+            queries (dict): Querysets by their descriptions.
+
+        Returns:
+            list[str]: Plans with the execution times of the lookups.
+        """
+        return [queryset.explain(analyze=True) for queryset in queries.values()]
@@ -0,0 +1,122 @@
+"""Benchmark load command module."""
+
+import json
+from types import MappingProxyType
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Value
+from django.db.models.functions import Greatest
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from grocery_store_app.benchmarking import (get_csrf_headers, get_environ,
+                                            get_session_cookie, load_route)
+from grocery_store_app.generating import generate_dataset
+from grocery_store_app.models import (Client, ClientToProduct,
+                                      ProductToPromotion)
+from grocery_store_app.pricing import get_product_price
+
+REST_ROUTES = ('product-list', 'category-list', 'promotion-list', 'review-list')
+POSTED_FORMS = MappingProxyType({'order': MappingProxyType({'quantity': 1})})
+
+
+def get_benchmark_urls(purchase: ClientToProduct) -> dict[str, str]:
+    """
+    Build the urls of the main routes around a purchase of a generated client.
+
+    Args:
+        purchase (ClientToProduct): Purchase whose client, product and promotions are browsed.
+
+    Returns:
+        dict[str, str]: Urls by the names of their routes.
+    """
+    product_id = purchase.product_id
+    promotion_id = ProductToPromotion.objects.filter(product_id=product_id).values_list(
+        'promotion_id', flat=True,
+    ).first()
+    return {
+        'products': reverse('products'),
+        'product': f"{reverse('product')}?id={product_id}",
+        'category': f"{reverse('category')}?id={purchase.product.category_id}",
+        'promotion': f"{reverse('promotion')}?id={promotion_id}",
+        'profile': reverse('profile'),
+        'order': f"{reverse('order')}?id={product_id}",
+        **{route: reverse(route) for route in REST_ROUTES},
+    }
+
+
+def fund_orders(purchase: ClientToProduct, orders: int) -> None:
+    """
+    Give the client of a purchase the money to order its product again.
+
+    Args:
+        purchase (ClientToProduct): Purchase whose client orders its product.
+        orders (int): Number of orders of one item.
+    """
+    total = get_product_price(purchase.product_id) * orders
+    Client.objects.filter(pk=purchase.client_id).update(money=Greatest('money', Value(total)))
+
+
+class Command(BaseCommand):
+    """Measure the throughput and latency of the main routes under concurrent load."""
+
+    help = 'Drive the main routes concurrently through the WSGI handler and report JSON'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser of the command arguments.
+        """
+        parser.add_argument('--rows', type=int, default=0, help='Generate approximate rows')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per route')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent requests')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests')
+
+    def handle(self, *args, **options):
+        """
+        Generate a dataset if asked, load every route in turn and print the report.
+
+        The generated rows are committed, so later runs can reuse them with --rows 0. The order
+        route checks out one item per request, so the client is funded for the orders and
+        keeps the bought items.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Raises:
+            CommandError: If no requests are asked or the store has no purchases to browse.
+        """
+        if options['requests'] < 1:
+            raise CommandError('Send at least one request per route with --requests')
+        if options['rows']:
+            generate_dataset(options['rows'])
+        purchase = ClientToProduct.objects.select_related('client__user', 'product').order_by(
+            '-created_datetime',
+        ).first()
+        if purchase is None:
+            raise CommandError('The store has no purchases, generate them with --rows')
+        fund_orders(purchase, options['requests'] + options['warmup'])
+        user = purchase.client.user
+        headers = {
+            **get_csrf_headers(get_session_cookie(user)),
+            'HTTP_AUTHORIZATION': f'Token {Token.objects.get_or_create(user=user)[0].key}',
+        }
+        routes = {
+            route: load_route(
+                get_environ(url, headers, POSTED_FORMS.get(route)),
+                options['requests'],
+                options['concurrency'],
+                options['warmup'],
+            )
+            for route, url in get_benchmark_urls(purchase).items()
+        }
+        report = {
+            'purchases': ClientToProduct.objects.count(),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'routes': routes,
+        }
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,79 @@
+"""Benchmark serializers command module."""
+
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from grocery_store_app.benchmarking import get_host
+from grocery_store_app.urls import router
+
+BENCHMARKED_PREFIXES = ('categories', 'products', 'promotions', 'reviews')
+
+
+def time_view(view, url: str, requests: int) -> tuple[float, bytes]:
+    """
+    Time the rendered responses of a view to the same request.
+
+    Args:
+        view (callable): View function of a viewset action.
+        url (str): Url of the request.
+        requests (int): Number of timed requests.
+
+    Returns:
+        tuple[float, bytes]: Milliseconds per response and the content of the last one.
+    """
+    request_factory = APIRequestFactory(HTTP_HOST=get_host())
+    user = User(username='benchmark')
+    started = perf_counter()
+    for _ in range(requests):
+        request = request_factory.get(url)
+        force_authenticate(request, user=user)
+        content = view(request).render().content
+    return (perf_counter() - started) * 1000 / requests, content
+
+
+class Command(BaseCommand):
+    """Compare the REST lists served by the values serializers and the serializers."""
+
+    help = 'Time the REST lists of the store with and without the values serializers'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser of the command arguments.
+        """
+        parser.add_argument('--requests', type=int, default=50, help='Requests per list')
+        parser.add_argument('--page-size', type=int, default=100, help='Instances per page')
+
+    def handle(self, *args, **options):
+        """
+        Time every list both ways and check that the responses are identical.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the two ways respond differently.
+        """
+        viewsets = {prefix: viewset for prefix, viewset, _ in router.registry}
+        for prefix in BENCHMARKED_PREFIXES:
+            url = f'/rest/{prefix}/?page_size={options["page_size"]}'
+            serializer_milliseconds, serializer_content = time_view(
+                viewsets[prefix].as_view({'get': 'list'}, values_serializer_class=None),
+                url,
+                options['requests'],
+            )
+            values_milliseconds, values_content = time_view(
+                viewsets[prefix].as_view({'get': 'list'}), url, options['requests'],
+            )
+            if values_content != serializer_content:
+                raise CommandError(f'The values serializer changed the response of {url}')
+            self.stdout.write(self.style.MIGRATE_HEADING(url))
+            self.stdout.write(f'Serializer: {serializer_milliseconds:.1f} ms per response')
+            self.stdout.write(f'Values serializer: {values_milliseconds:.1f} ms per response')
+            self.stdout.write(f'Speedup: {serializer_milliseconds / values_milliseconds:.1f}x')
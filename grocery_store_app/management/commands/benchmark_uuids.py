@@ -0,0 +1,92 @@
+"""Benchmark UUIDs command module."""
+
+from time import perf_counter
+from types import MappingProxyType
+from typing import Callable
+from uuid import UUID, uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from grocery_store_app.models import uuid7
+
+UUID_GENERATORS = MappingProxyType({
+    'uuid4': uuid4,
+    'uuid7': uuid7,
+})
+CREATE_TABLE_SQL = """
+CREATE TEMPORARY TABLE uuid_benchmark (
+    LIKE "grocery_store"."reviews" INCLUDING DEFAULTS,
+    PRIMARY KEY (id)
+)
+"""
+INSERT_SQL = """
+INSERT INTO uuid_benchmark (
+    id, created_datetime, modified_datetime, text, rating, product_id, client_id
+)
+SELECT id, now(), now(), 'Benchmark review', 5, %s, %s
+FROM unnest(%s::uuid[]) AS id
+"""
+PRIMARY_KEY_SIZE_SQL = "SELECT pg_relation_size('uuid_benchmark_pkey')"
+BYTES_IN_MEGABYTE = 1024 * 1024
+
+
+class Command(BaseCommand):
+    """Compare the insert throughput of random and time-ordered primary keys."""
+
+    help = 'Insert reviews into a temporary keyed copy of their table with uuid4 and uuid7 ids'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser of the command arguments.
+        """
+        parser.add_argument('--rows', type=int, default=1000000, help='Inserted rows')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows per insert')
+
+    def handle(self, *args, **options):
+        """
+        Insert the rows with every generator and print the throughput and index size.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+        """
+        rows = options['rows']
+        for name, generator in UUID_GENERATORS.items():
+            seconds, primary_key_size = self.insert(
+                generator, rows, options['batch_size'],
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f'{rows} rows in {seconds:.2f} s, {rows / seconds:.0f} rows/s')
+            self.stdout.write(f'Primary key: {primary_key_size / BYTES_IN_MEGABYTE:.1f} MB')
+
+    def insert(self, generator: Callable[[], UUID], rows: int, batch_size: int) -> tuple:
+        """
+        Insert rows with ids of a generator into a fresh temporary table.
+
+        Only the inserts are timed, the ids of a batch are generated before it.
+
+        Args:
+            generator (Callable[[], UUID]): Generator of the ids.
+            rows (int): Number of inserted rows.
+            batch_size (int): Number of rows per insert.
+
+        Returns:
+            tuple: Seconds spent inserting and size of the primary key in bytes.
+        """
+        seconds = 0
+        product_id, client_id = uuid4(), uuid4()
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_TABLE_SQL)
+            for batch_start in range(0, rows, batch_size):
+                ids = [generator() for _ in range(min(batch_size, rows - batch_start))]
+                started = perf_counter()
+                cursor.execute(INSERT_SQL, [product_id, client_id, ids])
+                seconds += perf_counter() - started
+            cursor.execute(PRIMARY_KEY_SIZE_SQL)
+            primary_key_size = cursor.fetchone()[0]
+            cursor.execute('DROP TABLE uuid_benchmark')
+        return seconds, primary_key_size
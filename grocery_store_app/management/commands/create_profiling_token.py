@@ -0,0 +1,24 @@
+"""Create profiling token command module."""
+
+from django.core.management.base import BaseCommand
+
+from grocery_store_app.profiling import (PROFILING_HEADER,
+                                         PROFILING_TOKEN_MAX_AGE,
+                                         create_profiling_token)
+
+
+class Command(BaseCommand):
+    """Sign a token that makes the server profile the requests carrying it."""
+
+    help = 'Print a signed X-Profile header for profiling requests'
+
+    def handle(self, *args, **options):
+        """
+        Print the header with a fresh token.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+        """
+        self.stdout.write(f'{PROFILING_HEADER}: {create_profiling_token()}')
+        self.stdout.write(f'Valid for {PROFILING_TOKEN_MAX_AGE // 3600} hours')
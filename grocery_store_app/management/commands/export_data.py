@@ -0,0 +1,38 @@
+"""Export data command module."""
+
+from django.core.management.base import BaseCommand
+
+from grocery_store_app.exporting import EXPORT_FORMATS, EXPORTS, iter_export
+
+
+class Command(BaseCommand):
+    """Stream a table of the store to a CSV or newline delimited JSON file."""
+
+    help = 'Stream products, promotions, reviews or purchases as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser of the command arguments.
+        """
+        parser.add_argument('name', choices=tuple(EXPORTS))
+        parser.add_argument('--format', choices=tuple(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--output', help='Path to the output file, stdout if omitted')
+
+    def handle(self, *args, **options):
+        """
+        Write the export line by line.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+        """
+        lines = iter_export(options['name'], options['format'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            output.writelines(lines)
@@ -0,0 +1,46 @@
+"""Generate data command module."""
+
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from grocery_store_app.generating import (GENERATION_BATCH_SIZE,
+                                          generate_dataset)
+
+
+class Command(BaseCommand):
+    """Fill the store with a realistic generated dataset of a chosen scale."""
+
+    help = 'Generate categories, products, promotions, clients, reviews and purchases'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser of the command arguments.
+        """
+        parser.add_argument('--rows', type=int, default=100000, help='Approximate rows')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator')
+        parser.add_argument('--batch-size', type=int, default=GENERATION_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        """
+        Generate the dataset and report the progress after every batch.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+        """
+        started = perf_counter()
+
+        def report_progress(table: str, written: int, total: int) -> None:
+            elapsed = perf_counter() - started
+            self.stdout.write(f'{table}: {written} of {total} rows after {elapsed:.1f} s')
+
+        sizes = generate_dataset(
+            options['rows'], options['seed'], options['batch_size'], report_progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {sizes} in {perf_counter() - started:.1f} s',
+        ))
@@ -0,0 +1,91 @@
+"""Import catalog command module."""
+
+from functools import partial
+from itertools import islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from grocery_store_app.caching import CATALOG_VERSION_KEY, bump_version
+from grocery_store_app.importing import (IMPORT_FORMATS, IMPORTERS,
+                                         iter_chunks, read_rows)
+
+
+class Command(BaseCommand):
+    """Stream products or promotions from a CSV or JSON Lines file into the database."""
+
+    help = 'Import products or promotions from a CSV or JSON Lines file in chunks'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser of the command arguments.
+        """
+        parser.add_argument('path', help='Path to the imported file')
+        parser.add_argument('--kind', choices=tuple(IMPORTERS), required=True)
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='By extension if omitted')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--start-row', type=int, default=0, help='Number of rows to skip')
+        parser.add_argument('--skip-invalid', action='store_true', help='Skip invalid rows')
+
+    def handle(self, *args, **options):
+        """
+        Import the file chunk by chunk and report the progress.
+
+        Every chunk is committed on its own, so a failed import is resumed with --start-row.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+        """
+        file_format = options['format']
+        if not file_format:
+            file_format = 'jsonl' if options['path'].endswith('.jsonl') else 'csv'
+        importer = IMPORTERS[options['kind']]()
+        row_number = options['start_row']
+        rows = islice(read_rows(options['path'], file_format), row_number, None)
+        imported = 0
+        started = perf_counter()
+        for chunk in iter_chunks(rows, options['chunk_size']):
+            imported += self.import_chunk(importer, chunk, row_number, options['skip_invalid'])
+            row_number += len(chunk)
+            rate = imported / (perf_counter() - started)
+            self.stdout.write(
+                f'Imported {imported} from {row_number} rows ({rate:.0f} rows/s)',
+            )
+        self.stdout.write(self.style.SUCCESS(f'Imported {imported} {options["kind"]}'))
+
+    def import_chunk(self, importer, chunk, row_number, skip_invalid):
+        """
+        Validate and write a chunk of rows in one transaction.
+
+        bulk_create sends no signals, so the cached catalog is dropped once the chunk commits.
+
+        Args:
+            importer (Any): Builder of the imported instances.
+            chunk (list[dict]): Imported rows.
+            row_number (int): Number of the first row of the chunk.
+            skip_invalid (bool): Whether to skip invalid rows instead of failing the chunk.
+
+        Returns:
+            int: Number of imported instances.
+
+        Raises:
+            CommandError: If the chunk has invalid rows or cannot be written.
+        """
+        resume_hint = f'Resume the import with --start-row {row_number}'
+        try:
+            with transaction.atomic():
+                instances, errors = importer.build(chunk, row_number)
+                if errors and not skip_invalid:
+                    raise CommandError('\n'.join([*errors, resume_hint]))
+                importer.model.objects.bulk_create(instances)
+                transaction.on_commit(partial(bump_version, CATALOG_VERSION_KEY))
+        except DatabaseError as database_error:
+            raise CommandError(f'{database_error}\n{resume_hint}') from database_error
+        for error in errors:
+            self.stderr.write(f'Skipped {error}')
+        return len(instances)
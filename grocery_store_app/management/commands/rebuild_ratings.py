@@ -0,0 +1,22 @@
+"""Rebuild ratings command module."""
+
+from django.core.management.base import BaseCommand
+
+from grocery_store_app.models import Product
+
+
+class Command(BaseCommand):
+    """Recompute the stored rating aggregates of every product from its reviews."""
+
+    help = 'Recompute the stored rating aggregates of every product from its reviews'
+
+    def handle(self, *args, **options):
+        """
+        Rebuild the rating aggregates of all products.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+        """
+        updated = Product.objects.rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt ratings of {updated} products'))
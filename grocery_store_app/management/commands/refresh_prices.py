@@ -0,0 +1,22 @@
+"""Refresh prices command module."""
+
+from django.core.management.base import BaseCommand
+
+from grocery_store_app.pricing import refresh_product_prices
+
+
+class Command(BaseCommand):
+    """Recompute the best active discount and the discounted price of every product."""
+
+    help = 'Recompute the best active discount and the discounted price of every product'
+
+    def handle(self, *args, **options):
+        """
+        Reprice all products.
+
+        Args:
+            *args: Variable length argument list.
+            **options: Command options.
+        """
+        repriced = refresh_product_prices()
+        self.stdout.write(self.style.SUCCESS(f'Repriced {repriced} products'))
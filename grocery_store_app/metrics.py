@@ -0,0 +1,380 @@
+"""Metrics module."""
+
+import fcntl
+import json
+import os
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock, get_ident
+from time import monotonic
+from types import MappingProxyType
+from typing import Iterator
+from uuid import uuid4
+
+from django.conf import settings
+
+REQUEST_DURATION = 'grocery_store_request_duration_seconds'
+DB_QUERIES = 'grocery_store_db_queries_total'
+DB_DURATION = 'grocery_store_db_duration_seconds_total'
+CACHE_REQUESTS = 'grocery_store_cache_requests_total'
+CACHE_HIT_RATIO = 'grocery_store_cache_hit_ratio'
+ORDERS = 'grocery_store_orders_total'
+ORDER_CANCELLATIONS = 'grocery_store_order_cancellations_total'
+FUNDS_ADDITIONS = 'grocery_store_funds_additions_total'
+FUNDS_ADDED = 'grocery_store_funds_added_rubles_total'
+METRIC_FAMILIES = MappingProxyType({
+    REQUEST_DURATION: ('histogram', 'Duration of the requests by URL name.'),
+    DB_QUERIES: ('counter', 'SQL statements executed by the requests by URL name.'),
+    DB_DURATION: ('counter', 'Time spent in SQL statements by the requests by URL name.'),
+    CACHE_REQUESTS: ('counter', 'Cache lookups by cache and result.'),
+    CACHE_HIT_RATIO: ('gauge', 'Share of the cache lookups that were hits.'),
+    ORDERS: ('counter', 'Checkouts by result.'),
+    ORDER_CANCELLATIONS: ('counter', 'Cancelled purchases of products.'),
+    FUNDS_ADDITIONS: ('counter', 'Additions of funds by the clients.'),
+    FUNDS_ADDED: ('counter', 'Funds added by the clients.'),
+})
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_FLUSH_SECONDS = 5
+METRICS_LOCK_FILE = '.lock'
+METRICS_AGGREGATE_FILE = 'stopped.json'
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsDirectory:
+    """
+    Files of the counters of the worker processes sharing the METRICS_DIRECTORY.
+
+    Every running process has a file named after its pid, and the counters of
+    the stopped processes are folded into one aggregate file.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Use a directory, creating it if it is missing.
+
+        Args:
+            path (Path): Path of the directory.
+        """
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def lock(self, operation: int) -> Iterator[None]:
+        """
+        Hold a lock on the directory, released when the lock file is closed.
+
+        Args:
+            operation (int): fcntl.LOCK_SH to read the files or fcntl.LOCK_EX to fold them.
+
+        Yields:
+            None: While the lock is held.
+        """
+        with open(self.path / METRICS_LOCK_FILE, 'a') as lock_file:
+            fcntl.flock(lock_file, operation)
+            yield
+
+    def read(self, name: str) -> Counter:
+        """
+        Read the counters of a file.
+
+        Args:
+            name (str): Name of the file.
+
+        Returns:
+            Counter: Values by metric names and labels.
+        """
+        return Counter({
+            (metric_name, tuple(tuple(label) for label in labels)): amount
+            for metric_name, labels, amount in json.loads((self.path / name).read_text())
+        })
+
+    def write(self, name: str, samples: Counter) -> None:
+        """
+        Replace a file at once, so the readers never see it half written.
+
+        Args:
+            name (str): Name of the file.
+            samples (Counter): Values by metric names and labels.
+        """
+        temporary_path = self.path / f'.{os.getpid()}-{get_ident()}.tmp'
+        temporary_path.write_text(json.dumps([
+            [metric_name, labels, amount] for (metric_name, labels), amount in samples.items()
+        ]))
+        os.replace(temporary_path, self.path / name)
+
+    def is_stopped(self, name: str) -> bool:
+        """
+        Check whether the process of a file is stopped.
+
+        Args:
+            name (str): Name of the file, starting with the pid of its process.
+
+        Returns:
+            bool: Whether no process has the pid, of this user or another one.
+        """
+        try:
+            os.kill(int(name.split('-')[0]), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+    def fold_stopped_processes(self) -> None:
+        """
+        Add the counters of the stopped processes to the aggregate file and delete their files.
+
+        The directory then holds a file per running process and the aggregate file,
+        however often the workers are recycled.
+        """
+        with self.lock(fcntl.LOCK_EX):
+            stopped_paths = [
+                path for path in self.path.glob('*-*.json') if self.is_stopped(path.name)
+            ]
+            if not stopped_paths:
+                return
+            samples = Counter()
+            if (self.path / METRICS_AGGREGATE_FILE).exists():
+                samples = self.read(METRICS_AGGREGATE_FILE)
+            for stopped_path in stopped_paths:
+                samples.update(self.read(stopped_path.name))
+            self.write(METRICS_AGGREGATE_FILE, samples)
+            for stopped_file in stopped_paths:
+                stopped_file.unlink()
+
+    def collect(self) -> Counter:
+        """
+        Sum the counters of the files.
+
+        Returns:
+            Counter: Values by metric names and labels.
+        """
+        samples = Counter()
+        with self.lock(fcntl.LOCK_SH):
+            for path in self.path.glob('*.json'):
+                samples.update(self.read(path.name))
+        return samples
+
+
+def get_metrics_directory() -> MetricsDirectory | None:
+    """
+    Get the directory shared by the worker processes from the METRICS_DIRECTORY setting.
+
+    Returns:
+        MetricsDirectory | None: Directory of the metrics files or None if every process
+            reports alone.
+    """
+    directory = getattr(settings, 'METRICS_DIRECTORY', '')
+    return MetricsDirectory(Path(directory)) if directory else None
+
+
+class MetricsRegistry:
+    """
+    Counters of a process shared by its threads.
+
+    The counters are updated and collected under a lock, so their memory only
+    grows with the number of metrics and labels, not with the number of threads.
+    """
+
+    def __init__(self):
+        """Start with no samples."""
+        self.lock = Lock()
+        self.samples = Counter()
+        self.flushed = monotonic()
+        self.file_name = ''
+
+    def increment(self, name: str, labels: tuple = (), amount: float = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Name of the metric.
+            labels (tuple): Pairs of label names and values.
+            amount (float): Added amount.
+        """
+        with self.lock:
+            self.samples[name, labels] += amount
+
+    def observe(self, name: str, labels: tuple, amount: float) -> None:
+        """
+        Add an observation to a histogram with REQUEST_DURATION_BUCKETS.
+
+        Args:
+            name (str): Name of the metric.
+            labels (tuple): Pairs of label names and values.
+            amount (float): Observed amount.
+        """
+        with self.lock:
+            for bucket in REQUEST_DURATION_BUCKETS:
+                bucket_labels = (*labels, ('le', str(bucket)))
+                self.samples[f'{name}_bucket', bucket_labels] += int(amount <= bucket)
+            self.samples[f'{name}_bucket', (*labels, ('le', '+Inf'))] += 1
+            self.samples[f'{name}_count', labels] += 1
+            self.samples[f'{name}_sum', labels] += amount
+
+    def collect(self) -> Counter:
+        """
+        Copy the counters of the process.
+
+        Returns:
+            Counter: Values by metric names and labels.
+        """
+        with self.lock:
+            return Counter(self.samples)
+
+    def name_process_file(self, directory: MetricsDirectory) -> str:
+        """
+        Name the file of the process in the METRICS_DIRECTORY.
+
+        The name is unique to the process, so a later process reusing its pid
+        gets a file of its own and does not overwrite the counters of this one.
+        When a process names its file, it folds the files of the stopped processes.
+
+        Args:
+            directory (MetricsDirectory): Directory of the metrics files.
+
+        Returns:
+            str: Name of the file.
+        """
+        pid = os.getpid()
+        if not self.file_name.startswith(f'{pid}-'):
+            self.file_name = f'{pid}-{uuid4().hex}.json'
+            directory.fold_stopped_processes()
+        return self.file_name
+
+    def flush(self) -> None:
+        """Write the counters of the process to its file in the METRICS_DIRECTORY."""
+        directory = get_metrics_directory()
+        if directory is None:
+            return
+        self.flushed = monotonic()
+        directory.write(self.name_process_file(directory), self.collect())
+
+    def flush_periodically(self) -> None:
+        """Flush the counters if METRICS_FLUSH_SECONDS passed since the last flush."""
+        if monotonic() - self.flushed >= METRICS_FLUSH_SECONDS:
+            self.flush()
+
+
+registry = MetricsRegistry()
+
+
+def collect_metrics() -> Counter:
+    """
+    Sum the counters of all processes sharing the METRICS_DIRECTORY.
+
+    The counters of stopped processes are kept in the aggregate file, so they never decrease.
+
+    Returns:
+        Counter: Values by metric names and labels, of this process only without a directory.
+    """
+    directory = get_metrics_directory()
+    if directory is None:
+        return registry.collect()
+    registry.flush()
+    return directory.collect()
+
+
+def record_cache_lookups(cache_name: str, hits: int, lookups: int) -> None:
+    """
+    Count the hits and the misses of a batch of cache lookups.
+
+    Args:
+        cache_name (str): Name of the cache.
+        hits (int): Number of found keys.
+        lookups (int): Number of looked up keys.
+    """
+    registry.increment(CACHE_REQUESTS, (('cache', cache_name), ('result', 'hit')), hits)
+    registry.increment(CACHE_REQUESTS, (('cache', cache_name), ('result', 'miss')), lookups - hits)
+
+
+def escape_label_value(label_value) -> str:
+    """
+    Escape a label value for the text exposition format.
+
+    Args:
+        label_value (Any): Value of a label.
+
+    Returns:
+        str: Value with escaped backslashes, quotes and line breaks.
+    """
+    return str(label_value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def format_labels(labels: tuple) -> str:
+    """
+    Format labels in the text exposition format.
+
+    Args:
+        labels (tuple): Pairs of label names and values.
+
+    Returns:
+        str: Labels in braces or an empty string without labels.
+    """
+    if not labels:
+        return ''
+    formatted = ','.join(
+        f'{label_name}="{escape_label_value(label_value)}"' for label_name, label_value in labels
+    )
+    return f'{{{formatted}}}'
+
+
+def add_cache_hit_ratios(samples: Counter) -> None:
+    """
+    Add the hit ratio gauges of the caches with lookups.
+
+    Args:
+        samples (Counter): Values by metric names and labels.
+    """
+    lookups = Counter()
+    hits = Counter()
+    for (name, labels), amount in list(samples.items()):
+        if name == CACHE_REQUESTS:
+            cache_labels = tuple(label for label in labels if label[0] != 'result')
+            lookups[cache_labels] += amount
+            hits[cache_labels] += amount if ('result', 'hit') in labels else 0
+    for labels_of_cache, lookups_of_cache in lookups.items():
+        samples[CACHE_HIT_RATIO, labels_of_cache] = hits[labels_of_cache] / lookups_of_cache
+
+
+def get_sample_order(sample: tuple) -> tuple:
+    """
+    Order the samples by their names and labels, with the histogram buckets by their bounds.
+
+    Args:
+        sample (tuple): Name and labels of a sample.
+
+    Returns:
+        tuple: Sort key of the sample.
+    """
+    name, labels = sample
+    return name, [
+        (label_name, float(label_value) if label_name == 'le' else 0, str(label_value))
+        for label_name, label_value in labels
+    ]
+
+
+def render_metrics(samples: Counter) -> str:
+    """
+    Render the samples of the known metric families in the text exposition format.
+
+    Args:
+        samples (Counter): Values by metric names and labels.
+
+    Returns:
+        str: Metrics page.
+    """
+    add_cache_hit_ratios(samples)
+    ordered_samples = sorted(samples, key=get_sample_order)
+    lines = []
+    for family, (family_type, description) in METRIC_FAMILIES.items():
+        lines.append(f'# HELP {family} {description}')
+        lines.append(f'# TYPE {family} {family_type}')
+        names = {family, f'{family}_bucket', f'{family}_count', f'{family}_sum'}
+        lines.extend(
+            f'{name}{format_labels(labels)} {float(samples[name, labels])}'
+            for name, labels in ordered_samples
+            if name in names
+        )
+    return '\n'.join((*lines, ''))
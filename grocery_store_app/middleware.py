@@ -0,0 +1,305 @@
+"""Middleware module."""
+
+import logging
+from collections import Counter
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .metrics import DB_DURATION, DB_QUERIES, REQUEST_DURATION, registry
+from .pricing import refresh_stale_prices
+from .profiling import (PROFILING_HEADER, get_profile_directory,
+                        is_profiling_requested, profile_request)
+from .slow_queries import SlowQueryRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class PricingMiddleware:
+    """Keep stored product prices valid when promotions start or end."""
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (callable): Next handler in the middleware chain.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Reprice stale products before handling the request.
+
+        Args:
+            request (django.http.HttpRequest): The incoming HTTP request.
+
+        Returns:
+            django.http.HttpResponse: Response of the next handler.
+        """
+        refresh_stale_prices()
+        return self.get_response(request)
+
+
+class QueryTimer:
+    """Execute wrapper that counts and times the SQL statements of a request."""
+
+    def __init__(self):
+        """Start with no recorded statements."""
+        self.count = 0
+        self.seconds = 0
+
+    def __call__(self, execute, sql, statement_arguments, *execute_args):
+        """
+        Execute a statement and record its duration.
+
+        Args:
+            execute (callable): Next executor in the chain of wrappers.
+            sql (str): SQL of the statement.
+            statement_arguments (list | dict | None): Arguments of the statement.
+            *execute_args: Whether the statement is executed many times and its context.
+
+        Returns:
+            Any: Result of the executor.
+        """
+        started = perf_counter()
+        statement_result = execute(sql, statement_arguments, *execute_args)
+        self.record(sql, statement_arguments, perf_counter() - started)
+        return statement_result
+
+    def record(self, sql: str, statement_arguments, seconds: float) -> None:
+        """
+        Record an executed statement.
+
+        Args:
+            sql (str): SQL of the statement.
+            statement_arguments (list | dict | None): Arguments of the statement.
+            seconds (float): Duration of the statement.
+        """
+        self.count += 1
+        self.seconds += seconds
+
+
+class QueryRecorder(QueryTimer):
+    """Query timer that also finds the slowest and the repeated statements."""
+
+    def __init__(self):
+        """Start with no recorded statements."""
+        super().__init__()
+        self.slowest_seconds = 0
+        self.slowest_sql = ''
+        self.statements = Counter()
+
+    def record(self, sql: str, statement_arguments, seconds: float) -> None:
+        """
+        Record an executed statement.
+
+        Only hashes of the statements are kept to find the duplicates.
+
+        Args:
+            sql (str): SQL of the statement.
+            statement_arguments (list | dict | None): Arguments of the statement.
+            seconds (float): Duration of the statement.
+        """
+        super().record(sql, statement_arguments, seconds)
+        self.statements[hash((sql, repr(statement_arguments)))] += 1
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_sql = sql
+
+    @property
+    def duplicates(self) -> int:
+        """
+        Count the statements repeated with the same SQL and arguments.
+
+        Returns:
+            int: Number of repeated executions.
+        """
+        return sum(count - 1 for count in self.statements.values())
+
+    def get_server_timing(self) -> str:
+        """
+        Describe the recorded statements as Server-Timing metrics without their SQL.
+
+        Returns:
+            str: Value of the Server-Timing header.
+        """
+        return ', '.join((
+            f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"',
+            f'db-duplicates;desc="{self.duplicates}"',
+            f'db-slowest;dur={self.slowest_seconds * 1000:.2f}',
+        ))
+
+
+class QueryInstrumentationMiddleware:
+    """Report the SQL statements of every request in a header and a log line."""
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware if SQL_INSTRUMENTATION is enabled.
+
+        Args:
+            get_response (callable): Next handler in the middleware chain.
+
+        Raises:
+            MiddlewareNotUsed: If SQL_INSTRUMENTATION is disabled.
+        """
+        if not getattr(settings, 'SQL_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Record the statements executed while handling the request.
+
+        Statements of a streamed response body run after the middleware returns
+        and are not recorded.
+
+        Args:
+            request (django.http.HttpRequest): The incoming HTTP request.
+
+        Returns:
+            django.http.HttpResponse: Response of the next handler with Server-Timing.
+        """
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        server_timing = recorder.get_server_timing()
+        if response.has_header('Server-Timing'):
+            server_timing = f'{response["Server-Timing"]}, {server_timing}'
+        response['Server-Timing'] = server_timing
+        logger.info(
+            'SQL of %s %s: queries=%d time=%.2f ms duplicates=%d slowest=%.2f ms sql=%s',
+            request.method,
+            request.path,
+            recorder.count,
+            recorder.seconds * 1000,
+            recorder.duplicates,
+            recorder.slowest_seconds * 1000,
+            recorder.slowest_sql,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'queries': recorder.count,
+                'duration_ms': recorder.seconds * 1000,
+                'duplicates': recorder.duplicates,
+                'slowest_ms': recorder.slowest_seconds * 1000,
+                'slowest_sql': recorder.slowest_sql,
+            },
+        )
+        return response
+
+
+class ProfilingMiddleware:
+    """Profile the requests asking for it and save their profiles."""
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware if PROFILING_DIRECTORY is set.
+
+        Args:
+            get_response (callable): Next handler in the middleware chain.
+
+        Raises:
+            MiddlewareNotUsed: If PROFILING_DIRECTORY is not set.
+        """
+        if get_profile_directory() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Profile the request if it carries a signed X-Profile header or comes from the staff.
+
+        Args:
+            request (django.http.HttpRequest): The incoming HTTP request.
+
+        Returns:
+            django.http.HttpResponse: Response of the next handler with the profile name.
+        """
+        if not is_profiling_requested(request):
+            return self.get_response(request)
+        response, name = profile_request(self.get_response, request)
+        if name is not None:
+            response[PROFILING_HEADER] = name
+        return response
+
+
+class MetricsMiddleware:
+    """Count the requests, their durations and SQL statements by URL name."""
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware if METRICS is enabled.
+
+        Args:
+            get_response (callable): Next handler in the middleware chain.
+
+        Raises:
+            MiddlewareNotUsed: If METRICS is disabled.
+        """
+        if not getattr(settings, 'METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Record the duration and the statements of the request.
+
+        Args:
+            request (django.http.HttpRequest): The incoming HTTP request.
+
+        Returns:
+            django.http.HttpResponse: Response of the next handler.
+        """
+        timer = QueryTimer()
+        started = perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        resolver_match = request.resolver_match
+        labels = (('view', resolver_match.url_name if resolver_match else 'unresolved'),)
+        registry.observe(REQUEST_DURATION, labels, perf_counter() - started)
+        registry.increment(DB_QUERIES, labels, timer.count)
+        registry.increment(DB_DURATION, labels, timer.seconds)
+        registry.flush_periodically()
+        return response
+
+
+class SlowQueryMiddleware:
+    """Store the statements slower than SLOW_QUERY_THRESHOLD_MS with their plans."""
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware if SLOW_QUERY_THRESHOLD_MS is positive.
+
+        Args:
+            get_response (callable): Next handler in the middleware chain.
+
+        Raises:
+            MiddlewareNotUsed: If SLOW_QUERY_THRESHOLD_MS is not positive.
+        """
+        if getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 0) <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Record the slow statements of the request and store them after the response.
+
+        The statements are explained and stored when the response is closed, after it
+        is sent and outside of the transactions of the view, so they are kept even if
+        the view rolls back.
+
+        Args:
+            request (django.http.HttpRequest): The incoming HTTP request.
+
+        Returns:
+            django.http.HttpResponse: Response of the next handler.
+        """
+        recorder = SlowQueryRecorder(request, settings.SLOW_QUERY_THRESHOLD_MS)
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        recorder.save_on_close(response)
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 4.1.7 on 2026-10-16 22:31
+
+from django.db import migrations, models
+
+
+def copy_prices(apps, schema_editor):
+    Product = apps.get_model('grocery_store_app', 'Product')
+    Product.objects.update(discounted_price=models.F('price'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_store_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='discounted_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=6, null=True, verbose_name='discounted price'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='max_discount_amount',
+            field=models.PositiveSmallIntegerField(blank=True, default=0, editable=False, verbose_name='max discount amount'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='priced_on',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='priced on'),
+        ),
+        migrations.RunPython(copy_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.7 on 2026-10-16 22:33
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def rebuild_ratings(apps, schema_editor):
+    Product = apps.get_model('grocery_store_app', 'Product')
+    Review = apps.get_model('grocery_store_app', 'Review')
+    reviews = Review.objects.filter(product=models.OuterRef('pk')).order_by().values('product')
+    Product.objects.update(
+        rating_count=Coalesce(models.Subquery(
+            reviews.annotate(rating_count=models.Count('pk')).values('rating_count'),
+        ), 0),
+        rating_sum=Coalesce(models.Subquery(
+            reviews.annotate(rating_sum=models.Sum('rating')).values('rating_sum'),
+        ), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_store_app', '0002_product_pricing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(blank=True, default=0, editable=False, verbose_name='rating count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(blank=True, default=0, editable=False, verbose_name='rating sum'),
+        ),
+        migrations.RunPython(rebuild_ratings, migrations.RunPython.noop),
+    ]
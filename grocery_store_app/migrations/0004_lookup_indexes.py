@@ -0,0 +1,32 @@
+# Generated by Django 4.1.7 on 2026-10-16 23:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('grocery_store_app', '0003_product_ratings'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('max_discount_amount__gt', 0)), fields=['priced_on'], name='products_discounted_priced_on'),
+        ),
+        AddIndexConcurrently(
+            model_name='promotion',
+            index=models.Index(fields=['end_date', 'start_date'], include=('discount_amount',), name='promotions_active_dates'),
+        ),
+        AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['product', '-created_datetime', 'id'], name='reviews_product_newest'),
+        ),
+        AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['product', 'rating'], name='reviews_product_rating'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.7 on 2026-10-16 23:13
+
+from django.db import migrations, models
+import grocery_store_app.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_store_app', '0004_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='clienttoproduct',
+            name='id',
+            field=models.UUIDField(blank=True, default=grocery_store_app.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='id',
+            field=models.UUIDField(blank=True, default=grocery_store_app.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='id',
+            field=models.UUIDField(blank=True, default=grocery_store_app.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.1.7 on 2026-10-16 23:45
+
+from django.db import migrations, models
+import grocery_store_app.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_store_app', '0005_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.UUIDField(blank=True, default=grocery_store_app.models.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_datetime', models.DateTimeField(blank=True, default=grocery_store_app.models.get_current_datetime, null=True, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime')),
+                ('sql', models.TextField(verbose_name='sql')),
+                ('statement_arguments', models.TextField(blank=True, verbose_name='statement arguments')),
+                ('duration', models.FloatField(verbose_name='duration, ms')),
+                ('view', models.CharField(blank=True, max_length=200, verbose_name='view')),
+                ('path', models.TextField(blank=True, verbose_name='path')),
+                ('frame', models.TextField(blank=True, verbose_name='frame')),
+                ('stack', models.TextField(blank=True, verbose_name='stack')),
+                ('plan', models.TextField(blank=True, verbose_name='plan')),
+            ],
+            options={
+                'verbose_name': 'slow query',
+                'verbose_name_plural': 'slow queries',
+                'db_table': '"grocery_store"."slow_queries"',
+                'ordering': ['-created_datetime'],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.1.7 on 2026-10-17 01:05
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Now
+import grocery_store_app.models
+
+CREATED_MODEL_NAMES = (
+    'Category', 'Client', 'ClientToProduct', 'Product', 'ProductToPromotion', 'Promotion',
+    'Review', 'SlowQuery',
+)
+
+
+def fill_created_datetimes(apps, schema_editor):
+    for model_name in CREATED_MODEL_NAMES:
+        model_class = apps.get_model('grocery_store_app', model_name)
+        field_names = {field.name for field in model_class._meta.get_fields()}
+        created_datetime = Now()
+        if 'modified_datetime' in field_names:
+            created_datetime = Coalesce('modified_datetime', Now())
+        model_class.objects.filter(created_datetime__isnull=True).update(
+            created_datetime=created_datetime,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_store_app', '0006_slow_queries'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_created_datetimes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='category',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+        migrations.AlterField(
+            model_name='clienttoproduct',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+        migrations.AlterField(
+            model_name='producttopromotion',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+        migrations.AlterField(
+            model_name='promotion',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+        migrations.AlterField(
+            model_name='slowquery',
+            name='created_datetime',
+            field=models.DateTimeField(default=grocery_store_app.models.get_current_datetime, validators=[grocery_store_app.models.check_created_datetime], verbose_name='created_datetime'),
+        ),
+    ]
@@ -1,12 +1,17 @@
 """Models modul."""
 
 from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from os import urandom
+from threading import Lock
+from time import time_ns
 from typing import Any
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from django.conf.global_settings import AUTH_USER_MODEL
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Round
 from django.utils.translation import gettext_lazy as _
 
 CATEGORY_TITLE_MAX_LENGTH = 100
@@ -16,7 +21,19 @@ PRODUCT_DESCRIPTION_MAX_LENGTH = 2000
 PROMOTION_TITLE_MAX_LENGTH = 200
 PROMOTION_DESCRIPTION_MAX_LENGTH = 2000
 REVIEW_TEXT_MAX_LENGTH = 1000
+PRICE_QUANTUM = Decimal('0.01')
 DEFAULT_IMAGE = 'https://acropora.ru/images/yootheme/pages/features/panel03.jpg'
+NANOSECONDS_IN_MILLISECOND = 1000000
+UUID7_LOCK = Lock()
+# time of the last uuid7 of the process, in 1/4096 milliseconds
+uuid7_state = {'timestamp': 0}
+SLOW_QUERY_VIEW_MAX_LENGTH = 200
+# largest value of a PostgreSQL smallint
+QUANTITY_MAX = 32767
+# product columns written only by the pricing and rating queries, never from an instance in memory
+DENORMALIZED_PRODUCT_FIELDS = frozenset((
+    'max_discount_amount', 'discounted_price', 'priced_on', 'rating_count', 'rating_sum',
+))
 
 
 def get_current_datetime() -> datetime:
@@ -39,6 +56,32 @@ def get_current_date() -> date:
     return date.today()
 
 
+def uuid7() -> UUID:
+    """
+    Generate a time-ordered UUID of version 7.
+
+    The first 48 bits are the Unix time in milliseconds and the next 12 bits are its
+    fraction, so later ids sort after earlier ones and new rows are appended to the right
+    edge of the primary key index instead of random pages. The last 62 bits are random.
+
+    The 60 bits of time never repeat or go back in a process: an id generated in the same
+    fraction as the previous one, or after the clock went back, gets the previous time
+    plus one, like the monotonic random method 3 of RFC 9562.
+
+    Returns:
+        UUID: Time-ordered UUID.
+    """
+    milliseconds, nanoseconds = divmod(time_ns(), NANOSECONDS_IN_MILLISECOND)
+    timestamp = milliseconds << 12 | (nanoseconds << 12) // NANOSECONDS_IN_MILLISECOND
+    with UUID7_LOCK:
+        timestamp = max(timestamp, uuid7_state['timestamp'] + 1)
+        uuid7_state['timestamp'] = timestamp
+    random_bits = int.from_bytes(urandom(8), 'big') >> 2
+    return UUID(int=(
+        timestamp >> 12 << 80 | 0x7 << 76 | (timestamp & 0xFFF) << 64 | 0b10 << 62 | random_bits
+    ))
+
+
 def check_created_datetime(created_datetime: datetime) -> None:
     """
     Validate that created_datetime is not in the future.
@@ -190,6 +233,38 @@ def check_quantity(quantity: int) -> None:
         )
 
 
+def get_discounted_price(price: int | float | Decimal, discount_amount: int) -> Decimal:
+    """
+    Apply a percentage discount to a price.
+
+    Args:
+        price (int | float | Decimal): Price without discount.
+        discount_amount (int): Discount amount in percent.
+
+    Returns:
+        Decimal: Discounted price rounded to kopecks.
+    """
+    discounted_price = Decimal(str(price)) * (100 - discount_amount) / 100
+    return discounted_price.quantize(PRICE_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+def get_discounted_price_expression(discount_amount: models.Expression) -> Round:
+    """
+    Build an expression applying a percentage discount to the price of a product.
+
+    Args:
+        discount_amount (models.Expression): Expression of the discount amount in percent.
+
+    Returns:
+        Round: Expression of the discounted price rounded to kopecks.
+    """
+    discounted_price = models.ExpressionWrapper(
+        models.F('price') * (models.Value(100) - discount_amount) / models.Value(100),
+        output_field=models.DecimalField(max_digits=6, decimal_places=2),
+    )
+    return Round(discounted_price, 2)
+
+
 class UUIDMixin(models.Model):
     """UUID Mixin."""
 
@@ -206,13 +281,32 @@ class UUIDMixin(models.Model):
         abstract = True
 
 
+class TimeOrderedUUIDMixin(UUIDMixin):
+    """
+    UUID Mixin with time-ordered ids for write-heavy tables.
+
+    Rows created before the switch keep their random ids, so no primary or foreign key
+    is rewritten and only the new rows are appended in order.
+    """
+
+    id = models.UUIDField(
+        primary_key=True,
+        blank=True,
+        editable=False,
+        default=uuid7,
+    )
+
+    class Meta:
+        """Meta class for TimeOrderedUUID Mixin."""
+
+        abstract = True
+
+
 class CreatedDatetimeMixin(models.Model):
     """CreatedDatetime Mixin."""
 
     created_datetime = models.DateTimeField(
         _('created_datetime'),
-        null=True,
-        blank=True,
         default=get_current_datetime,
         validators=[check_created_datetime],
     )
@@ -310,8 +404,42 @@ class ProductManager(models.Manager):
             check_modified_datetime(kwargs['check_modified_datetime'])
         return super().create(**kwargs)
 
+    def add_rating(self, product_id: Any, rating: int, count: int = 1) -> int:
+        """
+        Add ratings to the stored rating aggregates of a product.
 
-class Product(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
+        Args:
+            product_id (Any): Id of the rated product.
+            rating (int): Sum of the added ratings, negative to remove ratings.
+            count (int): Number of the added ratings, negative to remove ratings.
+
+        Returns:
+            int: Number of updated products.
+        """
+        return self.get_queryset().filter(pk=product_id).update(
+            rating_count=models.F('rating_count') + count,
+            rating_sum=models.F('rating_sum') + rating,
+        )
+
+    def rebuild_ratings(self) -> int:
+        """
+        Recompute the stored rating aggregates of all products from their reviews.
+
+        Returns:
+            int: Number of updated products.
+        """
+        reviews = Review.objects.filter(
+            product=models.OuterRef('pk'),
+        ).order_by().values('product')
+        rating_count = reviews.annotate(rating_count=models.Count('pk')).values('rating_count')
+        rating_sum = reviews.annotate(rating_sum=models.Sum('rating')).values('rating_sum')
+        return self.get_queryset().update(
+            rating_count=Coalesce(models.Subquery(rating_count), 0),
+            rating_sum=Coalesce(models.Subquery(rating_sum), 0),
+        )
+
+
+class Product(TimeOrderedUUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
     """Product model."""
 
     title = models.TextField(
@@ -335,6 +463,24 @@ class Product(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
         validators=[check_price,],
     )
     image = models.TextField(null=True, blank=True, default=DEFAULT_IMAGE)
+    max_discount_amount = models.PositiveSmallIntegerField(
+        _('max discount amount'), null=False, blank=True, editable=False, default=0,
+    )
+    discounted_price = models.DecimalField(
+        _('discounted price'),
+        null=True,
+        blank=True,
+        editable=False,
+        max_digits=6,
+        decimal_places=2,
+    )
+    priced_on = models.DateField(_('priced on'), null=True, blank=True, editable=False)
+    rating_count = models.PositiveIntegerField(
+        _('rating count'), null=False, blank=True, editable=False, default=0,
+    )
+    rating_sum = models.PositiveIntegerField(
+        _('rating sum'), null=False, blank=True, editable=False, default=0,
+    )
 
     category = models.ForeignKey(
         Category,
@@ -359,9 +505,27 @@ class Product(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
         """
         return f'{self.title} ({self.price} {_("RUB")})'
 
+    @property
+    def average_rating(self) -> int | float:
+        """
+        Get the average rating of the product from the stored rating aggregates.
+
+        Returns:
+            int | float: Average rating rounded to one decimal place, 0 if there are no reviews.
+        """
+        if not self.rating_count:
+            return 0
+        average_rating = self.rating_sum / self.rating_count
+        if average_rating.is_integer():
+            return int(average_rating)
+        return round(average_rating, 1)
+
     def save(self, *args, **kwargs):
         """
-        Validate product price before saving.
+        Validate product price and update the discounted price before saving.
+
+        Saves of an existing product leave out the denormalized columns, which may be stale
+        in memory, and reprice the product from its stored discount in the database.
 
         Args:
             *args: Variable length argument list.
@@ -371,13 +535,36 @@ class Product(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
             ValidationError: If the product's price is not within the allowed range.
         """
         check_price(self.price)
+        if self._state.adding:
+            self.priced_on = get_current_date()
+            self.discounted_price = get_discounted_price(self.price, self.max_discount_amount)
+            super().save(*args, **kwargs)
+            return
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            update_fields = [field.attname for field in self._meta.concrete_fields]
+        kwargs['update_fields'] = [
+            field_name for field_name in update_fields
+            if field_name not in DENORMALIZED_PRODUCT_FIELDS and field_name != 'id'
+        ]
         super().save(*args, **kwargs)
+        if 'price' in kwargs['update_fields']:
+            discounted_price = get_discounted_price_expression(models.F('max_discount_amount'))
+            Product.objects.filter(pk=self.pk).update(discounted_price=discounted_price)
+        self.refresh_from_db(fields=DENORMALIZED_PRODUCT_FIELDS)
 
     class Meta:
         """Meta class for Product model."""
 
         db_table = '"grocery_store"."products"'
         ordering = ['category', 'title', 'price']
+        indexes = [
+            models.Index(
+                fields=['priced_on'],
+                condition=models.Q(max_discount_amount__gt=0),
+                name='products_discounted_priced_on',
+            ),
+        ]
         verbose_name = _('product')
         verbose_name_plural = _('products')
 
@@ -505,6 +692,13 @@ class Promotion(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
 
         db_table = '"grocery_store"."promotions"'
         ordering = ['discount_amount']
+        indexes = [
+            models.Index(
+                fields=['end_date', 'start_date'],
+                include=['discount_amount'],
+                name='promotions_active_dates',
+            ),
+        ]
         verbose_name = _('promotion')
         verbose_name_plural = _('promotions')
 
@@ -565,7 +759,7 @@ class ReviewManager(models.Manager):
         return super().create(**kwargs)
 
 
-class Review(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
+class Review(TimeOrderedUUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
     """Review model."""
 
     text = models.TextField(
@@ -604,23 +798,40 @@ class Review(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
 
     def save(self, *args, **kwargs):
         """
-        Validate product price before saving.
+        Validate review rating and update the rating aggregates of the product.
 
         Args:
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
 
         Raises:
-            ValidationError: If the product's price is not within the allowed range.
+            ValidationError: If the review's rating is not within the allowed range.
         """
         check_rating(self.rating)
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous_review = None
+            if not self._state.adding:
+                previous_review = Review.objects.select_for_update().filter(
+                    pk=self.pk,
+                ).values('product_id', 'rating').first()
+            super().save(*args, **kwargs)
+            if previous_review:
+                Product.objects.add_rating(
+                    previous_review['product_id'], -previous_review['rating'], count=-1,
+                )
+            Product.objects.add_rating(self.product_id, self.rating)
 
     class Meta:
         """Meta class for Review model."""
 
         db_table = '"grocery_store"."reviews"'
         ordering = ['rating']
+        indexes = [
+            models.Index(
+                fields=['product', '-created_datetime', 'id'], name='reviews_product_newest',
+            ),
+            models.Index(fields=['product', 'rating'], name='reviews_product_rating'),
+        ]
         verbose_name = _('review')
         verbose_name_plural = _('reviews')
 
@@ -703,7 +914,7 @@ class Client(UUIDMixin, CreatedDatetimeMixin, ModifiedDatetimeMixin):
         verbose_name_plural = _('clients')
 
 
-class ClientToProduct(UUIDMixin, CreatedDatetimeMixin):
+class ClientToProduct(TimeOrderedUUIDMixin, CreatedDatetimeMixin):
     """ClientToProduct relationships."""
 
     quantity = models.PositiveSmallIntegerField(
@@ -762,3 +973,33 @@ class ClientToProduct(UUIDMixin, CreatedDatetimeMixin):
         )
         verbose_name = _('Relationship client to product')
         verbose_name_plural = _('Relationships client to product')
+
+
+class SlowQuery(TimeOrderedUUIDMixin, CreatedDatetimeMixin):
+    """SQL statement slower than the SLOW_QUERY_THRESHOLD_MS setting."""
+
+    sql = models.TextField(_('sql'))
+    statement_arguments = models.TextField(_('statement arguments'), blank=True)
+    duration = models.FloatField(_('duration, ms'))
+    view = models.CharField(_('view'), max_length=SLOW_QUERY_VIEW_MAX_LENGTH, blank=True)
+    path = models.TextField(_('path'), blank=True)
+    frame = models.TextField(_('frame'), blank=True)
+    stack = models.TextField(_('stack'), blank=True)
+    plan = models.TextField(_('plan'), blank=True)
+
+    def __str__(self) -> str:
+        """
+        Return a human-readable string representation of the slow query.
+
+        Returns:
+            str: Duration of the statement and its view.
+        """
+        return f'{self.duration:.0f} ms in {self.view}'
+
+    class Meta:
+        """Meta class for SlowQuery model."""
+
+        db_table = '"grocery_store"."slow_queries"'
+        ordering = ['-created_datetime']
+        verbose_name = _('slow query')
+        verbose_name_plural = _('slow queries')
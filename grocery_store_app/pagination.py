@@ -0,0 +1,366 @@
+"""Pagination module."""
+
+from typing import Any, Iterator
+
+from django.core import signing
+from django.db import connection, models
+from rest_framework.pagination import CursorPagination
+
+CURSOR_SALT = 'grocery_store_app.pagination'
+REST_PAGE_SIZE = 20
+REST_MAX_PAGE_SIZE = 100
+
+
+def get_related_ordering(field: models.ForeignKey, descending: bool) -> list[str]:
+    """
+    Get the ordering of a relation by the ordering of the related model.
+
+    Args:
+        field (models.ForeignKey): Relation field.
+        descending (bool): Whether the relation is ordered descending.
+
+    Returns:
+        list[str]: Ordering of lookups, descending ones prefixed with a minus.
+    """
+    related_ordering = field.related_model._meta.ordering
+    if not related_ordering:
+        return [f"{'-' if descending else ''}{field.attname}"]
+    return [
+        ''.join((
+            '' if related.startswith('-') == descending else '-',
+            f"{field.name}__{related.lstrip('-')}",
+        ))
+        for related in related_ordering
+    ]
+
+
+def get_keyset_ordering(model_class: type, ordering: tuple | list | None = None) -> list[str]:
+    """
+    Expand an ordering into concrete columns that identify a position in a list.
+
+    Relations are replaced by the ordering of the related model, or by the foreign key
+    if the related model is unordered, and the primary key is appended as a tie-breaker.
+
+    Args:
+        model_class (type): Model class of the ordered instances.
+        ordering (tuple | list | None): Ordering to expand, the model's Meta.ordering by default.
+
+    Returns:
+        list[str]: Ordering of lookups, descending ones prefixed with a minus.
+    """
+    keyset_ordering = []
+    for field_ordering in ordering or model_class._meta.ordering:
+        field = model_class._meta.get_field(field_ordering.lstrip('-'))
+        if field.is_relation and field.concrete:
+            keyset_ordering.extend(get_related_ordering(field, field_ordering.startswith('-')))
+        else:
+            keyset_ordering.append(field_ordering)
+    keyset_ordering.append('pk')
+    return keyset_ordering
+
+
+def estimate_count(model_class: type) -> int | None:
+    """
+    Estimate the number of rows in the table of a model from the planner statistics.
+
+    Args:
+        model_class (type): Model class whose table is counted.
+
+    Returns:
+        int | None: Estimated number of rows, None if the table has not been analyzed yet.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [model_class._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+def is_nullable(model_class: type, lookup: str) -> bool:
+    """
+    Check whether an ordering lookup can be NULL, by its field or by a nullable relation.
+
+    Args:
+        model_class (type): Model class of the ordered instances.
+        lookup (str): Ordering lookup, descending ones prefixed with a minus.
+
+    Returns:
+        bool: Whether the lookup can be NULL.
+    """
+    nullable = False
+    for field_name in lookup.lstrip('-').split('__'):
+        field = model_class._meta.pk if field_name == 'pk' else model_class._meta.get_field(
+            field_name,
+        )
+        nullable = nullable or field.null
+        model_class = field.related_model
+    return nullable
+
+
+def get_key_condition(
+    key: str, comparison: str, key_value: str | None, nullable: bool = True,
+) -> models.Q:
+    """
+    Build the condition comparing an ordering key to its value at a position.
+
+    NULL keys sort after all values, like in PostgreSQL, so they are greater than any value.
+
+    Args:
+        key (str): Annotation of the key.
+        comparison (str): Lookup of the comparison, exact, gt, gte, lt or lte.
+        key_value (str | None): Value of the key at the position.
+        nullable (bool): Whether the key can be NULL.
+
+    Returns:
+        models.Q: The condition.
+    """
+    if key_value is None:
+        if comparison == 'gt':
+            return models.Q(pk__in=[])
+        if comparison == 'lte':
+            return models.Q()
+        return models.Q(**{f'{key}__isnull': comparison in {'exact', 'gte'}})
+    condition = models.Q(**{f'{key}__{comparison}': key_value})
+    if nullable and comparison in {'gt', 'gte'}:
+        condition |= models.Q(**{f'{key}__isnull': True})
+    return condition
+
+
+class KeysetPage:
+    """Page of a keyset paginated list with cursors of the neighbouring pages."""
+
+    def __init__(
+        self,
+        object_list: list,
+        next_cursor: str | None = None,
+        previous_cursor: str | None = None,
+        count: int | None = None,
+    ):
+        """
+        Initialize the page.
+
+        Args:
+            object_list (list): Instances on the page.
+            next_cursor (str | None): Cursor of the next page, None on the last page.
+            previous_cursor (str | None): Cursor of the previous page, None on the first page.
+            count (int | None): Estimated number of instances in the whole list.
+        """
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    @property
+    def has_next(self) -> bool:
+        """
+        Check whether there is a next page.
+
+        Returns:
+            bool: True if there is a next page.
+        """
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        """
+        Check whether there is a previous page.
+
+        Returns:
+            bool: True if there is a previous page.
+        """
+        return self.previous_cursor is not None
+
+    def __iter__(self) -> Iterator:
+        """
+        Iterate over the instances on the page.
+
+        Returns:
+            Iterator: Iterator over the instances.
+        """
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        """
+        Get the number of instances on the page.
+
+        Returns:
+            int: Number of instances on the page.
+        """
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Paginator that seeks pages by the ordering keys instead of offsets."""
+
+    def __init__(
+        self,
+        queryset: models.QuerySet,
+        per_page: int,
+        ordering: tuple | list | None = None,
+        count: bool = True,
+    ):
+        """
+        Initialize the paginator.
+
+        Args:
+            queryset (models.QuerySet): Instances to paginate.
+            per_page (int): Maximum number of instances on a page.
+            ordering (tuple | list | None): Ordering of the pages, the model's by default.
+            count (bool): Whether pages carry an estimated number of instances.
+        """
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = get_keyset_ordering(queryset.model, ordering)
+        self.nullable = [is_nullable(queryset.model, lookup) for lookup in self.ordering]
+        self.count = count
+
+    def get_page(self, cursor: str | None = None) -> KeysetPage:
+        """
+        Get the page a cursor points to.
+
+        Invalid cursors point to the first page.
+
+        Args:
+            cursor (str | None): Cursor of the page, None for the first page.
+
+        Returns:
+            KeysetPage: The page.
+        """
+        position, backwards = self.decode_cursor(cursor)
+        queryset = self.queryset.annotate(**self.keys).order_by(*self.get_key_ordering(backwards))
+        if position is not None:
+            queryset = queryset.filter(self.get_filter(position, backwards))
+        instances = list(queryset[:self.per_page + 1])
+        has_more = len(instances) > self.per_page
+        instances = instances[:self.per_page]
+        if backwards:
+            instances.reverse()
+        page = KeysetPage(instances)
+        if instances and (backwards or has_more):
+            page.next_cursor = self.encode_cursor(instances[-1], backwards=False)
+        if instances and position is not None and (has_more or not backwards):
+            page.previous_cursor = self.encode_cursor(instances[0], backwards=True)
+        if self.count:
+            page.count = estimate_count(self.queryset.model)
+        return page
+
+    @property
+    def keys(self) -> dict[str, models.F]:
+        """
+        Get the annotations holding the ordering keys of each instance.
+
+        Returns:
+            dict[str, models.F]: Annotations by their names.
+        """
+        return {
+            f'keyset_{index}': models.F(lookup.lstrip('-'))
+            for index, lookup in enumerate(self.ordering)
+        }
+
+    def get_key_ordering(self, backwards: bool) -> list[str]:
+        """
+        Get the ordering of the annotated ordering keys.
+
+        Args:
+            backwards (bool): Whether to order from the end of the list.
+
+        Returns:
+            list[str]: Ordering of the annotations.
+        """
+        return [
+            f"{'' if lookup.startswith('-') == backwards else '-'}keyset_{index}"
+            for index, lookup in enumerate(self.ordering)
+        ]
+
+    def get_filter(self, position: list, backwards: bool) -> models.Q:
+        """
+        Build the condition matching instances after a position in the list.
+
+        The chain of alternatives is ANDed with a redundant bound on the first key,
+        which PostgreSQL can use as the start of an index range scan.
+
+        Args:
+            position (list): Ordering keys of the instance at the position.
+            backwards (bool): Whether to match instances before the position instead.
+
+        Returns:
+            models.Q: The condition.
+        """
+        condition = models.Q()
+        for index, lookup in enumerate(self.ordering):
+            comparison = 'gt' if lookup.startswith('-') == backwards else 'lt'
+            after_key = get_key_condition(
+                f'keyset_{index}', comparison, position[index], self.nullable[index],
+            )
+            for previous in range(index):
+                after_key &= get_key_condition(f'keyset_{previous}', 'exact', position[previous])
+            condition |= after_key
+        bound = 'gte' if self.ordering[0].startswith('-') == backwards else 'lte'
+        return get_key_condition('keyset_0', bound, position[0], self.nullable[0]) & condition
+
+    def encode_cursor(self, instance: Any, backwards: bool) -> str:
+        """
+        Encode the position of an instance into an opaque cursor.
+
+        Args:
+            instance (Any): Instance at the position.
+            backwards (bool): Whether the cursor points to the instances before the position.
+
+        Returns:
+            str: The cursor.
+        """
+        key_values = [getattr(instance, key) for key in self.keys]
+        position = [None if key_value is None else str(key_value) for key_value in key_values]
+        return signing.dumps([position, backwards], salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor: str | None) -> tuple[list | None, bool]:
+        """
+        Decode a cursor into a position in the list.
+
+        Args:
+            cursor (str | None): The cursor.
+
+        Returns:
+            tuple[list | None, bool]: Ordering keys of the position and the direction.
+        """
+        if not cursor:
+            return None, False
+        try:
+            position, backwards = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            return None, False
+        if len(position) != len(self.ordering):
+            return None, False
+        return position, bool(backwards)
+
+
+class BoundedCursorPagination(CursorPagination):
+    """Cursor pagination that lets clients tune the page size up to a limit."""
+
+    ordering = ('-created_datetime', '-id')
+    page_size = REST_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = REST_MAX_PAGE_SIZE
+
+
+def create_cursor_pagination(ordering, page_size=REST_PAGE_SIZE, max_page_size=REST_MAX_PAGE_SIZE):
+    """
+    Dynamically creates a REST framework cursor pagination with a bounded page size.
+
+    Args:
+        ordering (tuple): Ordering of the pages, its first field should be unique and unchanging.
+        page_size (int): Number of instances on a page unless the client asks for another size.
+        max_page_size (int): Maximum number of instances on a page the client can ask for.
+
+    Returns:
+        type: A BoundedCursorPagination class configured with the specified ordering and sizes.
+    """
+    return type('BoundedCursorPagination', (BoundedCursorPagination,), {
+        'ordering': ordering,
+        'page_size': page_size,
+        'max_page_size': max_page_size,
+    })
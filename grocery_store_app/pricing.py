@@ -0,0 +1,181 @@
+"""Pricing module."""
+
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+from uuid import UUID
+
+from django.core.cache import cache
+from django.db import models
+from django.db.models.functions import Coalesce
+
+from .caching import bump_version, get_version
+from .metrics import record_cache_lookups
+from .models import (Product, ProductToPromotion, get_current_date,
+                     get_discounted_price_expression)
+
+PRICE_CACHE_TIMEOUT = 60 * 60 * 24
+PRICES_VERSION_KEY = 'prices-version'
+
+_last_refresh = {'date': None}
+
+
+def get_active_promotions(current_date: date) -> models.QuerySet:
+    """
+    Get the product to promotion relationships that are active on the date.
+
+    Args:
+        current_date (date): Date the promotions should be valid on.
+
+    Returns:
+        models.QuerySet: Relationships of products to their active promotions.
+    """
+    return ProductToPromotion.objects.filter(
+        promotion__start_date__lte=current_date,
+        promotion__end_date__gte=current_date,
+    )
+
+
+def get_max_discount_amount(current_date: date) -> Coalesce:
+    """
+    Build an expression with the best active discount amount of a product.
+
+    Args:
+        current_date (date): Date the promotions should be valid on.
+
+    Returns:
+        Coalesce: Expression evaluating to the max discount amount or 0.
+    """
+    max_discount_amount = get_active_promotions(current_date).filter(
+        product=models.OuterRef('pk'),
+    ).order_by().values('product').annotate(
+        max_discount_amount=models.Max('promotion__discount_amount'),
+    ).values('max_discount_amount')
+    return Coalesce(models.Subquery(max_discount_amount), models.Value(0))
+
+
+def refresh_product_prices(
+    products: models.QuerySet | None = None,
+    current_date: date | None = None,
+) -> int:
+    """
+    Store the best active discount and the discounted price of products.
+
+    Args:
+        products (models.QuerySet | None): Products to reprice, all products by default.
+        current_date (date | None): Date the promotions should be valid on, today by default.
+
+    Returns:
+        int: Number of repriced products.
+    """
+    current_date = current_date or get_current_date()
+    if products is None:
+        products = Product.objects.all()
+    repriced = products.update(
+        max_discount_amount=get_max_discount_amount(current_date),
+        discounted_price=get_discounted_price_expression(get_max_discount_amount(current_date)),
+        priced_on=current_date,
+    )
+    invalidate_prices()
+    return repriced
+
+
+def refresh_stale_prices(current_date: date | None = None) -> int:
+    """
+    Reprice products whose promotions may have started or ended since they were priced.
+
+    The check runs once per day in each process.
+
+    Args:
+        current_date (date | None): Date the promotions should be valid on, today by default.
+
+    Returns:
+        int: Number of repriced products.
+    """
+    current_date = current_date or get_current_date()
+    if _last_refresh['date'] == current_date:
+        return 0
+    stale_products = Product.objects.filter(
+        models.Q(priced_on__isnull=True) | models.Q(priced_on__lt=current_date),
+    ).filter(
+        models.Q(max_discount_amount__gt=0) | models.Q(
+            pk__in=get_active_promotions(current_date).values('product_id'),
+        ),
+    )
+    repriced = refresh_product_prices(stale_products, current_date)
+    _last_refresh['date'] = current_date
+    return repriced
+
+
+def invalidate_prices() -> None:
+    """Drop all cached prices by switching to a new version of the price keys."""
+    bump_version(PRICES_VERSION_KEY)
+
+
+def get_price_keys(product_ids: Iterable, current_date: date) -> dict[str, str]:
+    """
+    Build the cache keys of the prices of products on a date.
+
+    A ValueError is raised if a product id is not a UUID.
+
+    Args:
+        product_ids (Iterable): Ids of the products.
+        current_date (date): Date the prices are valid on.
+
+    Returns:
+        dict[str, str]: Normalized product ids by their cache keys.
+    """
+    version = get_version(PRICES_VERSION_KEY)
+    keys = {}
+    for product_id in product_ids:
+        product_id = str(UUID(str(product_id)))
+        keys[f'product-price:{version}:{product_id}:{current_date}'] = product_id
+    return keys
+
+
+def get_product_prices(
+    product_ids: Iterable,
+    current_date: date | None = None,
+) -> dict[str, Decimal]:
+    """
+    Get the discounted prices of products from the cache, loading the missing ones at once.
+
+    Args:
+        product_ids (Iterable): Ids of the products.
+        current_date (date | None): Date the prices are valid on, today by default.
+
+    Returns:
+        dict[str, Decimal]: Prices by product ids, without the products that do not exist.
+    """
+    keys = get_price_keys(product_ids, current_date or get_current_date())
+    cached_prices = cache.get_many(keys)
+    record_cache_lookups('prices', len(cached_prices), len(keys))
+    prices = {keys[key]: price for key, price in cached_prices.items()}
+    missing_ids = [product_id for key, product_id in keys.items() if key not in cached_prices]
+    if missing_ids:
+        loaded_prices = Product.objects.filter(id__in=missing_ids).values_list(
+            'id', 'discounted_price',
+        )
+        prices.update((str(product_id), price) for product_id, price in loaded_prices)
+        cache.set_many(
+            {key: prices[product_id] for key, product_id in keys.items() if product_id in prices},
+            PRICE_CACHE_TIMEOUT,
+        )
+    return prices
+
+
+def get_product_price(product_id: str, current_date: date | None = None) -> Decimal | None:
+    """
+    Get the discounted price of a product through the price cache.
+
+    Args:
+        product_id (str): Id of the product.
+        current_date (date | None): Date the price is valid on, today by default.
+
+    Returns:
+        Decimal | None: Price of the product or None if it does not exist.
+    """
+    try:
+        return get_product_prices([product_id], current_date).get(str(UUID(str(product_id))))
+    except ValueError:
+        return None
@@ -0,0 +1,160 @@
+"""Profiling module."""
+
+import cProfile
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+
+from django.conf import settings
+from django.core import signing
+from django.http import HttpRequest, HttpResponse
+from django.utils.text import slugify
+
+PROFILING_HEADER = 'X-Profile'
+PROFILING_PARAMETER = 'profile'
+PROFILING_SALT = 'grocery_store_app.profiling'
+PROFILING_TOKEN_MAX_AGE = 24 * 60 * 60
+PROFILE_SUFFIX = '.prof'
+PROFILER_LOCK = Lock()
+
+
+def get_profile_directory() -> Path | None:
+    """
+    Get the directory of the profiles from the PROFILING_DIRECTORY setting.
+
+    Returns:
+        Path | None: Directory of the profiles or None if profiling is disabled.
+    """
+    directory = getattr(settings, 'PROFILING_DIRECTORY', '')
+    return Path(directory) if directory else None
+
+
+def create_profiling_token() -> str:
+    """
+    Sign a token for the profiling header, valid for PROFILING_TOKEN_MAX_AGE seconds.
+
+    Returns:
+        str: Signed token.
+    """
+    return signing.TimestampSigner(salt=PROFILING_SALT).sign(PROFILING_PARAMETER)
+
+
+def is_valid_profiling_token(token: str) -> bool:
+    """
+    Check a token of the profiling header.
+
+    Args:
+        token (str): Token to check.
+
+    Returns:
+        bool: Whether the token was signed with the secret key and has not expired.
+    """
+    signer = signing.TimestampSigner(salt=PROFILING_SALT)
+    try:
+        signed_value = signer.unsign(token, max_age=PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return signed_value == PROFILING_PARAMETER
+
+
+def is_profiling_requested(request: HttpRequest) -> bool:
+    """
+    Check whether a request asks to be profiled.
+
+    Requests are profiled with a signed X-Profile header or, for the staff,
+    with the profile query parameter.
+
+    Args:
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        bool: Whether the request should be profiled.
+    """
+    token = request.headers.get(PROFILING_HEADER)
+    if token:
+        return is_valid_profiling_token(token)
+    user = getattr(request, 'user', None)
+    return PROFILING_PARAMETER in request.GET and user is not None and user.is_staff
+
+
+def profile_request(get_response: Callable, request: HttpRequest) -> tuple:
+    """
+    Handle a request under cProfile and save its profile in the pstats format.
+
+    Only one request is profiled at a time, the concurrent ones are handled
+    without profiling.
+
+    Args:
+        get_response (Callable): Next handler in the middleware chain.
+        request (HttpRequest): The incoming HTTP request.
+
+    Returns:
+        tuple: Response of the handler and name of the saved profile or None.
+    """
+    if not PROFILER_LOCK.acquire(blocking=False):
+        return get_response(request), None
+    profiler = cProfile.Profile()
+    try:
+        response: HttpResponse = profiler.runcall(get_response, request)
+    finally:
+        PROFILER_LOCK.release()
+    return response, save_profile(profiler, request)
+
+
+def save_profile(profiler: cProfile.Profile, request: HttpRequest) -> str:
+    """
+    Save a profile named after the time, the method and the path of its request.
+
+    Args:
+        profiler (cProfile.Profile): Profiler of the request.
+        request (HttpRequest): Profiled request.
+
+    Returns:
+        str: Name of the profile file.
+    """
+    directory = get_profile_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    started = datetime.now(timezone.utc)
+    path_slug = slugify(request.path) or 'root'
+    name = f'{started:%Y%m%d-%H%M%S-%f}-{request.method.lower()}-{path_slug}{PROFILE_SUFFIX}'
+    profiler.dump_stats(directory / name)
+    return name
+
+
+def list_profiles() -> list[dict]:
+    """
+    List the saved profiles, the newest first.
+
+    Returns:
+        list[dict]: Names, sizes in bytes and modification datetimes of the profiles.
+    """
+    directory = get_profile_directory()
+    if directory is None or not directory.is_dir():
+        return []
+    profiles = []
+    for path in sorted(directory.glob(f'*{PROFILE_SUFFIX}'), reverse=True):
+        stat = path.stat()
+        profiles.append({
+            'name': path.name,
+            'size': stat.st_size,
+            'modified': datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+        })
+    return profiles
+
+
+def get_profile_path(name: str) -> Path | None:
+    """
+    Find a saved profile by its name.
+
+    Args:
+        name (str): Name of the profile file.
+
+    Returns:
+        Path | None: Path of the profile or None if there is no such profile.
+    """
+    directory = get_profile_directory()
+    if directory is None or Path(name).name != name or not name.endswith(PROFILE_SUFFIX):
+        return None
+    path = directory / name
+    return path if path.is_file() else None
@@ -1,8 +1,31 @@
 """Serializers module."""
 
-from rest_framework.serializers import HyperlinkedModelSerializer
+from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
+from typing import Callable, Iterable
+
+from django.db import models
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import (HyperlinkedIdentityField,
+                                      HyperlinkedRelatedField,
+                                      ManyRelatedField)
+from rest_framework.reverse import reverse
+from rest_framework.serializers import (BaseSerializer, BooleanField,
+                                        CharField, HyperlinkedModelSerializer,
+                                        IntegerField, ListSerializer,
+                                        ReadOnlyField)
 
 from.models import Category, Client, Product, Promotion, Review
+from.pagination import get_keyset_ordering
+
+URL_PLACEHOLDER = 'values-serializer-pk'
+OWNER_COLUMN = 'values_serializer_owner'
+FIELDS_PARAMETER = 'fields'
+EXPAND_PARAMETER = 'expand'
+PROJECTION_CACHE_SIZE = 256
+# fields whose representation of a database value is the value itself
+PLAIN_FIELDS = (BooleanField, CharField, IntegerField, ReadOnlyField)
 
 
 class CategorySerializer(HyperlinkedModelSerializer):
@@ -18,6 +41,8 @@ class CategorySerializer(HyperlinkedModelSerializer):
 class ProductSerializer(HyperlinkedModelSerializer):
     """Serializer for the Category model."""
 
+    average_rating = ReadOnlyField()
+
     class Meta:
         """Meta class for serializer."""
 
@@ -53,3 +78,468 @@ class ClientSerializer(HyperlinkedModelSerializer):
 
         model = Client
         fields = '__all__'
+
+
+def get_relation_queryset(model_class: type, relation: str) -> tuple[models.QuerySet, str]:
+    """
+    Get the related instances of a many-to-many relation in a deterministic order.
+
+    The related model's ordering is completed with the primary key, so the prefetched
+    instances and the ids loaded for the values serializers come in the same order.
+
+    Args:
+        model_class (type): Model class with the relation.
+        relation (str): Name of the relation.
+
+    Returns:
+        tuple[models.QuerySet, str]: Ordered related instances and the lookup back to the model.
+    """
+    descriptor = getattr(model_class, relation)
+    if descriptor.reverse:
+        related_model, query_name = descriptor.field.model, descriptor.field.name
+    else:
+        related_model = descriptor.field.related_model
+        query_name = descriptor.field.related_query_name()
+    return related_model.objects.order_by(*get_keyset_ordering(related_model)), query_name
+
+
+def join_url(url_template: tuple[str, str], key) -> str | None:
+    """
+    Put a key into a url reversed with a placeholder.
+
+    Args:
+        url_template (tuple[str, str]): Url parts before and after the key.
+        key (Any): Primary key of the linked instance, None if there is no link.
+
+    Returns:
+        str | None: Url of the instance, None if there is no link.
+    """
+    if key is None:
+        return None
+    return f'{url_template[0]}{key}{url_template[1]}'
+
+
+def represent_value(field, field_value):
+    """
+    Represent a column value like a serializer field, keeping None.
+
+    Args:
+        field (rest_framework.fields.Field): Field of the serializer.
+        field_value (Any): Value of the column.
+
+    Returns:
+        Any: Representation of the value.
+    """
+    if field_value is None:
+        return None
+    return field.to_representation(field_value)
+
+
+def get_keys(rows: Iterable[dict]) -> list:
+    """
+    Get the primary keys of rows.
+
+    Args:
+        rows (Iterable[dict]): Rows of instances.
+
+    Returns:
+        list: Primary keys of the rows.
+    """
+    return [row['pk'] for row in rows]
+
+
+def get_field_plan(model_class: type, field) -> tuple:
+    """
+    Plan how a field of a hyperlinked serializer is read from a row.
+
+    Args:
+        model_class (type): Model class of the serializer.
+        field (rest_framework.fields.Field): Field of the serializer.
+
+    Returns:
+        tuple: Columns the field reads, None if it reads the whole row, its loader of related
+        instances and linked view or None for each of them it has not, and its getter.
+    """
+    if isinstance(field, ManyRelatedField):
+        relation, view_name = field.source, field.child_relation.view_name
+        loader = (relation, create_ids_loader(model_class, relation))
+        return (), loader, view_name, lambda row, urls, related: [
+            join_url(urls[view_name], related_id)
+            for related_id in related[relation].get(row['pk'], ())
+        ]
+    if isinstance(field, HyperlinkedRelatedField):
+        column = 'pk' if isinstance(field, HyperlinkedIdentityField) else field.source
+        view_name = field.view_name
+        return (column,), None, view_name, lambda row, urls, _: join_url(
+            urls[view_name], row[column],
+        )
+    column = field.source
+    model_attribute = getattr(model_class, column, None)
+    if isinstance(model_attribute, property):
+        return None, None, None, lambda row, *_: model_attribute.fget(SimpleNamespace(**row))
+    if isinstance(field, PLAIN_FIELDS):
+        return (column,), None, None, lambda row, *_: row[column]
+    return (column,), None, None, lambda row, *_: represent_value(field, row[column])
+
+
+def get_expansion_plan(model_class: type, field, values_serializer: type) -> tuple:
+    """
+    Plan how a relation of a hyperlinked serializer is read as the payloads of its instances.
+
+    Foreign keys are joined into the query of the rows like select_related does, many-to-many
+    relations are loaded in one query per page like prefetch_related does.
+
+    Args:
+        model_class (type): Model class of the serializer.
+        field (rest_framework.fields.Field): Relation field of the serializer.
+        values_serializer (type): Values serializer of the related model.
+
+    Returns:
+        tuple: Plan of the expanded field, like the ones of get_field_plan.
+    """
+    relation = field.source
+    if isinstance(field, ManyRelatedField):
+        loader = create_many_expansion_loader(model_class, relation, values_serializer)
+        return (), (relation, loader), None, lambda row, _, related: related[relation].get(
+            row['pk'], [],
+        )
+    columns = tuple(f'{relation}__{column}' for column in values_serializer.columns)
+    loader = create_one_expansion_loader(relation, values_serializer)
+    return columns, (relation, loader), None, lambda row, _, related: related[relation].get(
+        row['pk'],
+    )
+
+
+def create_ids_loader(model_class: type, relation: str) -> Callable:
+    """
+    Create a loader of the many-to-many related ids of rows in one query.
+
+    Args:
+        model_class (type): Model class of the rows.
+        relation (str): Name of the relation.
+
+    Returns:
+        Callable: Loader of the lists of related ids by row keys from rows and a context.
+    """
+    queryset, query_name = get_relation_queryset(model_class, relation)
+
+    def load_ids(rows: list[dict], _context: dict) -> dict:
+        related_ids = {}
+        links = queryset.filter(
+            **{f'{query_name}__in': get_keys(rows)},
+        ).values_list(query_name, 'pk')
+        for key, related_id in links:
+            related_ids.setdefault(key, []).append(related_id)
+        return related_ids
+    return load_ids
+
+
+def create_many_expansion_loader(
+    model_class: type, relation: str, values_serializer: type,
+) -> Callable:
+    """
+    Create a loader of the payloads of the many-to-many related instances of rows in one query.
+
+    Args:
+        model_class (type): Model class of the rows.
+        relation (str): Name of the relation.
+        values_serializer (type): Values serializer of the related model.
+
+    Returns:
+        Callable: Loader of the lists of related payloads by row keys from rows and a context.
+    """
+    queryset, query_name = get_relation_queryset(model_class, relation)
+
+    def load_expansions(rows: list[dict], context: dict) -> dict:
+        related_rows = list(queryset.filter(
+            **{f'{query_name}__in': get_keys(rows)},
+        ).values(*values_serializer.columns, **{OWNER_COLUMN: models.F(query_name)}))
+        payloads = represent_rows(values_serializer, related_rows, context)
+        expansions = {}
+        for related_row in related_rows:
+            expansions.setdefault(related_row[OWNER_COLUMN], []).append(
+                payloads[related_row['pk']],
+            )
+        return expansions
+    return load_expansions
+
+
+def create_one_expansion_loader(relation: str, values_serializer: type) -> Callable:
+    """
+    Create a loader of the payloads of the instances rows refer to from their joined columns.
+
+    Args:
+        relation (str): Name of the foreign key.
+        values_serializer (type): Values serializer of the related model.
+
+    Returns:
+        Callable: Loader of the related payloads by row keys from rows and a context.
+    """
+    def load_expansions(rows: list[dict], context: dict) -> dict:
+        related_rows = {
+            row['pk']: {
+                column: row[f'{relation}__{column}'] for column in values_serializer.columns
+            }
+            for row in rows
+            if row[f'{relation}__pk'] is not None
+        }
+        payloads = represent_rows(values_serializer, related_rows.values(), context)
+        return {key: payloads[related_row['pk']] for key, related_row in related_rows.items()}
+    return load_expansions
+
+
+def represent_rows(values_serializer: type, rows: Iterable[dict], context: dict) -> dict:
+    """
+    Represent every distinct row of related instances once.
+
+    Args:
+        values_serializer (type): Values serializer of the related model.
+        rows (Iterable[dict]): Rows of the related instances, possibly repeated.
+        context (dict): Context of the serializer of the request.
+
+    Returns:
+        dict: Payloads by the keys of the rows.
+    """
+    distinct_rows = list({row['pk']: row for row in rows}.values())
+    payloads = values_serializer(many=True, context=context).to_representation(distinct_rows)
+    return {row['pk']: payload for row, payload in zip(distinct_rows, payloads)}
+
+
+def get_columns(plans: Iterable[tuple], fallback: tuple) -> tuple:
+    """
+    Collect the columns read by field plans, the primary key first.
+
+    Args:
+        plans (Iterable[tuple]): Plans of the fields.
+        fallback (tuple): Columns of the plans reading the whole row.
+
+    Returns:
+        tuple: Distinct columns.
+    """
+    columns = ['pk']
+    for plan in plans:
+        columns.extend(fallback if plan[0] is None else plan[0])
+    return tuple(dict.fromkeys(columns))
+
+
+def get_plan_attributes(plans: dict, fallback: tuple) -> dict:
+    """
+    Get the attributes of a values serializer reading fields by their plans.
+
+    Args:
+        plans (dict): Plans of the fields by field names.
+        fallback (tuple): Columns of the plans reading the whole row.
+
+    Returns:
+        dict: Columns, getters, related loaders and linked views of the values serializer.
+    """
+    return {
+        'columns': get_columns(plans.values(), fallback),
+        'getters': tuple((field_name, plan[3]) for field_name, plan in plans.items()),
+        'relations': tuple(plan[1] for plan in plans.values() if plan[1]),
+        'view_names': tuple({plan[2] for plan in plans.values() if plan[2]}),
+    }
+
+
+def get_requested_names(query_params, parameter: str, allowed) -> frozenset | None:
+    """
+    Parse the comma separated field names of a query parameter.
+
+    Args:
+        query_params (django.http.QueryDict): Query parameters of the request.
+        parameter (str): Name of the parameter.
+        allowed (Iterable[str]): Field names the parameter accepts.
+
+    Returns:
+        frozenset | None: Requested field names, None if the parameter is missing or empty.
+
+    Raises:
+        ValidationError: If some field names are not allowed.
+    """
+    names = frozenset(filter(None, map(str.strip, query_params.get(parameter, '').split(','))))
+    if not names:
+        return None
+    invalid_names = names.difference(allowed)
+    if invalid_names:
+        invalid_list = ', '.join(sorted(invalid_names))
+        raise ValidationError({parameter: [f'Invalid fields: {invalid_list}.']})
+    return names
+
+
+@lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def project_values_serializer(
+    values_serializer: type, field_names: frozenset | None, expanded: frozenset,
+) -> type:
+    """
+    Create a values serializer reading only some fields, with some relations expanded.
+
+    The projections are cached, as the clients keep asking for the same few of them.
+
+    Args:
+        values_serializer (type): Values serializer with all fields.
+        field_names (frozenset | None): Names of the read fields, None for all of them.
+        expanded (frozenset): Names of the expanded relations.
+
+    Returns:
+        type: Values serializer class with the planned getters, columns and relations.
+    """
+    plans = {
+        field_name: values_serializer.expansions[field_name] if field_name in expanded else plan
+        for field_name, plan in values_serializer.plans.items()
+        if field_names is None or field_name in field_names
+    }
+    fallback = get_columns(values_serializer.plans.values(), ())
+    return type(
+        values_serializer.__name__, (values_serializer,), get_plan_attributes(plans, fallback),
+    )
+
+
+class ValuesListSerializer(ListSerializer):
+    """List of values serializers loading the related instances of all rows at once."""
+
+    def to_representation(self, rows) -> list[dict]:
+        """
+        Represent the rows of a page.
+
+        Args:
+            rows (Iterable[dict]): Rows of the page.
+
+        Returns:
+            list[dict]: Payloads of the rows.
+        """
+        rows = list(rows)
+        self.child.related = self.child.load_related(rows)
+        return [self.child.to_representation(row) for row in rows]
+
+
+class ValuesSerializer(BaseSerializer):
+    """
+    Read-only serializer building the payloads of a hyperlinked serializer from .values() rows.
+
+    The fields of the hyperlinked serializer are planned once, and each request reverses
+    every linked view once with a placeholder, so a row costs string formatting instead of
+    a pass through the field machinery and a url reverse per relation.
+    """
+
+    plans = MappingProxyType({})
+    expansions = MappingProxyType({})
+    columns = ('pk',)
+    getters = ()
+    relations = ()
+    view_names = ()
+
+    class Meta:
+        """Meta class for serializer."""
+
+        list_serializer_class = ValuesListSerializer
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the serializer without loaded related instances.
+
+        Args:
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.related = None
+
+    @classmethod
+    def project(cls, query_params) -> type:
+        """
+        Project the serializer on the fields and expanded relations a request asks for.
+
+        The fields parameter lists the fields of the payloads, only their columns are
+        selected, and the expand parameter lists relations represented by the payloads
+        of their instances instead of their urls.
+
+        Args:
+            query_params (django.http.QueryDict): Query parameters of the request.
+
+        Returns:
+            type: Values serializer class of the request.
+        """
+        field_names = get_requested_names(query_params, FIELDS_PARAMETER, cls.plans)
+        expanded = get_requested_names(query_params, EXPAND_PARAMETER, cls.expansions)
+        if field_names is None and expanded is None:
+            return cls
+        return project_values_serializer(cls, field_names, expanded or frozenset())
+
+    @cached_property
+    def url_templates(self) -> dict[str, tuple[str, str]]:
+        """
+        Reverse the linked views of the request with a placeholder instead of the keys.
+
+        Returns:
+            dict[str, tuple[str, str]]: Url parts before and after the key by view names.
+        """
+        request = self.context.get('request')
+        url_format = self.context.get('format')
+        return {
+            view_name: tuple(reverse(
+                view_name, kwargs={'pk': URL_PLACEHOLDER}, request=request, format=url_format,
+            ).split(URL_PLACEHOLDER))
+            for view_name in self.view_names
+        }
+
+    def load_related(self, rows: list[dict]) -> dict[str, dict]:
+        """
+        Load the related ids or payloads of rows in one query per relation.
+
+        Args:
+            rows (list[dict]): Rows of the instances.
+
+        Returns:
+            dict[str, dict]: Related ids or payloads by row keys by relation names.
+        """
+        return {relation: load(rows, self.context) for relation, load in self.relations}
+
+    def to_representation(self, instance: dict) -> dict:
+        """
+        Represent a row like the hyperlinked serializer represents its instance.
+
+        Args:
+            instance (dict): Row of the instance.
+
+        Returns:
+            dict: Payload of the instance.
+        """
+        related = self.related
+        if related is None:
+            related = self.load_related([instance])
+        url_templates = self.url_templates
+        return {
+            field_name: getter(instance, url_templates, related)
+            for field_name, getter in self.getters
+        }
+
+
+def create_values_serializer(serializer: type, expandable=None) -> type:
+    """
+    Dynamically creates a values serializer producing the payloads of a hyperlinked serializer.
+
+    Properties of the model are computed from the other columns of the row.
+
+    Args:
+        serializer (type): Hyperlinked model serializer class.
+        expandable (dict | None): Serializer classes of the related models by relation names.
+
+    Returns:
+        type: ValuesSerializer class with the planned getters, columns and relations.
+    """
+    model_class = serializer.Meta.model
+    fields = serializer().fields
+    plans = {
+        field_name: get_field_plan(model_class, field) for field_name, field in fields.items()
+    }
+    expansions = {
+        field_name: get_expansion_plan(
+            model_class, fields[field_name], create_values_serializer(related_serializer),
+        )
+        for field_name, related_serializer in (expandable or {}).items()
+    }
+    return type(f'Values{serializer.__name__}', (ValuesSerializer,), {
+        'plans': MappingProxyType(plans),
+        'expansions': MappingProxyType(expansions),
+        **get_plan_attributes(plans, get_columns(plans.values(), ())),
+    })
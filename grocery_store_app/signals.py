@@ -0,0 +1,168 @@
+"""Signals module."""
+
+from threading import local
+
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .caching import CATALOG_VERSION_KEY, bump_version
+from .models import Category, Product, ProductToPromotion, Promotion, Review
+from .pricing import invalidate_prices, refresh_product_prices
+
+_deleted_promotions = local()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_prices(sender, instance, **kwargs):
+    """
+    Drop the cached prices after a product is saved or deleted.
+
+    Args:
+        sender (type): Product model class.
+        instance (Product): Saved or deleted product.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    invalidate_prices()
+
+
+def invalidate_catalog(sender, instance, **kwargs):
+    """
+    Drop the cached product grids after a catalog entity is saved or deleted.
+
+    Args:
+        sender (type): Model class of the entity.
+        instance (Any): Saved or deleted entity.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    bump_version(CATALOG_VERSION_KEY)
+
+
+for catalog_model in (Category, Product, Promotion):
+    post_save.connect(invalidate_catalog, sender=catalog_model)
+    post_delete.connect(invalidate_catalog, sender=catalog_model)
+
+
+@receiver(post_save, sender=Promotion)
+def reprice_promotion_products(sender, instance, **kwargs):
+    """
+    Reprice the products of a saved promotion.
+
+    Args:
+        sender (type): Promotion model class.
+        instance (Promotion): Saved promotion.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    refresh_product_prices(Product.objects.filter(
+        pk__in=ProductToPromotion.objects.filter(promotion=instance).values('product_id'),
+    ))
+
+
+def get_deleted_promotion_ids() -> set:
+    """
+    Get the ids of the promotions being deleted in the current thread.
+
+    Returns:
+        set: Ids of the promotions.
+    """
+    if getattr(_deleted_promotions, 'ids', None) is None:
+        _deleted_promotions.ids = set()
+    return _deleted_promotions.ids
+
+
+@receiver(pre_delete, sender=Promotion)
+def collect_promotion_products(sender, instance, **kwargs):
+    """
+    Remember the products of a promotion before its relationships are deleted with it.
+
+    The deletion cascades into the relationships first, so their receiver skips them and
+    the products are repriced in one statement after the promotion is deleted.
+
+    Args:
+        sender (type): Promotion model class.
+        instance (Promotion): Promotion to delete.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    instance.deleted_product_ids = set(
+        ProductToPromotion.objects.filter(promotion=instance).values_list('product_id', flat=True),
+    )
+    get_deleted_promotion_ids().add(instance.pk)
+
+
+@receiver(post_delete, sender=Promotion)
+def reprice_deleted_promotion_products(sender, instance, **kwargs):
+    """
+    Reprice the products of a deleted promotion.
+
+    Args:
+        sender (type): Promotion model class.
+        instance (Promotion): Deleted promotion.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    get_deleted_promotion_ids().discard(instance.pk)
+    product_ids = getattr(instance, 'deleted_product_ids', ())
+    if product_ids:
+        refresh_product_prices(Product.objects.filter(pk__in=product_ids))
+
+
+@receiver(post_save, sender=ProductToPromotion)
+@receiver(post_delete, sender=ProductToPromotion)
+def reprice_promoted_product(sender, instance, **kwargs):
+    """
+    Reprice the product of a saved or deleted product to promotion relationship.
+
+    Relationships deleted together with their promotion are repriced by the promotion.
+
+    Args:
+        sender (type): ProductToPromotion model class.
+        instance (ProductToPromotion): Saved or deleted relationship.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    if instance.promotion_id in get_deleted_promotion_ids():
+        return
+    refresh_product_prices(Product.objects.filter(pk=instance.product_id))
+    bump_version(CATALOG_VERSION_KEY)
+
+
+@receiver(m2m_changed, sender=ProductToPromotion)
+def reprice_linked_products(sender, instance, action, **kwargs):
+    """
+    Reprice the products linked to or unlinked from promotions through the m2m managers.
+
+    The managers bulk insert and delete the relationships without their save and delete
+    signals. The pk_set keyword argument holds the ids of the changed instances, or None
+    for a clear, so the products of a promotion are remembered before it is cleared.
+
+    Args:
+        sender (type): ProductToPromotion model class.
+        instance (Product | Promotion): Product or promotion whose relationships changed.
+        action (str): Stage and kind of the change.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    is_product = isinstance(instance, Product)
+    if action == 'pre_clear' and not is_product:
+        instance.cleared_product_ids = set(
+            sender.objects.filter(promotion=instance).values_list('product_id', flat=True),
+        )
+    if action not in {'post_add', 'post_remove', 'post_clear'}:
+        return
+    if is_product:
+        product_ids = {instance.pk}
+    else:
+        product_ids = kwargs['pk_set'] or getattr(instance, 'cleared_product_ids', ())
+    refresh_product_prices(Product.objects.filter(pk__in=product_ids))
+    bump_version(CATALOG_VERSION_KEY)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_rating(sender, instance, **kwargs):
+    """
+    Remove the rating of a deleted review from the rating aggregates of its product.
+
+    Args:
+        sender (type): Review model class.
+        instance (Review): Deleted review.
+        **kwargs: Arbitrary keyword arguments.
+    """
+    Product.objects.add_rating(instance.product_id, -instance.rating, count=-1)
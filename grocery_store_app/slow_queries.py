@@ -0,0 +1,228 @@
+"""Slow queries module."""
+
+import logging
+import re
+import traceback
+from functools import lru_cache, partial
+from pathlib import Path
+from random import random
+from time import perf_counter
+from typing import Callable
+
+from django.conf import settings
+from django.db import DatabaseError, connection, models, transaction
+from django.http import HttpRequest, HttpResponse
+
+from .models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_ANALYZE_SQL = 'EXPLAIN (ANALYZE, BUFFERS) {sql}'
+EXPLAIN_SQL = 'EXPLAIN {sql}'
+VOLATILE_FUNCTIONS_SQL = "SELECT DISTINCT lower(proname) FROM pg_proc WHERE provolatile = 'v'"
+LOCKING_CLAUSE_PATTERN = re.compile(
+    r'\bFOR\s+((NO\s+KEY\s+)?UPDATE|(KEY\s+)?SHARE)\b', re.IGNORECASE,
+)
+FUNCTION_CALL_PATTERN = re.compile(r'(\w+)"?\s*\(')
+IGNORED_FRAME_FILES = frozenset(('slow_queries.py', 'middleware.py'))
+
+
+def is_project_frame(frame: traceback.FrameSummary) -> bool:
+    """
+    Check whether a stack frame belongs to the project code, not to Django or the recorder.
+
+    Args:
+        frame (traceback.FrameSummary): Stack frame.
+
+    Returns:
+        bool: Whether the frame is in a project file.
+    """
+    frame_path = Path(frame.filename)
+    if not frame_path.is_relative_to(settings.BASE_DIR) or 'site-packages' in frame_path.parts:
+        return False
+    return frame_path.name not in IGNORED_FRAME_FILES
+
+
+@lru_cache(maxsize=1)
+def get_volatile_functions() -> frozenset[str]:
+    """
+    Get the names of the volatile functions of the database, built-in and user-defined.
+
+    Returns:
+        frozenset[str]: Lowercase names of the functions.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(VOLATILE_FUNCTIONS_SQL)
+        return frozenset(row[0] for row in cursor.fetchall())
+
+
+def can_analyze(sql: str) -> bool:
+    """
+    Check whether a statement can be run again by EXPLAIN ANALYZE without side effects.
+
+    Only SELECTs without locking clauses that call no volatile functions qualify.
+    The calls are found in the text, so a false match only costs the actual timings.
+
+    Args:
+        sql (str): SQL of the statement.
+
+    Returns:
+        bool: Whether the statement is a plain SELECT.
+    """
+    if sql.lstrip()[:6].upper() != 'SELECT' or LOCKING_CLAUSE_PATTERN.search(sql):
+        return False
+    called_functions = {name.lower() for name in FUNCTION_CALL_PATTERN.findall(sql)}
+    return called_functions.isdisjoint(get_volatile_functions())
+
+
+def get_plan(sql: str, statement_arguments) -> str:
+    """
+    Explain a statement, analyzing and buffering it only if it is a plain SELECT.
+
+    Other statements, locking SELECTs and SELECTs calling volatile functions are
+    not run again, so they get the plan without the actual timings.
+
+    Args:
+        sql (str): SQL of the statement.
+        statement_arguments (list | dict | None): Arguments of the statement.
+
+    Returns:
+        str: Plan of the statement or the error of the EXPLAIN.
+    """
+    explain_sql = EXPLAIN_ANALYZE_SQL if can_analyze(sql) else EXPLAIN_SQL
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(explain_sql.format(sql=sql), statement_arguments)
+                plan_rows = cursor.fetchall()
+    except DatabaseError as error:
+        return f'EXPLAIN failed: {error}'
+    return '\n'.join(plan_row[0] for plan_row in plan_rows)
+
+
+def cap_slow_queries(size: int) -> None:
+    """
+    Delete all but the newest slow queries.
+
+    The time-ordered ids let one range delete on the primary key drop the oldest rows.
+
+    Args:
+        size (int): Number of kept slow queries.
+    """
+    oldest_dropped_id = SlowQuery.objects.order_by('-id').values('id')[size:size + 1]
+    SlowQuery.objects.filter(id__lte=models.Subquery(oldest_dropped_id)).delete()
+
+
+class SlowQueryRecorder:
+    """Execute wrapper that keeps the statements of a request slower than a threshold."""
+
+    def __init__(self, request: HttpRequest, threshold: float):
+        """
+        Start with no slow statements.
+
+        Args:
+            request (HttpRequest): Request executing the statements.
+            threshold (float): Minimal duration of a slow statement in milliseconds.
+        """
+        self.request = request
+        self.threshold = threshold
+        self.captures = []
+
+    def __call__(self, execute, sql, statement_arguments, *execute_args):
+        """
+        Execute a statement and keep it if it is slow.
+
+        Args:
+            execute (callable): Next executor in the chain of wrappers.
+            sql (str): SQL of the statement.
+            statement_arguments (list | dict | None): Arguments of the statement.
+            *execute_args: Whether the statement is executed many times and its context.
+
+        Returns:
+            Any: Result of the executor.
+        """
+        started = perf_counter()
+        statement_result = execute(sql, statement_arguments, *execute_args)
+        duration = (perf_counter() - started) * 1000
+        if duration >= self.threshold:
+            self.capture(sql, statement_arguments, duration, execute_args[0])
+        return statement_result
+
+    def capture(self, sql: str, statement_arguments, duration: float, many: bool) -> None:
+        """
+        Keep a slow statement with its view and the project frames of its stack.
+
+        Args:
+            sql (str): SQL of the statement.
+            statement_arguments (list | dict | None): Arguments of the statement.
+            duration (float): Duration of the statement in milliseconds.
+            many (bool): Whether the statement is executed for many sets of arguments.
+        """
+        frames = [frame for frame in traceback.extract_stack() if is_project_frame(frame)]
+        resolver_match = self.request.resolver_match
+        view = resolver_match.url_name if resolver_match else None
+        slow_query = SlowQuery(
+            sql=sql,
+            statement_arguments=repr(statement_arguments),
+            duration=duration,
+            view=view or '',
+            path=self.request.path,
+            frame=''.join(traceback.format_list(frames[-1:])).strip(),
+            stack=''.join(traceback.format_list(frames)),
+        )
+        self.captures.append((slow_query, statement_arguments, many))
+
+    def save(self) -> None:
+        """
+        Log the slow statements, explain a sample of them and store them in the capped table.
+
+        Statements executed for many sets of arguments are not explained.
+        """
+        if not self.captures:
+            return
+        slow_queries = []
+        for slow_query, statement_arguments, many in self.captures:
+            logger.warning(
+                'Slow query of %.2f ms in %s at %s: %s',
+                slow_query.duration,
+                slow_query.view,
+                slow_query.frame,
+                slow_query.sql,
+                extra={
+                    'duration_ms': slow_query.duration,
+                    'view': slow_query.view,
+                    'path': slow_query.path,
+                    'frame': slow_query.frame,
+                    'sql': slow_query.sql,
+                    'statement_arguments': slow_query.statement_arguments,
+                },
+            )
+            if not many and random() < settings.SLOW_QUERY_EXPLAIN_RATE:
+                slow_query.plan = get_plan(slow_query.sql, statement_arguments)
+            slow_queries.append(slow_query)
+        SlowQuery.objects.bulk_create(slow_queries)
+        cap_slow_queries(settings.SLOW_QUERY_LOG_SIZE)
+
+    def save_on_close(self, response: HttpResponse) -> None:
+        """
+        Save the slow statements when the server closes the response, after sending it.
+
+        The sampled statements are explained then, so their plans neither delay the
+        response nor add to the database time of the request.
+
+        Args:
+            response (HttpResponse): Response of the request.
+        """
+        response.close = partial(self.save_and_close, response.close)
+
+    def save_and_close(self, close: Callable) -> None:
+        """
+        Save the slow statements, then close the response even if saving fails.
+
+        Args:
+            close (Callable): Original close method of the response.
+        """
+        try:
+            self.save()
+        finally:
+            close()
@@ -22,6 +22,7 @@ urlpatterns = [
     path('category/', views.view_category, name='category'),
     path('products/', views.ProductListView.as_view(), name='products'),
     path('product/', views.view_product, name='product'),
+    path('product_reviews/', views.view_product_reviews, name='product_reviews'),
     path('promotions/', views.PromotionListView.as_view(), name='promotions'),
     path('promotion/', views.view_promotion, name='promotion'),
     path('reviews/', views.ReviewListView.as_view(), name='reviews'),
@@ -29,6 +30,14 @@ urlpatterns = [
     path('accounts/profile/', views.profile, name='profile'),
     path('order/', views.order, name='order'),
     path('cancel_order/', views.cancel_order, name='cancel_order'),
+    path('cart/', views.view_cart, name='cart'),
+    path('cart/add/', views.add_to_cart, name='add_to_cart'),
+    path('cart/remove/', views.remove_from_cart, name='remove_from_cart'),
+    path('cart/checkout/', views.checkout_cart, name='checkout_cart'),
     path('add_review/', views.add_review, name='add_review'),
     path('delete_review/', views.delete_review, name='delete_review'),
+    path('export/<str:name>.<str:file_format>', views.export, name='export'),
+    path('profiling/', views.view_profiles, name='profiling'),
+    path('profiling/<str:name>', views.download_profile, name='profiling_download'),
+    path('metrics', views.view_metrics, name='metrics'),
 ]
@@ -1,24 +1,45 @@
 """Views module."""
 
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from typing import Any
+from uuid import UUID
 
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import decorators, mixins
 from django.core import exceptions
 from django.core import paginator as django_paginator
-from django.db.models import Avg
-from django.http import HttpResponseRedirect
+from django.db.models import Prefetch
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseRedirect, StreamingHttpResponse)
 from django.shortcuts import redirect, render
-from django.utils import timezone
+from django.utils.functional import cached_property
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView
 from rest_framework import authentication, permissions, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
+from .caching import CATALOG_CACHE_TIMEOUT, CATALOG_VERSION_KEY, get_version
+from .cart import Cart
+from .checkout import cancel, checkout, get_returns
+from .exporting import EXPORT_FORMATS, EXPORTS, iter_export
 from .forms import AddFundsForm, RegistrationForm
-from .models import (Category, Client, ClientToProduct, Product,
-                     ProductToPromotion, Promotion, Review)
+from .metrics import (FUNDS_ADDED, FUNDS_ADDITIONS, METRICS_CONTENT_TYPE,
+                      collect_metrics, registry, render_metrics)
+from .models import (QUANTITY_MAX, Category, Client, ClientToProduct, Product,
+                     Promotion, Review, get_current_date)
+from .pagination import (REST_MAX_PAGE_SIZE, REST_PAGE_SIZE, KeysetPaginator,
+                         create_cursor_pagination)
+from .pricing import get_active_promotions, get_product_price
+from .profiling import get_profile_path, list_profiles
 from .serializers import (CategorySerializer, ClientSerializer,
                           ProductSerializer, PromotionSerializer,
-                          ReviewSerializer)
+                          ReviewSerializer, create_values_serializer,
+                          get_relation_queryset)
+
+IDS_PARAMETER = 'ids'
+REST_MAX_BATCH_SIZE = REST_MAX_PAGE_SIZE
 
 
 def homepage(request):
@@ -58,30 +79,168 @@ class MyPermission(permissions.BasePermission):
         return False
 
 
-def create_viewset(model_class, serializer):
+class ValuesReadMixin:
+    """Serve the lists and retrievals of a model viewset by its values serializer."""
+
+    values_serializer_class = None
+
+    @property
+    def reads_values(self) -> bool:
+        """
+        Check whether the action is served by the values serializer.
+
+        Returns:
+            bool: True for lists and retrievals with a values serializer.
+        """
+        return self.values_serializer_class is not None and self.action in {'list', 'retrieve'}
+
+    @cached_property
+    def projected_serializer_class(self) -> type:
+        """
+        Get the values serializer projected on the fields and expansions of the request.
+
+        Returns:
+            type: Values serializer class of the request.
+        """
+        return self.values_serializer_class.project(self.request.query_params)
+
+    def get_queryset(self):
+        """
+        Get the rows of the values serializer or the instances of the serializer.
+
+        The rows also hold the first ordering column, the cursor pagination reads it.
+
+        Returns:
+            django.db.models.QuerySet: Rows or instances of the action.
+        """
+        if self.reads_values:
+            cursor_column = self.pagination_class.ordering[0].lstrip('-')
+            return self.queryset.model.objects.values(*dict.fromkeys((
+                *self.projected_serializer_class.columns, cursor_column,
+            )))
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        """
+        Get the serializer class of the action.
+
+        Returns:
+            type: Values serializer for lists and retrievals, the serializer otherwise.
+        """
+        if self.reads_values:
+            return self.projected_serializer_class
+        return super().get_serializer_class()
+
+
+def get_requested_ids(query_params) -> list[UUID] | None:
+    """
+    Parse the comma separated ids of the ids query parameter, without repetitions.
+
+    Args:
+        query_params (django.http.QueryDict): Query parameters of the request.
+
+    Returns:
+        list[UUID] | None: Requested ids in their order, None if the parameter is missing.
+
+    Raises:
+        ValidationError: If an id is not a UUID or there are more than REST_MAX_BATCH_SIZE ids.
+    """
+    if IDS_PARAMETER not in query_params:
+        return None
+    requested = filter(None, map(str.strip, query_params[IDS_PARAMETER].split(',')))
+    try:
+        ids = list(dict.fromkeys(UUID(requested_id) for requested_id in requested))
+    except ValueError:
+        raise ValidationError({IDS_PARAMETER: ['The ids should be UUIDs.']})
+    if len(ids) > REST_MAX_BATCH_SIZE:
+        raise ValidationError({IDS_PARAMETER: [f'At most {REST_MAX_BATCH_SIZE} ids are allowed.']})
+    return ids
+
+
+class BatchRetrieveMixin:
+    """Retrieve the instances of a model viewset listed in the ids query parameter at once."""
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the instances with the requested ids in their order, or paginate all instances.
+
+        The requested instances are found by one query, the missing ones are left out.
+
+        Args:
+            request (rest_framework.request.Request): The incoming REST request.
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            rest_framework.response.Response: Payloads of the requested instances or a page.
+        """
+        ids = get_requested_ids(request.query_params)
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        found = {
+            instance['pk'] if isinstance(instance, dict) else instance.pk: instance
+            for instance in self.filter_queryset(self.get_queryset()).filter(pk__in=ids).order_by()
+        }
+        instances = [found[requested_id] for requested_id in ids if requested_id in found]
+        return Response(self.get_serializer(instances, many=True).data)
+
+
+def create_viewset(
+    model_class,
+    serializer,
+    ordering=('-created_datetime', '-id'),
+    page_size=REST_PAGE_SIZE,
+    prefetch_related=(),
+    expandable=None,
+):
     """
     Dynamically creates a ModelViewSet for the specified model class and serializer.
 
+    Lists and retrievals are served from .values() rows by a values serializer producing
+    the same payloads as the serializer, the other actions go through the serializer.
+    Their fields parameter limits the payloads and the selected columns to some fields,
+    and their expand parameter inlines the payloads of the expandable relations.
+    Lists with the ids parameter hold the instances with those ids instead of a page.
+
     Args:
         model_class (django.db.models.Model): The Django model class.
         serializer (rest_framework.serializers.Serializer): The serializer class.
+        ordering (tuple): Ordering of the cursor paginated lists.
+        page_size (int): Default number of instances on a page of a list.
+        prefetch_related (tuple): Many-to-many relations the serializer links to.
+        expandable (dict | None): Serializer classes of the expandable relations by their names.
 
     Returns:
         rest_framework.viewsets.ModelViewSet: A configured ModelViewSet instance ready for use.
     """
-    class ViewSet(viewsets.ModelViewSet):
-        queryset = model_class.objects.all()
+    class ViewSet(BatchRetrieveMixin, ValuesReadMixin, viewsets.ModelViewSet):
+        queryset = model_class.objects.prefetch_related(*(
+            Prefetch(relation, queryset=get_relation_queryset(model_class, relation)[0])
+            for relation in prefetch_related
+        ))
         serializer_class = serializer
+        values_serializer_class = create_values_serializer(serializer, expandable)
         authentication_classes = [authentication.TokenAuthentication]
         permission_classes = [MyPermission]
+        pagination_class = create_cursor_pagination(ordering, page_size)
     return ViewSet
 
 
 CategoryViewSet = create_viewset(Category, CategorySerializer)
-ProductViewSet = create_viewset(Product, ProductSerializer)
-PromotionViewSet = create_viewset(Promotion, PromotionSerializer)
-ReviewViewSet = create_viewset(Review, ReviewSerializer)
-ClientViewSet = create_viewset(Client, ClientSerializer)
+ProductViewSet = create_viewset(
+    Product,
+    ProductSerializer,
+    prefetch_related=('promotions',),
+    expandable={'category': CategorySerializer, 'promotions': PromotionSerializer},
+)
+PromotionViewSet = create_viewset(
+    Promotion,
+    PromotionSerializer,
+    prefetch_related=('products',),
+    expandable={'products': ProductSerializer},
+)
+ReviewViewSet = create_viewset(Review, ReviewSerializer, expandable={'product': ProductSerializer})
+ClientViewSet = create_viewset(Client, ClientSerializer, prefetch_related=('products',))
 
 
 def register(request):
@@ -112,7 +271,9 @@ def register(request):
     )
 
 
-def create_listview(model_class, plural_name, template):
+def create_listview(
+    model_class, plural_name, template, select_related=(), prefetch_related=(), keyset=False,
+):
     """
     Dynamically creates a Django ListView with custom features.
 
@@ -120,6 +281,9 @@ def create_listview(model_class, plural_name, template):
         model_class (type): The Django model class whose instances will be in the list view.
         plural_name (str): The name to use for the context variable the list of instances.
         template (str): The path to the template file to use for rendering the list view.
+        select_related (tuple): Relations the template uses that are joined into the list query.
+        prefetch_related (tuple): Relations the template uses that are fetched in one query each.
+        keyset (bool): Whether to paginate by cursors over Meta.ordering instead of page numbers.
 
     Returns:
         type: A Django ListView instance configured with the specified model, template.
@@ -129,9 +293,23 @@ def create_listview(model_class, plural_name, template):
 
         model = model_class
         template_name = template
-        paginate_by = 10
+        paginate_by = None if keyset else 10
         context_object_name = plural_name
 
+        def get_queryset(self):
+            """
+            Retrieve the instances of the model along with the relations used by the template.
+
+            Returns:
+                django.db.models.QuerySet: Queryset of the instances.
+            """
+            queryset = super().get_queryset()
+            if select_related:
+                queryset = queryset.select_related(*select_related)
+            if prefetch_related:
+                queryset = queryset.prefetch_related(*prefetch_related)
+            return queryset
+
         def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
             """
             Retrieve the context data and adds a paginated list of all instances of the model.
@@ -143,10 +321,14 @@ def create_listview(model_class, plural_name, template):
                 dict[str, Any]: The context data dictionary.
             """
             context = super().get_context_data(**kwargs)
-            instances = model_class.objects.all()
-            paginator = django_paginator.Paginator(instances, 10)
-            page = self.request.GET.get('page')
-            page_obj = paginator.get_page(page)
+            instances = self.get_queryset()
+            if keyset:
+                page_obj = KeysetPaginator(instances, 10).get_page(self.request.GET.get('cursor'))
+                context['keyset_page'] = page_obj
+            else:
+                paginator = django_paginator.Paginator(instances, 10)
+                page = self.request.GET.get('page')
+                page_obj = paginator.get_page(page)
             context[f'{plural_name}_list'] = page_obj
             return context
     return CustomListView
@@ -155,71 +337,77 @@ def create_listview(model_class, plural_name, template):
 CategoryListView = create_listview(
     Category, 'categories', 'catalog/categories.html',
 )
-ProductListView = create_listview(Product, 'products', 'catalog/products.html')
+ProductListView = create_listview(
+    Product, 'products', 'catalog/products.html', select_related=('category',), keyset=True,
+)
 PromotionListView = create_listview(
     Promotion, 'promotions', 'catalog/promotions.html',
 )
-ReviewListView = create_listview(Review, 'reviews', 'catalog/reviews.html')
-ClientListView = create_listview(Client, 'clients', 'catalog/clients.html')
+ReviewListView = create_listview(
+    Review, 'reviews', 'catalog/reviews.html', select_related=('client__user', 'product'),
+)
+ClientListView = create_listview(
+    Client, 'clients', 'catalog/clients.html', select_related=('user',),
+)
 
 
-def create_view(model_class, context_name, template, redirect_page):
+def create_view(
+    model_class,
+    context_name,
+    template,
+    redirect_page,
+    cached_fragments=False,
+    select_related=(),
+    only=(),
+    related_lists=None,
+):
     """
     Dynamically creates a view function for displaying details of a specific instance of a model.
 
+    The related querysets are left unevaluated, so fragments served from the cache skip them.
+
     Args:
         model_class (type): Model class for the view.
         context_name (str): Context variable name for the model instance.
         template (str): Template path for rendering the view.
         redirect_page (str): URL pattern name for redirection on invalid conditions.
+        cached_fragments (bool): Whether the template caches fragments by the catalog version.
+        select_related (tuple): Relations the template uses that are joined into the query.
+        only (tuple): Fields the template uses, all fields if empty.
+        related_lists (dict | None): Relation, joined relations and fields by list names.
 
     Returns:
         callable: View function rendering the specified template with model instance details.
     """
+    queryset = model_class.objects.all()
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if only:
+        queryset = queryset.only(*only)
+
     @decorators.login_required
     def view(request):
-        id_ = request.GET.get('id', None)
-        if not id_:
-            return redirect(redirect_page)
         try:
-            target = model_class.objects.get(id=id_) if id_ else None
-        except exceptions.ValidationError:
+            target = queryset.get(id=request.GET.get('id', None))
+        except (exceptions.ValidationError, model_class.DoesNotExist):
             return redirect(redirect_page)
         context = {context_name: target}
+        for list_name, (relation, list_select_related, list_only) in (related_lists or {}).items():
+            context[list_name] = getattr(target, relation).select_related(
+                *list_select_related,
+            ).only(*list_only)
+        if cached_fragments:
+            context['catalog_version'] = get_version(CATALOG_VERSION_KEY)
+            context['catalog_cache_timeout'] = CATALOG_CACHE_TIMEOUT
         if model_class == Product:
-            try:
-                product = Product.objects.get(id=id_)
-            except Product.DoesNotExist:
-                return None
-            average_rating = Review.objects.filter(
-                product=product).aggregate(
-                average_rating=Avg('rating'))
-            avg_rating = average_rating['average_rating']
-            average_rating = avg_rating if avg_rating is not None else 0
-            if isinstance(average_rating, int) or average_rating.is_integer():
-                average_rating_rounded = int(average_rating)
-            else:
-                average_rating_rounded = round(average_rating, 1)
-            context['average_rating'] = average_rating_rounded
-
-            current_date = timezone.now().date()
-            product_promotions = ProductToPromotion.objects.filter(
-                product=product,
-                promotion__start_date__lte=current_date,
-                promotion__end_date__gte=current_date,
+            context['average_rating'] = target.average_rating
+            context['product_promotions'] = get_active_promotions(
+                get_current_date(),
+            ).filter(product=target).select_related('promotion').only(
+                'promotion__discount_amount',
             )
-
-            if product_promotions.exists():
-                max_discount_amount = max(
-                    pp.promotion.discount_amount for pp in product_promotions
-                )
-                discount_factor = Decimal((100 - max_discount_amount) / 100)
-                price_with_max_discount = product.price * discount_factor
-                context['product_promotions'] = product_promotions
-                context['price_with_max_discount_amount'] = round(
-                    price_with_max_discount, 2,
-                )
-                context['max_discount_amount'] = max_discount_amount
+            context['price_with_max_discount_amount'] = target.discounted_price
+            context['max_discount_amount'] = target.max_discount_amount
 
         return render(
             request,
@@ -229,27 +417,67 @@ def create_view(model_class, context_name, template, redirect_page):
     return view
 
 
+PRODUCT_TILE_FIELDS = ('id', 'title', 'image', 'category__title')
+PRODUCT_REVIEWS_PAGE_SIZE = 10
+
 view_category = create_view(
     Category,
     'category',
     'entities/category.html',
     'categories',
+    cached_fragments=True,
+    related_lists={'category_products': ('products', (), ('id', 'title', 'image', 'category'))},
 )
 view_product = create_view(
     Product,
     'product',
     'entities/product.html',
     'products',
+    select_related=('category',),
 )
 view_promotion = create_view(
     Promotion,
     'promotion',
     'entities/promotion.html',
     'promotions',
+    cached_fragments=True,
+    related_lists={'promotion_products': ('products', ('category',), PRODUCT_TILE_FIELDS)},
 )
 view_review = create_view(Review, 'review', 'entities/review.html', 'reviews')
 
 
+@decorators.login_required
+def view_product_reviews(request):
+    """
+    Render a page of the reviews of a product, newest first, for the product page to append.
+
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request with id and cursor.
+
+    Returns:
+        django.http.HttpResponse: Rendered page of the reviews.
+
+    Raises:
+        Http404: If the product id is not a UUID.
+    """
+    try:
+        product_id = UUID(request.GET.get('id', ''))
+    except ValueError:
+        raise Http404('The product id should be a UUID')
+    reviews = Review.objects.filter(product_id=product_id).select_related('client__user').only(
+        'text', 'rating', 'created_datetime', 'client__user__username',
+    )
+    cursor = request.GET.get('cursor')
+    paginator = KeysetPaginator(
+        reviews, PRODUCT_REVIEWS_PAGE_SIZE, ordering=('-created_datetime',), count=False,
+    )
+    return render(
+        request,
+        'entities/product_reviews.html',
+        {'product_id': product_id, 'reviews': paginator.get_page(cursor), 'cursor': cursor},
+    )
+
+
 @decorators.login_required
 def profile(request):
     """
@@ -271,10 +499,14 @@ def profile(request):
             money = form.cleaned_data.get('money')
             client.money += money
             client.save()
+            registry.increment(FUNDS_ADDITIONS)
+            registry.increment(FUNDS_ADDED, amount=float(money))
     else:
         form = AddFundsForm()
 
-    client_products = ClientToProduct.objects.filter(client=client)
+    client_products = ClientToProduct.objects.filter(client=client).select_related(
+        'product__category',
+    )
 
     products_with_quantities = [
         {
@@ -302,162 +534,188 @@ def profile(request):
 @decorators.login_required
 def order(request):
     """
-    Handle deletion of a review by a logged-in user.
+    Order a quantity of a product at its price resolved on the server.
 
     Args:
-        request: HttpRequest object containing the request data.
+        request (django.http.HttpRequest): The incoming HTTP request with id and quantity.
 
     Returns:
-        HttpResponseRedirect: Redirects to the categories page if no product ID is found.
-        RenderResponse: Renders the delete_review template if the request is neither GET nor POST.
-        Otherwise, deletes the review and redirects to the product page.
+        django.http.HttpResponseRedirect: Redirect to the categories page if the product does
+        not exist, otherwise to the profile page after an accepted POST.
+        django.http.HttpResponse: Rendered order confirmation for a GET, with the error of
+        a quantity out of range or of a declined order.
     """
-    product_id = request.GET.get('id', None)
-    if not product_id:
+    product_id = request.GET.get('id', '')
+    price = get_product_price(product_id)
+    if price is None:
         return redirect('categories')
+    query = request.POST if request.method == 'POST' else request.GET
     try:
-        product = Product.objects.get(id=product_id) if product_id else None
-    except exceptions.ObjectDoesNotExist:
-        return redirect('categories')
-    if not product:
-        return redirect('categories')
+        quantity = int(query.get('quantity', 1))
+    except ValueError:
+        quantity = 1
+
+    error = ''
+    status = 200
+    if quantity < 1 or quantity > QUANTITY_MAX:
+        error = f'The quantity should be from 1 to {QUANTITY_MAX}.'
+        status = 400
+    elif request.method == 'POST':
+        if checkout(request.user.id, [(product_id, price, quantity)]):
+            return redirect('profile')
+        error = 'The order was declined: the funds are insufficient or the quantity is too large.'
+        status = 409
 
-    client = Client.objects.get(user=request.user)
+    return render(
+        request,
+        'pages/order.html',
+        {
+            'money': Client.objects.values_list('money', flat=True).get(user=request.user),
+            'product': Product.objects.only('id', 'title').get(id=product_id),
+            'quantity': quantity,
+            'sum_price_quantity': price * quantity,
+            'price_with_max_discount_amount': price,
+            'error': error,
+        },
+        status=status,
+    )
 
-    if request.method == 'GET':
-        price_with_max_discount_amount = Decimal(
-            request.GET.get(
-                'price_with_max_discount_amount',
-                None,
-            ).replace(',', '.'),
-        )
-        quantity = int(request.GET.get('quantity', None))
 
-    if request.method == 'POST':
-        price_with_max_discount_amount = Decimal(
-            request.POST.get(
-                'price_with_max_discount_amount',
-                None,
-            ).replace(',', '.'),
-        )
-        quantity = int(request.POST.get('quantity', None))
+@decorators.login_required
+def cancel_order(request):
+    """
+    Return purchased items of a product, refunding the prices they were bought at.
 
-    sum_price_quantity = Decimal(quantity * price_with_max_discount_amount)
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request with id, returned
+            quantity and the optional price of the returned purchases.
+
+    Returns:
+        django.http.HttpResponseRedirect: Redirect to the categories page if the product does
+        not exist, otherwise to the profile page after a POST.
+        django.http.HttpResponse: Rendered cancellation confirmation for a GET.
+    """
+    try:
+        product = Product.objects.only('id', 'title').get(id=request.GET.get('id', ''))
+    except (exceptions.ObjectDoesNotExist, exceptions.ValidationError):
+        return redirect('categories')
+    query = request.POST if request.method == 'POST' else request.GET
+    try:
+        returned_quantity = int(query.get('returned_quantity', 0))
+    except ValueError:
+        returned_quantity = 0
+    try:
+        price = Decimal(query['price']) if query.get('price') else None
+    except InvalidOperation:
+        return redirect('profile')
+    if price is not None and not price.is_finite():
+        return redirect('profile')
 
     if request.method == 'POST':
-        if client.money >= sum_price_quantity:
-            client.money -= sum_price_quantity
-            client.save()
-            try:
-                client_to_product = ClientToProduct.objects.get(
-                    client_id=client.id,
-                    product_id=product_id,
-                    price=price_with_max_discount_amount,
-                )
-                client_to_product.quantity += quantity
-                client_to_product.save()
-            except Exception:
-                client_to_product = ClientToProduct.objects.create(
-                    client_id=client.id,
-                    product_id=product_id,
-                    quantity=quantity,
-                    price=price_with_max_discount_amount)
-                client_to_product.save()
+        cancel(request.user.id, product.id, returned_quantity, price)
         return redirect('profile')
 
+    purchases = ClientToProduct.objects.filter(client__user=request.user, product=product)
+    if price is not None:
+        purchases = purchases.filter(price=price)
+    returns = get_returns(purchases, returned_quantity)
     return render(
         request,
-        'pages/order.html',
+        'pages/cancel_order.html',
         {
-            'money': client.money,
+            'product': product,
+            'price': price,
+            'returned_quantity': sum(quantity for _, quantity in returns),
+            'sum_price_returned_quantity': sum(
+                purchase.price * quantity for purchase, quantity in returns
+            ),
+        },
+    )
+
+
+@decorators.login_required
+def view_cart(request):
+    """
+    Render the cart with the current prices of its products.
+
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request.
+
+    Returns:
+        django.http.HttpResponse: Rendered cart page.
+    """
+    cart = Cart(request.session)
+    lines = []
+    for product in cart.get_products():
+        quantity = cart.quantities[str(product.id)]
+        lines.append({
             'product': product,
             'quantity': quantity,
-            'sum_price_quantity': sum_price_quantity,
-            'price_with_max_discount_amount': price_with_max_discount_amount,
+            'sum_price_quantity': product.discounted_price * quantity,
+        })
+    return render(
+        request,
+        'pages/cart.html',
+        {
+            'lines': lines,
+            'total': sum(line['sum_price_quantity'] for line in lines),
+            'money': Client.objects.values_list('money', flat=True).get(user=request.user),
         },
     )
 
 
+@require_POST
 @decorators.login_required
-def cancel_order(request):
+def add_to_cart(request):
     """
-    Handle deletion of a review by a logged-in user.
+    Add a quantity of a product to the cart.
 
     Args:
-        request: HttpRequest object containing the request data.
+        request (django.http.HttpRequest): The incoming HTTP request with id and quantity.
 
     Returns:
-        HttpResponseRedirect: Redirects to the categories page if no product ID is found.
-        RenderResponse: Renders the delete_review template if the request is neither GET nor POST.
-        Otherwise, deletes the review and redirects to the product page.
+        django.http.HttpResponseRedirect: Redirect to the cart page.
     """
-    product_id = request.GET.get('id', None)
-    if not product_id:
-        return redirect('categories')
     try:
-        product = Product.objects.get(id=product_id) if product_id else None
-    except exceptions.ObjectDoesNotExist:
-        return redirect('categories')
-    if not product:
-        return redirect('categories')
+        quantity = int(request.POST.get('quantity', 1))
+    except ValueError:
+        quantity = 0
+    Cart(request.session).add(request.POST.get('id', ''), quantity)
+    return redirect('cart')
 
-    client = Client.objects.get(user=request.user)
 
-    returned_quantity = int(request.session.get('returned_quantity', 0))
+@require_POST
+@decorators.login_required
+def remove_from_cart(request):
+    """
+    Remove a product from the cart.
 
-    if request.method == 'GET':
-        item_price = Decimal(
-            request.GET.get(
-                'item_price',
-                None,
-            ).replace(',', '.'),
-        )
-        returned_quantity = int(request.GET.get('returned_quantity', 0))
-        request.session['returned_quantity'] = returned_quantity
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request with id.
 
-    if request.method == 'POST':
-        item_price = Decimal(
-            request.POST.get(
-                'item_price',
-                None,
-            ).replace(',', '.'),
-        )
+    Returns:
+        django.http.HttpResponseRedirect: Redirect to the cart page.
+    """
+    Cart(request.session).remove(request.POST.get('id', ''))
+    return redirect('cart')
 
-    client_to_product = ClientToProduct.objects.get(
-        client_id=client.id, product_id=product_id, price=item_price)
-    if returned_quantity > client_to_product.quantity:
-        returned_quantity = client_to_product.quantity
 
-    sum_price_returned_quantity = Decimal(returned_quantity * item_price)
+@require_POST
+@decorators.login_required
+def checkout_cart(request):
+    """
+    Buy all products of the cart in one transaction.
 
-    if request.method == 'POST':
-        client_to_product = ClientToProduct.objects.get(
-            client_id=client.id, product_id=product_id, price=item_price)
-        if returned_quantity < client_to_product.quantity:
-            sum_price_returned_quantity = returned_quantity * client_to_product.price
-            client.money += sum_price_returned_quantity
-            client_to_product.quantity -= returned_quantity
-            client_to_product.save()
-            client.save()
-        else:
-            returned_quantity = client_to_product.quantity
-            sum_price_returned_quantity = returned_quantity * client_to_product.price
-            client.money += sum_price_returned_quantity
-            client_to_product.delete()
-            client.save()
-        return redirect('profile')
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request.
 
-    return render(
-        request,
-        'pages/cancel_order.html',
-        {
-            'money': client.money,
-            'product': product,
-            'returned_quantity': returned_quantity,
-            'sum_price_returned_quantity': sum_price_returned_quantity,
-            'item_price': item_price,
-        },
-    )
+    Returns:
+        django.http.HttpResponseRedirect: Redirect to the profile page if the cart is bought,
+        otherwise back to the cart page.
+    """
+    if Cart(request.session).checkout(request.user.id):
+        return redirect('profile')
+    return redirect('cart')
 
 
 @decorators.login_required
@@ -568,3 +826,83 @@ def delete_review(request):
             'product': product,
         },
     )
+
+
+@staff_member_required
+def export(request, name, file_format):
+    """
+    Stream a table of the store for the warehouse.
+
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request.
+        name (str): Name of the export: products, promotions, reviews or purchases.
+        file_format (str): Format of the export: csv or ndjson.
+
+    Returns:
+        django.http.StreamingHttpResponse: Response streaming the export.
+
+    Raises:
+        Http404: If the export or the format does not exist.
+    """
+    if name not in EXPORTS or file_format not in EXPORT_FORMATS:
+        raise Http404
+    response = StreamingHttpResponse(
+        iter_export(name, file_format), content_type=EXPORT_FORMATS[file_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{name}.{file_format}"'
+    return response
+
+
+@staff_member_required
+def view_profiles(request):
+    """
+    List the captured request profiles.
+
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request.
+
+    Returns:
+        django.http.HttpResponse: Rendered list of the profiles.
+    """
+    return render(request, 'pages/profiling.html', {'profiles': list_profiles()})
+
+
+@staff_member_required
+def download_profile(request, name):
+    """
+    Download a captured request profile.
+
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request.
+        name (str): Name of the profile file.
+
+    Returns:
+        django.http.FileResponse: Response with the profile as an attachment.
+
+    Raises:
+        Http404: If the profile does not exist.
+    """
+    path = get_profile_path(name)
+    if path is None:
+        raise Http404
+    return FileResponse(path.open('rb'), as_attachment=True, filename=name)
+
+
+def view_metrics(request):
+    """
+    Expose the metrics of the store in the text exposition format.
+
+    Only the INTERNAL_IPS and the staff can read the metrics.
+
+    Args:
+        request (django.http.HttpRequest): The incoming HTTP request.
+
+    Returns:
+        django.http.HttpResponse: Metrics page.
+
+    Raises:
+        Http404: If the request comes from outside and not from the staff.
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS and not request.user.is_staff:
+        raise Http404
+    return HttpResponse(render_metrics(collect_metrics()), content_type=METRICS_CONTENT_TYPE)
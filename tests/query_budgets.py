@@ -0,0 +1,41 @@
+from types import MappingProxyType
+
+# Maximum number of queries of each view of grocery_store_app/urls.py with a logged in
+# client, including the session and user lookups.
+QUERY_BUDGETS = MappingProxyType({
+    'register': 2,
+    'api-root': 0,
+    'category-list': 1,
+    'category-detail': 1,
+    'product-list': 2,
+    'product-detail': 2,
+    'promotion-list': 2,
+    'promotion-detail': 2,
+    'review-list': 1,
+    'review-detail': 1,
+    'client-list': 2,
+    'client-detail': 2,
+    'homepage': 2,
+    'categories': 5,
+    'category': 4,
+    'products': 4,
+    'product': 4,
+    'product_reviews': 3,
+    'promotions': 5,
+    'promotion': 4,
+    'reviews': 5,
+    'clients': 5,
+    'profile': 5,
+    'order': 4,
+    'cancel_order': 8,
+    'cart': 4,
+    'add_to_cart': 6,
+    'remove_from_cart': 5,
+    'checkout_cart': 7,
+    'add_review': 4,
+    'delete_review': 7,
+    'export': 3,
+    'profiling': 2,
+    'profiling_download': 2,
+    'metrics': 0,
+})
@@ -2,13 +2,15 @@ from datetime import date, timedelta
 
 from django.conf.global_settings import AUTH_USER_MODEL
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 from grocery_store_app.models import (Category, Client, Product,
-                                      ProductToPromotion, Promotion, Review)
+                                      ProductToPromotion, Promotion, Review,
+                                      get_current_datetime)
 
 
 def create_viewset_test(model_class, url, creation_attrs):
@@ -114,3 +116,48 @@ ReviewViewSetTest = create_viewset_test(
     Review, '/rest/reviews/',
     {'text': 'A'}
 )
+
+
+class PaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='user', password='user')
+        self.client.force_authenticate(
+            user=self.user, token=Token.objects.create(user=self.user))
+        for index in range(130):
+            Category.objects.create(title=f'{index}')
+
+    def test_default_page_size(self):
+        response = self.client.get('/rest/categories/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+
+    def test_page_size(self):
+        response = self.client.get('/rest/categories/', {'page_size': 7})
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_max_page_size(self):
+        response = self.client.get('/rest/categories/', {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 100)
+
+    def walk(self):
+        titles = []
+        url = '/rest/categories/?page_size=50'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles.extend(category['title'] for category in response.data['results'])
+            url = response.data['next']
+        return titles
+
+    def test_walk(self):
+        self.assertEqual(sorted(self.walk()), sorted(f'{index}' for index in range(130)))
+
+    def test_created_datetime_not_null(self):
+        boundary_category = Category.objects.order_by('-created_datetime', '-id')[49]
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Category.objects.filter(pk=boundary_category.pk).update(created_datetime=None)
+        Category.objects.update(created_datetime=get_current_datetime())
+        self.assertEqual(sorted(self.walk()), sorted(f'{index}' for index in range(130)))
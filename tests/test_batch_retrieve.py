@@ -0,0 +1,81 @@
+from decimal import Decimal
+from unittest import mock
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from grocery_store_app.models import (Category, Product, ProductToPromotion,
+                                      Promotion)
+from grocery_store_app.views import REST_MAX_BATCH_SIZE, ProductViewSet
+
+
+class TestBatchRetrieve(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='user')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user, token=Token.objects.create(user=self.user))
+        self.categories = [Category.objects.create(title=f'Category {number}') for number in range(3)]
+        promotion = Promotion.objects.create(title='Sale', discount_amount=10)
+        self.products = []
+        for number in range(5):
+            product = Product.objects.create(
+                title=f'Product {number}', price=Decimal(number + 1), category=self.categories[0],
+            )
+            if number % 2:
+                ProductToPromotion.objects.create(product=product, promotion=promotion)
+            self.products.append(product)
+
+    def get_ids_url(self, route, instances, query=''):
+        return f"/rest/{route}/?ids={','.join(str(instance.id) for instance in instances)}{query}"
+
+    def test_order(self):
+        requested = [self.products[3], self.products[0], self.products[4]]
+        with self.assertNumQueries(2):
+            response = self.client.get(self.get_ids_url('products', requested))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            [self.client.get(f'/rest/products/{product.id}/').json() for product in requested],
+        )
+
+    def test_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.get_ids_url('categories', self.categories[::-1]))
+        self.assertEqual(
+            [category['title'] for category in response.json()],
+            ['Category 2', 'Category 1', 'Category 0'],
+        )
+
+    def test_missing_and_repeated_ids(self):
+        url = f'/rest/categories/?ids={uuid4()}, {self.categories[1].id},,{self.categories[1].id}'
+        response = self.client.get(url)
+        self.assertEqual([category['title'] for category in response.json()], ['Category 1'])
+        self.assertEqual(self.client.get('/rest/categories/?ids=').json(), [])
+
+    def test_fields(self):
+        response = self.client.get(
+            self.get_ids_url('products', self.products[:2], '&fields=title&expand=category'),
+        )
+        self.assertEqual(response.json(), [{'title': 'Product 0'}, {'title': 'Product 1'}])
+
+    def test_serializer(self):
+        url = self.get_ids_url('products', self.products[::-1])
+        content = self.client.get(url).content
+        with mock.patch.object(ProductViewSet, 'values_serializer_class', None):
+            self.assertEqual(self.client.get(url).content, content)
+
+    def test_invalid(self):
+        too_many = ','.join(str(uuid4()) for _ in range(REST_MAX_BATCH_SIZE + 1))
+        for url in ('/rest/products/?ids=1,2', f'/rest/products/?ids={too_many}'):
+            with self.subTest(url=url[:40]):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('ids', response.json())
+
+    def test_anonymous(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.get_ids_url('products', self.products))
+        self.assertIn(response.status_code, {401, 403})
@@ -4,7 +4,8 @@ from django.contrib.auth.models import User
 from django.test import TestCase
 from django.test import client as test_client
 
-from grocery_store_app.models import Client
+from grocery_store_app.models import (Category, Client, ClientToProduct,
+                                      Product)
 
 
 class TestCancelOrder(TestCase):
@@ -20,3 +21,67 @@ class TestCancelOrder(TestCase):
     def test_negative_funds(self):
         self.test_client.post(self._url, {'money': -1})
         self.assertEqual(self.grocery_store_client.money, 0)
+
+
+class TestCancelPurchases(TestCase):
+    def setUp(self) -> None:
+        self.test_client = test_client.Client()
+        self.user = User.objects.create(username='user', password='user')
+        self.grocery_store_client = Client.objects.create(user=self.user, money=0)
+        self.test_client.force_login(self.user)
+        category = Category.objects.create(title='Cheeses')
+        self.product = Product.objects.create(title='Gouda', price=10, category=category)
+        for price, quantity in ((Decimal('10'), 2), (Decimal('8'), 3)):
+            ClientToProduct.objects.create(
+                client=self.grocery_store_client, product=self.product,
+                price=price, quantity=quantity,
+            )
+
+    def cancel(self, quantity):
+        return self.test_client.post(
+            f'{TestCancelOrder._url}?id={self.product.id}',
+            {'returned_quantity': quantity, 'item_price': '100'},
+        )
+
+    def test_preview(self):
+        response = self.test_client.get(
+            TestCancelOrder._url, {'id': self.product.id, 'returned_quantity': 4})
+        self.assertEqual(response.context['returned_quantity'], 4)
+        self.assertEqual(response.context['sum_price_returned_quantity'], Decimal('34'))
+
+    def test_cancel(self):
+        self.cancel(4)
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, Decimal('34'))
+        self.assertEqual(
+            list(ClientToProduct.objects.values_list('price', 'quantity')), [(Decimal('10'), 1)])
+
+    def test_cancel_more_than_purchased(self):
+        self.cancel(10)
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, Decimal('44'))
+        self.assertFalse(ClientToProduct.objects.exists())
+
+    def test_cancel_price(self):
+        self.test_client.post(
+            f'{TestCancelOrder._url}?id={self.product.id}',
+            {'returned_quantity': 1, 'price': '10.00'},
+        )
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, Decimal('10'))
+        self.assertEqual(
+            sorted(ClientToProduct.objects.values_list('price', 'quantity')),
+            [(Decimal('8'), 3), (Decimal('10'), 1)],
+        )
+
+    def test_preview_price(self):
+        response = self.test_client.get(
+            TestCancelOrder._url,
+            {'id': self.product.id, 'returned_quantity': 4, 'price': '10.00'},
+        )
+        self.assertEqual(response.context['returned_quantity'], 2)
+        self.assertContains(response, 'name="price" value="10.00"')
+
+    def test_profile_price(self):
+        response = self.test_client.get('/accounts/profile/')
+        self.assertContains(response, 'name="price" value="8.00"')
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test import client as test_client
+from django.test.utils import CaptureQueriesContext
+
+from grocery_store_app.cart import Cart
+from grocery_store_app.models import (Category, Client, ClientToProduct,
+                                      Product)
+from grocery_store_app.pricing import refresh_stale_prices
+
+
+class TestCart(TestCase):
+    def setUp(self) -> None:
+        refresh_stale_prices()
+        self.test_client = test_client.Client()
+        self.user = User.objects.create(username='user', password='user')
+        self.grocery_store_client = Client.objects.create(user=self.user, money=1000)
+        self.test_client.force_login(self.user)
+        category = Category.objects.create(title='Cheeses')
+        self.products = [
+            Product.objects.create(title=f'Cheese {index}', price=index + 1, category=category)
+            for index in range(20)
+        ]
+
+    def add(self, product, quantity=1):
+        return self.test_client.post('/cart/add/', {'id': product.id, 'quantity': quantity})
+
+    def test_add_and_remove(self):
+        self.add(self.products[0], 2)
+        self.add(self.products[0], 3)
+        self.add(self.products[1])
+        self.test_client.post('/cart/add/', {'id': 'invalid', 'quantity': 1})
+        self.test_client.post('/cart/add/', {'id': self.products[2].id, 'quantity': 0})
+        self.test_client.post('/cart/remove/', {'id': self.products[1].id})
+        response = self.test_client.get('/cart/')
+        self.assertEqual(
+            [(line['product'], line['quantity']) for line in response.context['lines']],
+            [(self.products[0], 5)],
+        )
+        self.assertEqual(response.context['total'], Decimal(5))
+
+    def test_checkout(self):
+        for product in self.products:
+            self.add(product, 2)
+        response = self.test_client.post('/cart/checkout/')
+        self.assertRedirects(response, '/accounts/profile/', fetch_redirect_response=False)
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, 1000 - 2 * sum(range(1, 21)))
+        self.assertEqual(ClientToProduct.objects.filter(quantity=2).count(), 20)
+        self.assertFalse(self.test_client.get('/cart/').context['lines'])
+
+    def test_insufficient_funds(self):
+        self.add(self.products[-1], 51)
+        response = self.test_client.post('/cart/checkout/')
+        self.assertRedirects(response, '/cart/', fetch_redirect_response=False)
+        self.assertFalse(ClientToProduct.objects.exists())
+        self.assertEqual(len(self.test_client.get('/cart/').context['lines']), 1)
+
+    def test_constant_queries(self):
+        session = {}
+        single_cart, basket = Cart(session), Cart({})
+        single_cart.add(self.products[0].id, 1)
+        for product in self.products:
+            basket.add(product.id, 1)
+        with CaptureQueriesContext(connection) as single_queries:
+            self.assertTrue(single_cart.checkout(self.user.id))
+        with CaptureQueriesContext(connection) as basket_queries:
+            self.assertTrue(basket.checkout(self.user.id))
+        self.assertEqual(len(single_queries), 2)
+        self.assertEqual(len(basket_queries), len(single_queries))
+        self.assertFalse(session['cart'])
@@ -0,0 +1,69 @@
+import csv
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.client import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+
+from grocery_store_app.exporting import PRODUCT_COLUMNS, iter_export
+from grocery_store_app.models import Category, Client, Product, Review
+
+
+class TestExports(TestCase):
+    def setUp(self):
+        category = Category.objects.create(title='Cheeses')
+        for index in range(5):
+            Product.objects.create(title=f'Cheese {index}', price=index + 1, category=category)
+        user = User.objects.create(username='user', password='user')
+        self.client_model = Client.objects.create(user=user)
+        Review.objects.create(
+            text='Tasty', rating=5, client=self.client_model, product=Product.objects.first())
+        self.staff = User.objects.create(username='staff', password='staff', is_staff=True)
+
+    def test_csv(self):
+        rows = list(csv.reader(iter_export('products', 'csv')))
+        self.assertEqual(tuple(rows[0]), PRODUCT_COLUMNS)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(
+            sorted(row[1] for row in rows[1:]), [f'Cheese {index}' for index in range(5)])
+
+    def test_ndjson(self):
+        lines = list(iter_export('reviews', 'ndjson'))
+        self.assertEqual(len(lines), 1)
+        review = json.loads(lines[0])
+        self.assertEqual(review['text'], 'Tasty')
+        self.assertEqual(review['client_id'], str(self.client_model.id))
+
+    def test_single_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(iter_export('products', 'csv'))
+        self.assertEqual(len(queries), 1)
+
+    def test_staff_only(self):
+        client = TestClient()
+        client.force_login(user=User.objects.get(username='user'))
+        self.assertEqual(client.get('/export/products.csv').status_code, 302)
+        client.force_login(user=self.staff)
+        response = client.get('/export/products.csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 6)
+        self.assertEqual(client.get('/export/clients.csv').status_code, 404)
+        self.assertEqual(client.get('/export/products.xml').status_code, 404)
+
+    def test_command(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'promotions.ndjson'
+            call_command('export_data', 'promotions', '--format', 'ndjson', '--output', str(path))
+            self.assertEqual(path.read_text(encoding='utf-8'), '')
+        stdout = StringIO()
+        call_command('export_data', 'products', stdout=stdout)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 6)
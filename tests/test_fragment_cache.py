@@ -0,0 +1,87 @@
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.client import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+
+from grocery_store_app.checks import check_shared_cache
+from grocery_store_app.models import (Category, Client, Product,
+                                      ProductToPromotion, Promotion)
+from grocery_store_app.pricing import refresh_stale_prices
+
+LOCMEM_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+REDIS_BACKEND = 'django.core.cache.backends.redis.RedisCache'
+
+
+class TestFragmentCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        refresh_stale_prices()
+        user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=user)
+        self.client = TestClient()
+        self.client.force_login(user=user)
+        self.category = Category.objects.create(title='Сыры')
+        self.product = Product.objects.create(title='Gouda', price=10, category=self.category)
+        self.promotion = Promotion.objects.create(title='Sale', discount_amount=10)
+        ProductToPromotion.objects.create(product=self.product, promotion=self.promotion)
+
+    def get(self, entity):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/{entity.__class__.__name__.lower()}/?id={entity.id}')
+        return response.content.decode(), queries
+
+    def test_cached_grid(self):
+        for entity in (self.category, self.promotion):
+            content, cold_queries = self.get(entity)
+            self.assertIn('Gouda', content)
+            content, warm_queries = self.get(entity)
+            self.assertIn('Gouda', content)
+            self.assertLess(len(warm_queries), len(cold_queries))
+            self.assertFalse(
+                [query for query in warm_queries if '"products"' in query['sql']])
+
+    def test_invalidation(self):
+        self.get(self.category)
+        self.get(self.promotion)
+        self.product.title = 'Edam'
+        self.product.save()
+        for entity in (self.category, self.promotion):
+            self.assertIn('Edam', self.get(entity)[0])
+        brie = Product.objects.create(title='Brie', price=5, category=self.category)
+        self.assertIn('Brie', self.get(self.category)[0])
+        ProductToPromotion.objects.create(product=brie, promotion=self.promotion)
+        self.assertIn('Brie', self.get(self.promotion)[0])
+        self.product.delete()
+        self.assertNotIn('Edam', self.get(self.category)[0])
+
+    def test_import_invalidation(self):
+        self.get(self.category)
+        with TemporaryDirectory() as directory:
+            path = Path(directory, 'products.csv')
+            path.write_text('title,price,category\nBrie,5,Сыры\n', encoding='utf-8')
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command(
+                    'import_catalog', str(path), '--kind', 'products', stdout=StringIO(),
+                )
+        self.assertIn('Brie', self.get(self.category)[0])
+
+    def test_m2m_invalidation(self):
+        brie = Product.objects.create(title='Brie', price=5, category=self.category)
+        self.assertNotIn('Brie', self.get(self.promotion)[0])
+        self.promotion.products.add(brie)
+        self.assertIn('Brie', self.get(self.promotion)[0])
+
+    def test_shared_cache_check(self):
+        with override_settings(CACHES={'default': {'BACKEND': LOCMEM_BACKEND}}):
+            self.assertEqual(
+                [error.id for error in check_shared_cache(None)], ['grocery_store_app.E001'],
+            )
+        with override_settings(CACHES={'default': {'BACKEND': REDIS_BACKEND}}):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,98 @@
+from collections import Counter
+from io import StringIO
+from random import Random
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from grocery_store_app.caching import CATALOG_VERSION_KEY, get_version
+from grocery_store_app.generating import (GENERATED_CATEGORY_TITLES,
+                                          build_products, generate_dataset,
+                                          get_dataset_sizes)
+from grocery_store_app.models import (Category, Client, ClientToProduct,
+                                      Product, ProductToPromotion, Promotion,
+                                      Review)
+
+
+class TestGenerateDataset(TestCase):
+    def setUp(self):
+        self.progress = []
+        self.sizes = generate_dataset(
+            3000, seed=1, batch_size=500,
+            progress=lambda *report: self.progress.append(report),
+        )
+
+    def test_sizes(self):
+        planned_sizes = get_dataset_sizes(3000)
+        self.assertEqual(
+            {**self.sizes, 'purchases': planned_sizes['purchases']}, planned_sizes,
+        )
+        self.assertEqual(Client.objects.count(), self.sizes['clients'])
+        self.assertEqual(Product.objects.count(), self.sizes['products'])
+        self.assertEqual(Promotion.objects.count(), self.sizes['promotions'])
+        self.assertEqual(Review.objects.count(), self.sizes['reviews'])
+        # repeated purchases at the same price are left out by the unique key
+        self.assertEqual(ClientToProduct.objects.count(), self.sizes['purchases'])
+        self.assertLess(self.sizes['purchases'], planned_sizes['purchases'])
+        self.assertGreater(self.sizes['purchases'], planned_sizes['purchases'] / 2)
+        self.assertTrue(ProductToPromotion.objects.exists())
+        self.assertTrue(Category.objects.filter(title='Сыры').exists())
+
+    def test_repeated_runs(self):
+        generate_dataset(500, seed=2)
+        self.assertEqual(Category.objects.filter(title='Сыры').count(), 1)
+        self.assertEqual(Category.objects.count(), len(GENERATED_CATEGORY_TITLES))
+        self.assertEqual(Product.objects.count(), self.sizes['products'] + 10)
+
+    def test_progress(self):
+        self.assertIn(('Review', 500, self.sizes['reviews']), self.progress)
+        self.assertIn(('Review', self.sizes['reviews'], self.sizes['reviews']), self.progress)
+
+    def test_distributions(self):
+        ratings = Counter(Review.objects.values_list('rating', flat=True))
+        self.assertEqual(ratings.most_common(1)[0][0], 5)
+        review_counts = sorted(
+            Product.objects.values_list('rating_count', flat=True), reverse=True)
+        self.assertGreater(review_counts[0], 5 * sum(review_counts) / len(review_counts))
+        self.assertEqual(sum(review_counts), self.sizes['reviews'])
+        prices = sorted(Product.objects.values_list('price', flat=True))
+        self.assertLess(prices[len(prices) // 2], prices[-1] / 3)
+        self.assertTrue(Product.objects.filter(discounted_price__isnull=False).exists())
+        regular_client = Client.objects.annotate(
+            purchases=Count('clienttoproduct')).order_by('-purchases').first()
+        self.assertGreater(regular_client.purchases, 10)
+
+    def test_overlapping_promotions(self):
+        promotions = list(Promotion.objects.order_by('start_date'))
+        self.assertTrue(any(
+            later.start_date <= earlier.end_date
+            for earlier, later in zip(promotions, promotions[1:])
+        ))
+
+
+class TestCatalogVersion(TestCase):
+    def test_bumped(self):
+        catalog_version = get_version(CATALOG_VERSION_KEY)
+        generate_dataset(500)
+        self.assertNotEqual(get_version(CATALOG_VERSION_KEY), catalog_version)
+
+
+class TestSeed(TestCase):
+    def test_same_seed(self):
+        categories = [Category(title='Сыры'), Category(title='Соки')]
+        prices = [product.price for product in build_products(Random(1), 50, categories)]
+        self.assertEqual(
+            prices, [product.price for product in build_products(Random(1), 50, categories)])
+        self.assertNotEqual(
+            prices, [product.price for product in build_products(Random(2), 50, categories)])
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command('generate_data', '--rows', '500', '--batch-size', '100', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn(
+            f'ClientToProduct: {ClientToProduct.objects.count()} of 300 rows', output,
+        )
+        self.assertIn('Generated', output)
+        self.assertEqual(Review.objects.count(), 150)
@@ -0,0 +1,84 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from grocery_store_app.models import (Category, Product, Promotion,
+                                      get_current_date)
+
+
+class TestImportCatalog(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.category = Category.objects.create(title='Cheeses')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = Path(self.directory.name) / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def import_catalog(self, path, *args):
+        stdout = StringIO()
+        call_command('import_catalog', path, *args, stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def test_products_csv(self):
+        path = self.write('products.csv', '\n'.join((
+            'title,price,category,description',
+            'Gouda,10.50,Cheeses,',
+            'Apple juice,3,Juices,Fresh',
+            'Orange juice,4.20,Juices,',
+        )))
+        output = self.import_catalog(path, '--kind', 'products', '--chunk-size', '2')
+        self.assertIn('rows/s', output)
+        self.assertEqual(Product.objects.count(), 3)
+        self.assertEqual(Category.objects.filter(title='Juices').count(), 1)
+        juice = Product.objects.get(title='Apple juice')
+        self.assertEqual(juice.category.title, 'Juices')
+        self.assertEqual(juice.description, 'Fresh')
+        self.assertEqual(juice.discounted_price, Decimal('3.00'))
+        self.assertEqual(Product.objects.get(title='Gouda').category, self.category)
+
+    def test_promotions_jsonl(self):
+        tomorrow = get_current_date() + timedelta(days=1)
+        path = self.write('promotions.jsonl', '\n'.join((
+            json.dumps({'title': 'A', 'discount_amount': 10}),
+            json.dumps({'title': 'B', 'discount_amount': 20, 'end_date': tomorrow.isoformat()}),
+        )))
+        self.import_catalog(path, '--kind', 'promotions')
+        self.assertEqual(Promotion.objects.get(title='B').end_date, tomorrow)
+        self.assertEqual(Promotion.objects.get(title='A').end_date, get_current_date())
+
+    def test_invalid_chunk(self):
+        path = self.write('products.csv', '\n'.join((
+            'title,price,category',
+            'A,1,Cheeses',
+            'B,2,Cheeses',
+            'C,0,Cheeses',
+            'D,4,Cheeses',
+        )))
+        with self.assertRaisesRegex(CommandError, 'row 2.*\n.*--start-row 2'):
+            self.import_catalog(path, '--kind', 'products', '--chunk-size', '2')
+        self.assertEqual(Product.objects.count(), 2)
+        self.import_catalog(path, '--kind', 'products', '--start-row', '3')
+        self.assertEqual(
+            sorted(Product.objects.values_list('title', flat=True)), ['A', 'B', 'D'])
+
+    def test_skip_invalid(self):
+        path = self.write('promotions.csv', '\n'.join((
+            'title,discount_amount',
+            'A,10',
+            'B,101',
+            ',10',
+        )))
+        self.import_catalog(path, '--kind', 'promotions', '--skip-invalid')
+        self.assertEqual(list(Promotion.objects.values_list('title', flat=True)), ['A'])
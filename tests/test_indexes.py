@@ -0,0 +1,44 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from grocery_store_app.caching import CATALOG_VERSION_KEY, get_version
+from grocery_store_app.models import Product, Review
+from grocery_store_app.pricing import PRICES_VERSION_KEY
+
+
+class TestIndexes(TestCase):
+    def get_indexes(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE schemaname = 'grocery_store' "
+                'AND tablename = %s',
+                [table],
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_indexes(self):
+        self.assertTrue({'reviews_product_newest', 'reviews_product_rating'}.issubset(
+            self.get_indexes('reviews')))
+        self.assertIn('promotions_active_dates', self.get_indexes('promotions'))
+        self.assertIn(
+            'products_discounted_priced_on', self.get_indexes('products'))
+
+    def test_benchmark(self):
+        versions = [get_version(key) for key in (CATALOG_VERSION_KEY, PRICES_VERSION_KEY)]
+        stdout = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('benchmark_indexes', '--rows', '3000', stdout=stdout)
+        self.assertEqual(stdout.getvalue(), '')
+        call_command('benchmark_indexes', '--rows', '3000', '--i-know-this-locks', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('Newest reviews of a product', output)
+        self.assertEqual(output.count('Before:'), 6)
+        self.assertIn('reviews_product_newest', output.split('Top rated reviews')[0])
+        self.assertFalse(Review.objects.exists())
+        self.assertFalse(Product.objects.exists())
+        self.assertIn('reviews_product_newest', self.get_indexes('reviews'))
+        self.assertEqual(
+            [get_version(key) for key in (CATALOG_VERSION_KEY, PRICES_VERSION_KEY)], versions)
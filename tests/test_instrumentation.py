@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.client import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+
+from grocery_store_app.middleware import QueryRecorder
+from grocery_store_app.models import Category, Client, Product
+from grocery_store_app.pricing import refresh_stale_prices
+
+
+class TestQueryRecorder(TestCase):
+    def test_duplicates(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder), connection.cursor() as cursor:
+            for number in (1, 1, 2, 1):
+                cursor.execute('SELECT %s', [number])
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicates, 2)
+        self.assertEqual(recorder.slowest_sql, 'SELECT %s')
+        self.assertGreater(recorder.seconds, 0)
+        self.assertIn('desc="4 queries"', recorder.get_server_timing())
+        self.assertIn('db-duplicates;desc="2"', recorder.get_server_timing())
+
+
+class TestQueryInstrumentationMiddleware(TestCase):
+    def setUp(self):
+        refresh_stale_prices()
+        user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=user)
+        self.client = TestClient()
+        self.client.force_login(user=user)
+        self.category = Category.objects.create(title='Сыры')
+        Product.objects.create(title='Gouda', price=10, category=self.category)
+
+    def get_category(self):
+        return self.client.get('/category/', {'id': self.category.id})
+
+    def test_disabled(self):
+        response = self.get_category()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(SQL_INSTRUMENTATION=True)
+    def test_enabled(self):
+        with self.assertLogs('grocery_store_app.middleware', 'INFO') as logs:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.get_category()
+        self.assertEqual(response.status_code, 200)
+        server_timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', server_timing)
+        self.assertIn('db-slowest;dur=', server_timing)
+        self.assertNotIn('SELECT', server_timing)
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.path, '/category/')
+        self.assertEqual(record.queries, len(queries))
+        self.assertIn('SELECT', record.slowest_sql)
+        self.assertIn(f'queries={len(queries)}', logs.output[0])
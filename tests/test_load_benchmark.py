@@ -0,0 +1,71 @@
+import json
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import SimpleTestCase, TransactionTestCase
+
+from grocery_store_app.benchmarking import get_latency_report
+from grocery_store_app.generating import generate_dataset
+from grocery_store_app.models import Category, ClientToProduct, Promotion
+
+
+class TestLatencyReport(SimpleTestCase):
+    def test_percentiles(self):
+        report = get_latency_report([index / 1000 for index in range(1, 101)], 2)
+        self.assertEqual(report['requests'], 100)
+        self.assertEqual(report['requests_per_second'], 50)
+        self.assertEqual(report['p50_ms'], 50.5)
+        self.assertEqual(report['p99_ms'], 99.01)
+
+    def test_single_request(self):
+        report = get_latency_report([0.01], 1)
+        self.assertEqual(report['requests'], 1)
+        self.assertEqual((report['p50_ms'], report['p95_ms'], report['p99_ms']), (10, 10, 10))
+
+
+class TestLoadBenchmark(TransactionTestCase):
+    # the requests run in other threads, so the seeded rows are committed
+    available_apps = settings.INSTALLED_APPS
+
+    def tearDown(self):
+        for model_class in (ClientToProduct, Promotion, Category, User):
+            model_class.objects.all().delete()
+
+    def test_empty_store(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_load', stdout=StringIO())
+
+    def test_no_requests(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_load', '--requests', '0', stdout=StringIO())
+
+    def test_benchmark(self):
+        generate_dataset(300)
+        purchase = ClientToProduct.objects.order_by('-created_datetime').first()
+        purchases = ClientToProduct.objects.filter(
+            client=purchase.client, product=purchase.product,
+        )
+        quantity = purchases.aggregate(Sum('quantity'))['quantity__sum']
+        stdout = StringIO()
+        call_command(
+            'benchmark_load', '--requests', '6', '--concurrency', '3', '--warmup', '1',
+            stdout=stdout,
+        )
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report['purchases'], ClientToProduct.objects.count())
+        self.assertEqual(purchases.aggregate(Sum('quantity'))['quantity__sum'], quantity + 7)
+        self.assertEqual(set(report['routes']), {
+            'products', 'product', 'category', 'promotion', 'profile', 'order',
+            'product-list', 'category-list', 'promotion-list', 'review-list',
+        })
+        for route, route_report in report['routes'].items():
+            with self.subTest(route=route):
+                self.assertEqual(route_report['requests'], 6)
+                self.assertEqual(route_report['errors'], 0)
+                self.assertGreater(route_report['requests_per_second'], 0)
+                self.assertLessEqual(route_report['p50_ms'], route_report['p95_ms'])
+                self.assertLessEqual(route_report['p95_ms'], route_report['p99_ms'])
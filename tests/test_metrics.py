@@ -0,0 +1,176 @@
+import json
+import sys
+from collections import Counter
+from os import getpid
+from pathlib import Path
+from subprocess import Popen
+from tempfile import TemporaryDirectory
+from threading import Thread
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.client import Client as TestClient
+from django.urls import reverse
+
+from grocery_store_app.metrics import (CACHE_HIT_RATIO, CACHE_REQUESTS,
+                                       DB_QUERIES, FUNDS_ADDED,
+                                       METRICS_AGGREGATE_FILE, ORDERS,
+                                       REQUEST_DURATION, MetricsDirectory,
+                                       MetricsRegistry, collect_metrics,
+                                       registry, render_metrics)
+from grocery_store_app.models import Category, Client, Product
+from grocery_store_app.pricing import refresh_stale_prices
+
+CATEGORY_LABELS = (('view', 'category'),)
+
+
+class TestMetricsRegistry(SimpleTestCase):
+    def test_threads(self):
+        metrics_registry = MetricsRegistry()
+
+        def count():
+            for _ in range(1000):
+                metrics_registry.increment(ORDERS, (('result', 'ordered'),))
+
+        threads = [Thread(target=count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(metrics_registry.collect()[ORDERS, (('result', 'ordered'),)], 4000)
+
+    def test_histogram(self):
+        metrics_registry = MetricsRegistry()
+        metrics_registry.observe(REQUEST_DURATION, CATEGORY_LABELS, 0.02)
+        metrics_registry.observe(REQUEST_DURATION, CATEGORY_LABELS, 20)
+        samples = metrics_registry.collect()
+        bucket = f'{REQUEST_DURATION}_bucket'
+        self.assertEqual(samples[bucket, (*CATEGORY_LABELS, ('le', '0.01'))], 0)
+        self.assertEqual(samples[bucket, (*CATEGORY_LABELS, ('le', '0.025'))], 1)
+        self.assertEqual(samples[bucket, (*CATEGORY_LABELS, ('le', '10'))], 1)
+        self.assertEqual(samples[bucket, (*CATEGORY_LABELS, ('le', '+Inf'))], 2)
+        self.assertEqual(samples[f'{REQUEST_DURATION}_count', CATEGORY_LABELS], 2)
+        self.assertAlmostEqual(samples[f'{REQUEST_DURATION}_sum', CATEGORY_LABELS], 20.02)
+
+    def test_render(self):
+        metrics_registry = MetricsRegistry()
+        metrics_registry.observe(REQUEST_DURATION, CATEGORY_LABELS, 0.02)
+        metrics_registry.increment(CACHE_REQUESTS, (('cache', 'prices'), ('result', 'hit')), 3)
+        metrics_registry.increment(CACHE_REQUESTS, (('cache', 'prices'), ('result', 'miss')))
+        metrics_registry.increment(DB_QUERIES, (('view', 'say "hi"\n'),), 2)
+        lines = render_metrics(metrics_registry.collect()).splitlines()
+        self.assertIn(f'# TYPE {REQUEST_DURATION} histogram', lines)
+        buckets = [line for line in lines if line.startswith(f'{REQUEST_DURATION}_bucket')]
+        self.assertEqual(len(buckets), 12)
+        self.assertIn('le="0.005"', buckets[0])
+        self.assertIn('le="10"', buckets[-2])
+        self.assertEqual(buckets[-1], f'{REQUEST_DURATION}_bucket{{view="category",le="+Inf"}} 1.0')
+        self.assertIn(f'{CACHE_HIT_RATIO}{{cache="prices"}} 0.75', lines)
+        self.assertIn(f'{DB_QUERIES}{{view="say \\"hi\\"\\n"}} 2.0', lines)
+
+    def test_shared_directory(self):
+        ordered = (ORDERS, (('result', 'ordered'),))
+        with TemporaryDirectory() as directory:
+            Path(directory, '1.json').write_text(json.dumps([
+                [ORDERS, [['result', 'ordered']], 3],
+            ]))
+            with override_settings(METRICS_DIRECTORY=directory):
+                samples = collect_metrics()
+            self.assertEqual(len(list(Path(directory).glob(f'{getpid()}-*.json'))), 1)
+        self.assertEqual(samples[ordered], registry.collect()[ordered] + 3)
+
+    def test_reused_pid(self):
+        ordered = (ORDERS, (('result', 'ordered'),))
+        with TemporaryDirectory() as directory, override_settings(METRICS_DIRECTORY=directory):
+            for _ in range(2):
+                metrics_registry = MetricsRegistry()
+                metrics_registry.increment(*ordered)
+                metrics_registry.flush()
+            self.assertEqual(len(list(Path(directory).glob(f'{getpid()}-*.json'))), 2)
+            self.assertEqual(collect_metrics()[ordered], registry.collect()[ordered] + 2)
+
+    def test_stopped_processes(self):
+        ordered = (ORDERS, (('result', 'ordered'),))
+        stopped_process = Popen([sys.executable, '-c', ''])
+        stopped_process.wait()
+        with TemporaryDirectory() as directory, override_settings(METRICS_DIRECTORY=directory):
+            for name, amount in (
+                (METRICS_AGGREGATE_FILE, 2),
+                (f'{stopped_process.pid}-stopped.json', 3),
+                (f'{getpid()}-running.json', 5),
+            ):
+                Path(directory, name).write_text(json.dumps([
+                    [ORDERS, [['result', 'ordered']], amount],
+                ]))
+            MetricsRegistry().flush()
+            names = {path.name for path in Path(directory).glob('*.json')}
+            self.assertNotIn(f'{stopped_process.pid}-stopped.json', names)
+            self.assertIn(f'{getpid()}-running.json', names)
+            self.assertEqual(len(names), 3)
+            self.assertEqual(MetricsDirectory(Path(directory)).read(METRICS_AGGREGATE_FILE)[ordered], 5)
+            self.assertEqual(collect_metrics()[ordered], registry.collect()[ordered] + 10)
+
+
+class TestMetricsEndpoint(TestCase):
+    def setUp(self):
+        cache.clear()
+        refresh_stale_prices()
+        self.user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=self.user, money=1000)
+        self.client = TestClient()
+        self.client.force_login(user=self.user)
+        self.category = Category.objects.create(title='Сыры')
+        self.product = Product.objects.create(title='Gouda', price=10, category=self.category)
+
+    def get_delta(self, action, sample):
+        before = Counter(registry.collect())[sample]
+        action()
+        return registry.collect()[sample] - before
+
+    def test_requests(self):
+        self.assertEqual(self.get_delta(
+            lambda: self.client.get(reverse('category'), {'id': self.category.id}),
+            (f'{REQUEST_DURATION}_count', CATEGORY_LABELS),
+        ), 1)
+        self.assertGreater(self.get_delta(
+            lambda: self.client.get(reverse('category'), {'id': self.category.id}),
+            (DB_QUERIES, CATEGORY_LABELS),
+        ), 0)
+
+    def test_counters(self):
+        self.assertEqual(self.get_delta(
+            lambda: self.client.post(f"{reverse('order')}?id={self.product.id}", {'quantity': 1}),
+            (ORDERS, (('result', 'ordered'),)),
+        ), 1)
+        self.assertEqual(self.get_delta(
+            lambda: self.client.post(reverse('profile'), {'money': 100}),
+            (FUNDS_ADDED, ()),
+        ), 100)
+        self.assertEqual(self.get_delta(
+            lambda: self.client.get(f"{reverse('order')}?id={self.product.id}"),
+            (CACHE_REQUESTS, (('cache', 'prices'), ('result', 'hit'))),
+        ), 1)
+
+    def test_endpoint(self):
+        self.client.get(reverse('category'), {'id': self.category.id})
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertContains(response, f'{REQUEST_DURATION}_count{{view="category"}}')
+        self.assertContains(response, f'# TYPE {ORDERS} counter')
+
+    def test_outside(self):
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 404)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS=False)
+    def test_disabled(self):
+        self.assertEqual(self.get_delta(
+            lambda: TestClient().get(reverse('register')),
+            (f'{REQUEST_DURATION}_count', (('view', 'register'),)),
+        ), 0)
@@ -1,10 +1,15 @@
 from decimal import Decimal
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
 from django.test import client as test_client
+from django.test.utils import CaptureQueriesContext
 
-from grocery_store_app.models import Client
+from grocery_store_app.checkout import checkout
+from grocery_store_app.models import (QUANTITY_MAX, Category, Client,
+                                      ClientToProduct, Product)
+from grocery_store_app.pricing import refresh_stale_prices
 
 
 class TestOrder(TestCase):
@@ -20,3 +25,95 @@ class TestOrder(TestCase):
     def test_negative_funds(self):
         self.test_client.post(self._url, {'money': -1})
         self.assertEqual(self.grocery_store_client.money, 0)
+
+
+class TestCheckout(TestCase):
+    def setUp(self) -> None:
+        refresh_stale_prices()
+        self.test_client = test_client.Client()
+        self.user = User.objects.create(username='user', password='user')
+        self.grocery_store_client = Client.objects.create(user=self.user, money=100)
+        self.test_client.force_login(self.user)
+        category = Category.objects.create(title='Cheeses')
+        self.product = Product.objects.create(title='Gouda', price=10, category=category)
+
+    def order(self, quantity):
+        return self.test_client.post(
+            f'{TestOrder._url}?id={self.product.id}',
+            {'quantity': quantity, 'price_with_max_discount_amount': '0,01'},
+        )
+
+    def test_order(self):
+        with self.assertLogs('grocery_store_app.checkout') as logs:
+            response = self.order(2)
+        self.assertRedirects(response, '/accounts/profile/', fetch_redirect_response=False)
+        self.assertIn('ms', logs.output[0])
+        self.order(3)
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, 50)
+        purchase = ClientToProduct.objects.get(client=self.grocery_store_client)
+        self.assertEqual((purchase.quantity, purchase.price), (5, 10))
+
+    def test_insufficient_funds(self):
+        self.order(11)
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, 100)
+        self.assertFalse(ClientToProduct.objects.exists())
+
+    def test_declined(self):
+        response = self.order(11)
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, 'The order was declined', status_code=409)
+
+    def test_quantity_out_of_range(self):
+        for quantity in (-1, 0, QUANTITY_MAX + 1):
+            with self.subTest(quantity=quantity):
+                response = self.order(quantity)
+                self.assertContains(response, 'The quantity should be', status_code=400)
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, 100)
+        self.assertFalse(ClientToProduct.objects.exists())
+
+    def test_quantity_overflow(self):
+        Client.objects.filter(pk=self.grocery_store_client.pk).update(money=10 ** 6)
+        self.assertTrue(checkout(self.user.id, [(self.product.id, Decimal('1'), QUANTITY_MAX)]))
+        self.assertFalse(checkout(self.user.id, [(self.product.id, Decimal('1'), 1)]))
+        self.assertFalse(checkout(self.user.id, [
+            (self.product.id, Decimal('2'), QUANTITY_MAX),
+            (self.product.id, Decimal('2'), 1),
+        ]))
+        self.grocery_store_client.refresh_from_db()
+        self.assertEqual(self.grocery_store_client.money, 10 ** 6 - QUANTITY_MAX)
+        self.assertEqual(
+            list(ClientToProduct.objects.values_list('quantity', flat=True)), [QUANTITY_MAX],
+        )
+
+    def test_single_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            ordered = checkout(self.user.id, [
+                (self.product.id, Decimal('10'), 1),
+                (self.product.id, Decimal('10'), 2),
+                (self.product.id, Decimal('5'), 1),
+            ])
+        self.assertTrue(ordered)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            sorted(ClientToProduct.objects.values_list('price', 'quantity')),
+            [(Decimal('5'), 1), (Decimal('10'), 3)],
+        )
+        self.assertFalse(checkout(self.user.id, []))
+
+    def test_unknown_product(self):
+        response = self.test_client.post(f'{TestOrder._url}?id=invalid', {'quantity': 1})
+        self.assertRedirects(response, '/categories/', fetch_redirect_response=False)
+
+    def test_cached_price(self):
+        self.order(1)
+        with CaptureQueriesContext(connection) as queries:
+            self.order(1)
+        self.assertEqual(len(queries), 3)
+        self.product.price = 20
+        self.product.save()
+        self.order(1)
+        self.assertEqual(
+            sorted(ClientToProduct.objects.values_list('price', 'quantity')), [(10, 2), (20, 1)])
@@ -0,0 +1,99 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.client import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+
+from grocery_store_app.models import Category, Client, Product
+from grocery_store_app.pagination import (KeysetPaginator,
+                                          get_keyset_ordering)
+from grocery_store_app.pricing import refresh_stale_prices
+
+
+class TestKeysetPagination(TestCase):
+    def setUp(self):
+        for category_title in ('B', 'A', 'C'):
+            category = Category.objects.create(title=category_title)
+            for index in range(9):
+                Product.objects.create(
+                    title=f'{index % 4}', price=10 - index % 2, category=category)
+        self.products = list(Product.objects.order_by('category__title', 'title', 'price', 'pk'))
+        self.paginator = KeysetPaginator(Product.objects.all(), 4, count=False)
+
+    def walk(self, page, cursor_attr):
+        pages = [page]
+        while getattr(page, cursor_attr):
+            page = self.paginator.get_page(getattr(page, cursor_attr))
+            pages.append(page)
+        return pages
+
+    def test_ordering(self):
+        self.assertEqual(
+            get_keyset_ordering(Product), ['category__title', 'title', 'price', 'pk'])
+        self.assertEqual(get_keyset_ordering(Client), ['user_id', 'pk'])
+        self.assertEqual(
+            get_keyset_ordering(Product, ['-category']), ['-category__title', 'pk'])
+
+    def test_forward(self):
+        pages = self.walk(self.paginator.get_page(), 'next_cursor')
+        self.assertEqual(len(pages), 7)
+        self.assertFalse(pages[0].has_previous)
+        self.assertFalse(pages[-1].has_next)
+        walked = [product for page in pages for product in page]
+        self.assertEqual(
+            [(product.category.title, product.title, product.price) for product in walked],
+            [(product.category.title, product.title, product.price) for product in self.products],
+        )
+        self.assertEqual(len({product.pk for product in walked}), len(self.products))
+
+    def test_backward(self):
+        last_page = self.walk(self.paginator.get_page(), 'next_cursor')[-1]
+        pages = self.walk(last_page, 'previous_cursor')
+        self.assertEqual(len(pages), 7)
+        self.assertEqual(list(pages[-1]), self.products[:4])
+
+    def test_null_keys(self):
+        for index, product in enumerate(self.products):
+            if index % 3:
+                Product.objects.filter(pk=product.pk).update(description=f'{index % 5}')
+        for ordering in (['description'], ['-description']):
+            with self.subTest(ordering=ordering):
+                self.paginator = KeysetPaginator(Product.objects.all(), 4, ordering, count=False)
+                pages = self.walk(self.paginator.get_page(), 'next_cursor')
+                walked = [product.pk for page in pages for product in page]
+                self.assertEqual(walked, list(Product.objects.order_by(
+                    *ordering, 'pk',
+                ).values_list('pk', flat=True)))
+                backward_pages = self.walk(pages[-1], 'previous_cursor')
+                self.assertEqual(
+                    [product.pk for page in backward_pages[::-1] for product in page], walked,
+                )
+
+    def test_invalid_cursor(self):
+        self.assertEqual(list(self.paginator.get_page('invalid')), self.products[:4])
+
+    def test_constant_queries(self):
+        cursor = self.walk(self.paginator.get_page(), 'next_cursor')[-2].next_cursor
+        with CaptureQueriesContext(connection) as first_page_queries:
+            self.paginator.get_page()
+        with CaptureQueriesContext(connection) as last_page_queries:
+            self.paginator.get_page(cursor)
+        self.assertEqual(len(first_page_queries), len(last_page_queries))
+        self.assertNotIn('OFFSET', last_page_queries[0]['sql'])
+
+    def test_estimated_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE "grocery_store"."products"')
+        page = KeysetPaginator(Product.objects.all(), 4).get_page()
+        self.assertEqual(page.count, len(self.products))
+
+    def test_products_page(self):
+        refresh_stale_prices()
+        user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=user)
+        client = TestClient()
+        client.force_login(user=user)
+        response = client.get('/products/')
+        next_cursor = response.context['keyset_page'].next_cursor
+        response = client.get('/products/', {'cursor': next_cursor})
+        self.assertEqual(list(response.context['products_list']), self.products[10:20])
@@ -0,0 +1,171 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import client as test_client
+
+from grocery_store_app import signals
+from grocery_store_app.caching import CATALOG_VERSION_KEY, get_version
+from grocery_store_app.models import (Category, Client, Product,
+                                      ProductToPromotion, Promotion,
+                                      get_current_date)
+from grocery_store_app.pricing import (get_product_price,
+                                       get_product_prices,
+                                       refresh_stale_prices)
+
+
+class TestPricing(TestCase):
+    def setUp(self) -> None:
+        self.category = Category.objects.create(title='A')
+        self.product = Product.objects.create(
+            title='A', price=100.00, category=self.category)
+        self.promotion = Promotion.objects.create(
+            title='A', discount_amount=10)
+
+    def assert_price(self, discount_amount, discounted_price):
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.max_discount_amount, discount_amount)
+        self.assertEqual(self.product.discounted_price, Decimal(discounted_price))
+
+    def test_new_product(self):
+        self.assert_price(0, '100.00')
+        self.assertEqual(self.product.priced_on, get_current_date())
+
+    def test_add_promotion(self):
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        self.assert_price(10, '90.00')
+
+    def test_best_promotion(self):
+        best_promotion = Promotion.objects.create(
+            title='B', discount_amount=25)
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=best_promotion)
+        self.assert_price(25, '75.00')
+        best_promotion.delete()
+        self.assert_price(10, '90.00')
+
+    def test_delete_promotion_once(self):
+        products = [self.product] + [
+            Product.objects.create(title=title, price=10, category=self.category)
+            for title in ('B', 'C')
+        ]
+        for product in products:
+            ProductToPromotion.objects.create(product=product, promotion=self.promotion)
+        refresh = mock.Mock(wraps=signals.refresh_product_prices)
+        bump = mock.Mock(wraps=signals.bump_version)
+        with mock.patch.multiple(signals, refresh_product_prices=refresh, bump_version=bump):
+            self.promotion.delete()
+        self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(bump.call_count, 1)
+        self.assert_price(0, '100.00')
+        self.assertEqual(
+            set(Product.objects.values_list('max_discount_amount', flat=True)), {0})
+        self.assertFalse(signals.get_deleted_promotion_ids())
+
+    def test_remove_promotion(self):
+        product_to_promotion = ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        product_to_promotion.delete()
+        self.assert_price(0, '100.00')
+
+    def test_change_promotion(self):
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        self.promotion.discount_amount = 33
+        self.promotion.save()
+        self.assert_price(33, '67.00')
+
+    def test_change_price(self):
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        self.product.refresh_from_db()
+        self.product.price = Decimal('9.99')
+        self.product.save()
+        self.assert_price(10, '8.99')
+
+    def test_stale_instance(self):
+        stale_product = Product.objects.get(pk=self.product.pk)
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        stale_product.title = 'B'
+        stale_product.save()
+        self.assert_price(10, '90.00')
+        stale_product.price = Decimal('50.00')
+        stale_product.save()
+        self.assertEqual(stale_product.discounted_price, Decimal('45.00'))
+        self.assert_price(10, '45.00')
+
+    def test_m2m_managers(self):
+        self.product.promotions.add(self.promotion)
+        self.assert_price(10, '90.00')
+        self.product.promotions.remove(self.promotion)
+        self.assert_price(0, '100.00')
+        self.promotion.products.add(self.product)
+        self.assert_price(10, '90.00')
+        self.promotion.products.clear()
+        self.assert_price(0, '100.00')
+        self.promotion.products.set([self.product])
+        self.assert_price(10, '90.00')
+        self.product.promotions.clear()
+        self.assert_price(0, '100.00')
+
+    def test_m2m_managers_bump_catalog(self):
+        version = get_version(CATALOG_VERSION_KEY)
+        self.promotion.products.add(self.product)
+        self.assertNotEqual(get_version(CATALOG_VERSION_KEY), version)
+
+    def test_date_boundary(self):
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        tomorrow = get_current_date() + timedelta(days=1)
+        self.assertEqual(refresh_stale_prices(tomorrow), 1)
+        self.assert_price(0, '100.00')
+        self.assertEqual(refresh_stale_prices(tomorrow), 0)
+
+    def test_upcoming_promotion(self):
+        tomorrow = get_current_date() + timedelta(days=1)
+        upcoming_promotion = Promotion.objects.create(
+            title='B', discount_amount=50, start_date=tomorrow, end_date=tomorrow)
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=upcoming_promotion)
+        self.assert_price(0, '100.00')
+        refresh_stale_prices(tomorrow)
+        self.assert_price(50, '50.00')
+
+    def test_price_cache(self):
+        self.assertEqual(get_product_price(self.product.id), Decimal('100.00'))
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        self.assertEqual(get_product_price(str(self.product.id).upper()), Decimal('90.00'))
+        self.assertIsNone(get_product_price('invalid'))
+        other = Product.objects.create(title='B', price=5, category=self.category)
+        with self.assertNumQueries(1):
+            prices = get_product_prices([self.product.id, other.id])
+        self.assertEqual(prices, {str(self.product.id): 90, str(other.id): 5})
+        with self.assertNumQueries(0):
+            get_product_prices([self.product.id, other.id])
+
+    def test_refresh_prices_command(self):
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        Product.objects.update(max_discount_amount=0, discounted_price=None)
+        call_command('refresh_prices', stdout=StringIO())
+        self.assert_price(10, '90.00')
+
+    def test_product_page(self):
+        ProductToPromotion.objects.create(
+            product=self.product, promotion=self.promotion)
+        user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=user)
+        client = test_client.Client()
+        client.force_login(user)
+        response = client.get(f'/product/?id={self.product.id}')
+        self.assertEqual(response.context['price_with_max_discount_amount'], Decimal('90.00'))
+        self.assertEqual(response.context['max_discount_amount'], 10)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.client import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+
+from grocery_store_app.models import (Category, Client, Product, Review,
+                                      get_current_datetime)
+from grocery_store_app.pagination import KeysetPaginator
+from grocery_store_app.pricing import refresh_stale_prices
+from grocery_store_app.views import PRODUCT_REVIEWS_PAGE_SIZE
+
+
+class TestProductReviews(TestCase):
+    def setUp(self):
+        refresh_stale_prices()
+        self.client = TestClient()
+        self.user = User.objects.create(username='user', password='user')
+        self.grocery_store_client = Client.objects.create(user=self.user)
+        self.client.force_login(user=self.user)
+        category = Category.objects.create(title='Cheeses')
+        self.product = Product.objects.create(title='Gouda', price=10, category=category)
+        now = get_current_datetime()
+        self.reviews = []
+        for index in range(PRODUCT_REVIEWS_PAGE_SIZE * 2 + 5):
+            review = Review.objects.create(
+                text=f'Review {index}', rating=index % 5 + 1,
+                product=self.product, client=self.grocery_store_client,
+            )
+            review.created_datetime = now - timedelta(minutes=index // 2)
+            review.save()
+            self.reviews.append(review)
+
+    def get_page(self, cursor=None):
+        query = {'id': self.product.id}
+        if cursor:
+            query['cursor'] = cursor
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/product_reviews/', query)
+        return response, queries
+
+    def test_newest_first(self):
+        response, queries = self.get_page()
+        self.assertEqual(len(queries), 3)
+        walked = list(response.context['reviews'])
+        while response.context['reviews'].has_next:
+            response, queries = self.get_page(response.context['reviews'].next_cursor)
+            self.assertEqual(len(queries), 3)
+            walked.extend(response.context['reviews'])
+        self.assertEqual(
+            [review.id for review in walked],
+            [review.id for review in sorted(
+                self.reviews, key=lambda review: (-review.created_datetime.timestamp(), review.pk),
+            )],
+        )
+        self.assertContains(response, 'Delete review')
+        self.assertNotContains(response, 'reviews-more')
+
+    def test_no_reviews(self):
+        Review.objects.all().delete()
+        response, _ = self.get_page()
+        self.assertContains(response, 'The product has no reviews yet.')
+        self.assertEqual(self.client.get('/product_reviews/?id=invalid').status_code, 404)
+
+    def test_product_page(self):
+        response = self.client.get('/product/', {'id': self.product.id})
+        self.assertContains(response, f'/product_reviews/?id={self.product.id}')
+        self.assertNotContains(response, 'Review 0')
+
+    def test_seek_plan(self):
+        paginator = KeysetPaginator(
+            Review.objects.filter(product=self.product), PRODUCT_REVIEWS_PAGE_SIZE,
+            ordering=('-created_datetime',), count=False,
+        )
+        review = self.reviews[PRODUCT_REVIEWS_PAGE_SIZE * 2]
+        queryset = paginator.queryset.annotate(**paginator.keys).filter(
+            paginator.get_filter([str(review.created_datetime), str(review.pk)], backwards=False),
+        ).order_by(*paginator.get_key_ordering(backwards=False))
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset[:PRODUCT_REVIEWS_PAGE_SIZE + 1].explain()
+        self.assertIn('reviews_product_newest', plan)
+        index_condition = next(line for line in plan.splitlines() if 'Index Cond' in line)
+        self.assertIn('created_datetime <=', index_condition)
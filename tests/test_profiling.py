@@ -0,0 +1,127 @@
+import pstats
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.client import Client as TestClient
+from django.urls import reverse
+
+from grocery_store_app.models import Category, Client, Product
+from grocery_store_app.pricing import refresh_stale_prices
+from grocery_store_app.profiling import (PROFILER_LOCK, PROFILING_SALT,
+                                         create_profiling_token,
+                                         get_profile_path,
+                                         is_valid_profiling_token,
+                                         profile_request)
+
+
+class TestProfilingToken(TestCase):
+    def test_valid(self):
+        self.assertTrue(is_valid_profiling_token(create_profiling_token()))
+
+    def test_invalid(self):
+        self.assertFalse(is_valid_profiling_token('profile'))
+        self.assertFalse(is_valid_profiling_token(f'{create_profiling_token()}x'))
+        other_token = signing.TimestampSigner(salt=PROFILING_SALT).sign('other')
+        self.assertFalse(is_valid_profiling_token(other_token))
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command('create_profiling_token', stdout=stdout)
+        token = stdout.getvalue().splitlines()[0].removeprefix('X-Profile: ')
+        self.assertTrue(is_valid_profiling_token(token))
+
+
+class TestProfilingMiddleware(TestCase):
+    def setUp(self):
+        refresh_stale_prices()
+        self.user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=self.user)
+        self.category = Category.objects.create(title='Сыры')
+        Product.objects.create(title='Gouda', price=10, category=self.category)
+        profile_directory = TemporaryDirectory()
+        self.addCleanup(profile_directory.cleanup)
+        self.directory = Path(profile_directory.name)
+        profiling_settings = override_settings(PROFILING_DIRECTORY=str(self.directory))
+        profiling_settings.enable()
+        self.addCleanup(profiling_settings.disable)
+        self.client = TestClient()
+        self.client.force_login(user=self.user)
+
+    def get_category(self, **extra):
+        return self.client.get(reverse('category'), {'id': self.category.id}, **extra)
+
+    def test_not_requested(self):
+        response = self.get_category()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('X-Profile'))
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    def test_signed_header(self):
+        response = self.get_category(HTTP_X_PROFILE=create_profiling_token())
+        self.assertEqual(response.status_code, 200)
+        name = response['X-Profile']
+        self.assertTrue(name.endswith('-get-category.prof'))
+        stats = pstats.Stats(str(self.directory / name))
+        self.assertTrue(any(
+            filename.endswith('grocery_store_app/views.py') for filename, _, _ in stats.stats
+        ))
+
+    def test_invalid_header(self):
+        response = self.get_category(HTTP_X_PROFILE='profile')
+        self.assertFalse(response.has_header('X-Profile'))
+
+    def test_query_parameter(self):
+        response = self.client.get(reverse('category'), {'id': self.category.id, 'profile': ''})
+        self.assertFalse(response.has_header('X-Profile'))
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('category'), {'id': self.category.id, 'profile': ''})
+        self.assertTrue(response.has_header('X-Profile'))
+
+    def test_profiles_view(self):
+        name = self.get_category(HTTP_X_PROFILE=create_profiling_token())['X-Profile']
+        response = self.client.get(reverse('profiling'))
+        self.assertEqual(response.status_code, 302)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('profiling'))
+        self.assertContains(response, name)
+        response = self.client.get(reverse('profiling_download', args=(name,)))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            b''.join(response.streaming_content), (self.directory / name).read_bytes())
+        response = self.client.get(reverse('profiling_download', args=('missing.prof',)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_profile_path(self):
+        (self.directory / 'captured.prof').touch()
+        (self.directory / 'captured.txt').touch()
+        self.assertEqual(get_profile_path('captured.prof'), self.directory / 'captured.prof')
+        self.assertIsNone(get_profile_path('captured.txt'))
+        self.assertIsNone(get_profile_path('../captured.prof'))
+
+    def test_failed_request(self):
+        def get_response(request):
+            raise RuntimeError('handler failed')
+
+        with self.assertRaises(RuntimeError):
+            profile_request(get_response, RequestFactory().get('/'))
+        self.assertTrue(PROFILER_LOCK.acquire(blocking=False))
+        PROFILER_LOCK.release()
+        response = self.get_category(HTTP_X_PROFILE=create_profiling_token())
+        self.assertTrue(response.has_header('X-Profile'))
+
+
+class TestProfilingDisabled(TestCase):
+    def test_disabled(self):
+        user = User.objects.create(username='user', password='user', is_staff=True)
+        client = TestClient()
+        client.force_login(user=user)
+        response = client.get(reverse('homepage'), {'profile': ''})
+        self.assertFalse(response.has_header('X-Profile'))
+        self.assertIsNone(get_profile_path('captured.prof'))
@@ -0,0 +1,140 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from grocery_store_app.cart import CART_SESSION_KEY
+from grocery_store_app.generating import generate_dataset
+from grocery_store_app.models import Client, Product, Promotion, Review
+from grocery_store_app.pricing import refresh_stale_prices
+from grocery_store_app.urls import router, urlpatterns
+from tests.query_budgets import QUERY_BUDGETS
+
+SMALL_SIZE = 500
+LARGE_SIZE = 10 * SMALL_SIZE
+# list views without templates and the client API linking to users without an API
+UNRENDERED_URL_NAMES = frozenset(('reviews', 'clients', 'client-list', 'client-detail'))
+
+
+def get_url_names():
+    patterns = [pattern for pattern in urlpatterns if isinstance(pattern, URLPattern)]
+    return {pattern.name for pattern in [*patterns, *router.urls]}
+
+
+class TestQueryBudgets(TestCase):
+    def setUp(self):
+        cache.clear()
+        refresh_stale_prices()
+        self.client = APIClient()
+        profile_directory = TemporaryDirectory()
+        self.addCleanup(profile_directory.cleanup)
+        Path(profile_directory.name, 'captured.prof').touch()
+        profiling_settings = override_settings(PROFILING_DIRECTORY=profile_directory.name)
+        profiling_settings.enable()
+        self.addCleanup(profiling_settings.disable)
+
+    def seed(self, rows):
+        generate_dataset(rows, seed=rows)
+        self.products = list(Product.objects.order_by('-rating_count', 'id'))
+        self.promotion = Promotion.objects.annotate(
+            product_count=Count('producttopromotion'),
+        ).order_by('-product_count', 'id').first()
+        self.review = Review.objects.filter(product=self.products[0]).first()
+        self.grocery_store_client = Client.objects.annotate(
+            purchase_count=Count('clienttoproduct'),
+        ).order_by('-purchase_count', 'id').first()
+        self.grocery_store_client.money = 9999999
+        self.grocery_store_client.save(update_fields=['money'])
+        self.user = self.grocery_store_client.user
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        self.token, _ = Token.objects.get_or_create(user=self.user)
+        self.client.force_login(user=self.user)
+
+    def fill_cart(self):
+        session = self.client.session
+        session[CART_SESSION_KEY] = {str(product.id): 1 for product in self.products}
+        session.save()
+
+    def get_requests(self):
+        product = self.products[0]
+        product_query = {'id': product.id}
+        review = Review.objects.create(
+            text='Deleted', rating=5, product=product, client=self.grocery_store_client)
+        review_query = {'id': product.id, 'text': review.text, 'rating': review.rating}
+        return {
+            'register': ('get', reverse('register'), {}),
+            'homepage': ('get', reverse('homepage'), {}),
+            'categories': ('get', reverse('categories'), {}),
+            'category': ('get', reverse('category'), {'id': product.category_id}),
+            'products': ('get', reverse('products'), {}),
+            'product': ('get', reverse('product'), product_query),
+            'product_reviews': ('get', reverse('product_reviews'), product_query),
+            'promotions': ('get', reverse('promotions'), {}),
+            'promotion': ('get', reverse('promotion'), {'id': self.promotion.id}),
+            'profile': ('get', reverse('profile'), {}),
+            'order': ('post', f"{reverse('order')}?id={product.id}", {'quantity': 1}),
+            'cancel_order': (
+                'post', f"{reverse('cancel_order')}?id={product.id}", {'returned_quantity': 1},
+            ),
+            'cart': ('get', reverse('cart'), {}),
+            'add_to_cart': ('post', reverse('add_to_cart'), {'id': product.id, 'quantity': 1}),
+            'remove_from_cart': ('post', reverse('remove_from_cart'), product_query),
+            'checkout_cart': ('post', reverse('checkout_cart'), {}),
+            'add_review': ('get', reverse('add_review'), review_query),
+            'delete_review': ('post', reverse('delete_review'), review_query),
+            'export': ('get', reverse('export', args=('products', 'csv')), {}),
+            'profiling': ('get', reverse('profiling'), {}),
+            'metrics': ('get', reverse('metrics'), {}),
+            'profiling_download': (
+                'get', reverse('profiling_download', args=('captured.prof',)), {},
+            ),
+            'api-root': ('get', reverse('api-root'), {}),
+            **{
+                f'{basename}-list': ('get', reverse(f'{basename}-list'), {})
+                for basename in ('category', 'product', 'promotion', 'review')
+            },
+            'category-detail': ('get', reverse('category-detail', args=(product.category_id,)), {}),
+            'product-detail': ('get', reverse('product-detail', args=(product.id,)), {}),
+            'promotion-detail': ('get', reverse('promotion-detail', args=(self.promotion.id,)), {}),
+            'review-detail': ('get', reverse('review-detail', args=(self.review.id,)), {}),
+        }
+
+    def count_queries(self, url_name, method, url, data):
+        cache.clear()
+        self.fill_cart()
+        self.client.force_authenticate(user=self.user, token=self.token)
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 400, url_name)
+        return len(queries)
+
+    def measure(self, rows):
+        self.seed(rows)
+        return {
+            url_name: self.count_queries(url_name, *request)
+            for url_name, request in self.get_requests().items()
+        }
+
+    def test_every_url_has_budget(self):
+        self.assertEqual(set(QUERY_BUDGETS), get_url_names())
+
+    def test_budgets(self):
+        small_counts = self.measure(SMALL_SIZE)
+        large_counts = self.measure(LARGE_SIZE)
+        self.assertEqual(set(small_counts), get_url_names() - UNRENDERED_URL_NAMES)
+        for url_name, budget in QUERY_BUDGETS.items():
+            if url_name in UNRENDERED_URL_NAMES:
+                continue
+            with self.subTest(url_name=url_name):
+                self.assertEqual(large_counts[url_name], small_counts[url_name])
+                self.assertLessEqual(large_counts[url_name], budget)
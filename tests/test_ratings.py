@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from grocery_store_app.models import Category, Client, Product, Review
+
+
+class TestRatings(TestCase):
+    def setUp(self) -> None:
+        self.category = Category.objects.create(title='A')
+        self.product = Product.objects.create(
+            title='A', price=100.00, category=self.category)
+        self.user = User.objects.create(username='user', password='user')
+        self.client_obj = Client.objects.create(user=self.user)
+
+    def create_review(self, rating, product=None):
+        return Review.objects.create(
+            text='A', rating=rating, product=product or self.product, client=self.client_obj)
+
+    def assert_ratings(self, rating_count, rating_sum, average_rating):
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.rating_count, rating_count)
+        self.assertEqual(self.product.rating_sum, rating_sum)
+        self.assertEqual(self.product.average_rating, average_rating)
+
+    def test_no_reviews(self):
+        self.assert_ratings(0, 0, 0)
+
+    def test_create(self):
+        self.create_review(5)
+        self.create_review(4)
+        self.create_review(4)
+        self.assert_ratings(3, 13, 4.3)
+
+    def test_update(self):
+        review = self.create_review(5)
+        review.rating = 2
+        review.save()
+        self.assert_ratings(1, 2, 2)
+
+    def test_move_to_other_product(self):
+        other_product = Product.objects.create(
+            title='B', price=10.00, category=self.category)
+        review = self.create_review(3)
+        review.product = other_product
+        review.save()
+        self.assert_ratings(0, 0, 0)
+        other_product.refresh_from_db()
+        self.assertEqual(other_product.average_rating, 3)
+
+    def test_stale_instance(self):
+        stale_product = Product.objects.get(pk=self.product.pk)
+        self.create_review(4)
+        stale_product.title = 'B'
+        stale_product.save()
+        self.assertEqual(stale_product.rating_count, 1)
+        self.assert_ratings(1, 4, 4)
+
+    def test_delete(self):
+        self.create_review(5)
+        self.create_review(1).delete()
+        self.assert_ratings(1, 5, 5)
+        Review.objects.all().delete()
+        self.assert_ratings(0, 0, 0)
+
+    def test_rebuild_ratings_command(self):
+        self.create_review(5)
+        self.create_review(2)
+        Product.objects.update(rating_count=0, rating_sum=0)
+        call_command('rebuild_ratings', stdout=StringIO())
+        self.assert_ratings(2, 7, 3.5)
+
+    def test_api(self):
+        self.create_review(4)
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.user, token=Token.objects.create(user=self.user))
+        response = api_client.get(f'/rest/products/{self.product.id}/')
+        self.assertEqual(response.data['average_rating'], 4)
+        self.assertEqual(response.data['rating_count'], 1)
@@ -0,0 +1,138 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.signals import request_finished
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.client import Client as TestClient
+from django.urls import reverse
+
+from grocery_store_app.middleware import SlowQueryMiddleware
+from grocery_store_app.models import Category, Client, Product, SlowQuery
+from grocery_store_app.pricing import refresh_stale_prices
+from grocery_store_app.slow_queries import (can_analyze, cap_slow_queries,
+                                            get_plan)
+
+RECORD_ALL = {'SLOW_QUERY_THRESHOLD_MS': 0.001, 'SLOW_QUERY_EXPLAIN_RATE': 1}
+
+
+class TestSlowQueries(TestCase):
+    def setUp(self):
+        refresh_stale_prices()
+        self.user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=self.user)
+        self.category = Category.objects.create(title='Сыры')
+        self.product = Product.objects.create(title='Gouda', price=10, category=self.category)
+        self.client = TestClient()
+        self.client.force_login(user=self.user)
+
+    def get_category(self):
+        return self.client.get(reverse('category'), {'id': self.category.id})
+
+    def get_recorded_category(self):
+        with self.assertLogs('grocery_store_app.slow_queries', 'WARNING'):
+            return self.get_category()
+
+    def test_below_threshold(self):
+        self.assertEqual(self.get_category().status_code, 200)
+        self.assertFalse(SlowQuery.objects.exists())
+
+    @override_settings(**RECORD_ALL)
+    def test_recorded(self):
+        with self.assertLogs('grocery_store_app.slow_queries', 'WARNING') as logs:
+            self.assertEqual(self.get_category().status_code, 200)
+        slow_query = SlowQuery.objects.get(view='category', sql__contains='"products"')
+        self.assertEqual(slow_query.path, reverse('category'))
+        self.assertIn(str(self.category.id), slow_query.statement_arguments)
+        self.assertIn('grocery_store_app/views.py', slow_query.stack)
+        self.assertIn('actual time', slow_query.plan)
+        self.assertIn('Buffers', slow_query.plan)
+        self.assertEqual(len(logs.records), SlowQuery.objects.count())
+        self.assertEqual(logs.records[0].view, SlowQuery.objects.order_by('id').first().view)
+
+    @override_settings(**RECORD_ALL)
+    def test_plans_after_response(self):
+        def get_response(request):
+            Product.objects.count()
+            return HttpResponse()
+
+        with mock.patch('grocery_store_app.slow_queries.get_plan', return_value='plan') as plan:
+            with self.assertLogs('grocery_store_app.slow_queries', 'WARNING'):
+                response = SlowQueryMiddleware(get_response)(RequestFactory().get('/'))
+                self.assertFalse(plan.called)
+                self.assertFalse(SlowQuery.objects.exists())
+                # like the test client, keep the connection of the test transaction open
+                request_finished.disconnect(close_old_connections)
+                self.addCleanup(request_finished.connect, close_old_connections)
+                response.close()
+        self.assertTrue(plan.called)
+        self.assertEqual(SlowQuery.objects.get().plan, 'plan')
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0.001, SLOW_QUERY_EXPLAIN_RATE=0)
+    def test_not_sampled(self):
+        self.get_recorded_category()
+        self.assertTrue(SlowQuery.objects.exists())
+        self.assertFalse(SlowQuery.objects.exclude(plan='').exists())
+
+    @override_settings(**RECORD_ALL, SLOW_QUERY_LOG_SIZE=3)
+    def test_capped(self):
+        self.get_recorded_category()
+        newest_ids = list(SlowQuery.objects.order_by('-id').values_list('id', flat=True)[:3])
+        self.get_recorded_category()
+        self.assertEqual(SlowQuery.objects.count(), 3)
+        self.assertFalse(SlowQuery.objects.filter(id__in=newest_ids).exists())
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_disabled(self):
+        self.get_category()
+        self.assertFalse(SlowQuery.objects.exists())
+
+    def test_write_plan(self):
+        plan = get_plan(
+            'UPDATE "grocery_store"."products" SET price = %s WHERE id = %s',
+            [20, self.product.id],
+        )
+        self.assertIn('Update on products', plan)
+        self.assertNotIn('actual time', plan)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.price, 10)
+
+    def test_select_plans(self):
+        products_sql = 'SELECT id FROM "grocery_store"."products"'
+        self.assertIn('actual time', get_plan(f'{products_sql} WHERE price > %s', [1]))
+        for sql in (
+            f'{products_sql} FOR UPDATE',
+            f'{products_sql} FOR NO KEY UPDATE',
+            f'{products_sql} for share',
+            f'{products_sql} FOR KEY SHARE SKIP LOCKED',
+            f'{products_sql} WHERE price > random()',
+            "SELECT nextval('seq'), pg_advisory_lock (1)",
+        ):
+            with self.subTest(sql=sql):
+                self.assertFalse(can_analyze(sql))
+        self.assertNotIn('actual time', get_plan(f'{products_sql} FOR SHARE', []))
+        self.assertTrue(can_analyze(f'{products_sql} WHERE title = upper(%s)'))
+
+    def test_failed_plan(self):
+        self.assertTrue(get_plan('SELECT missing', []).startswith('EXPLAIN failed'))
+        self.assertTrue(Product.objects.exists())
+
+    def test_cap(self):
+        SlowQuery.objects.bulk_create(
+            SlowQuery(sql=f'SELECT {number}', duration=number) for number in range(5)
+        )
+        cap_slow_queries(2)
+        self.assertEqual(
+            list(SlowQuery.objects.order_by('id').values_list('sql', flat=True)),
+            ['SELECT 3', 'SELECT 4'],
+        )
+
+    def test_admin(self):
+        SlowQuery.objects.create(sql='SELECT 1', duration=600, view='category')
+        admin = User.objects.create_superuser(username='admin', password='admin')
+        self.client.force_login(user=admin)
+        response = self.client.get(reverse('admin:grocery_store_app_slowquery_changelist'))
+        self.assertContains(response, 'SELECT 1')
+        response = self.client.get(reverse('admin:grocery_store_app_slowquery_add'))
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,134 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from grocery_store_app.models import (Category, Client, Product,
+                                      ProductToPromotion, Promotion, Review)
+from grocery_store_app.views import ProductViewSet
+
+
+class TestSparseFields(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='user')
+        client = Client.objects.create(user=self.user, money=1000)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user, token=Token.objects.create(user=self.user))
+        category = Category.objects.create(title='Сыры', description='Твёрдые')
+        promotions = [
+            Promotion.objects.create(title=f'Sale {number}', discount_amount=10)
+            for number in range(3)
+        ]
+        for number in range(6):
+            product = Product.objects.create(
+                title=f'Product {number}',
+                description='Long description ' * 100,
+                price=Decimal(f'{number + 1}.5'),
+                category=category,
+            )
+            for promotion in promotions[:number % 4]:
+                ProductToPromotion.objects.create(product=product, promotion=promotion)
+            Review.objects.create(
+                text=f'Review {number}', rating=number % 5 + 1, product=product, client=client,
+            )
+        Product.objects.rebuild_ratings()
+        self.product = Product.objects.get(title='Product 3')
+
+    def get_json(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.json()
+
+    def test_fields(self):
+        url = '/rest/products/?fields=url,title,price'
+        with CaptureQueriesContext(connection) as queries:
+            payload = self.get_json(url)
+        for product in payload['results']:
+            self.assertEqual(list(product), ['url', 'title', 'price'])
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('"description"', sql)
+        self.assertLess(
+            len(self.client.get(url).content), len(self.client.get('/rest/products/').content) / 5,
+        )
+
+    def test_fields_of_property(self):
+        payload = self.get_json(f'/rest/products/{self.product.id}/?fields=average_rating')
+        self.assertEqual(payload, {'average_rating': self.product.average_rating})
+
+    def test_next_page_with_fields(self):
+        payload = self.get_json('/rest/products/?fields=title&page_size=4')
+        self.assertIn('fields=title', payload['next'])
+        next_payload = self.get_json(payload['next'])
+        titles = [product['title'] for product in payload['results'] + next_payload['results']]
+        self.assertEqual(sorted(titles), [f'Product {number}' for number in range(6)])
+
+    def test_expand_category_and_promotions(self):
+        with self.assertNumQueries(3):
+            payload = self.get_json(
+                f'/rest/products/{self.product.id}/?expand=category,promotions',
+            )
+        links = self.get_json(f'/rest/products/{self.product.id}/')
+        self.assertEqual(payload['category'], self.get_json(links['category']))
+        self.assertEqual(len(payload['promotions']), 3)
+        self.assertEqual(
+            payload['promotions'], [self.get_json(url) for url in links['promotions']],
+        )
+        self.assertEqual(payload['title'], links['title'])
+
+    def test_expanded_list(self):
+        with self.assertNumQueries(3):
+            payload = self.get_json('/rest/products/?fields=title,promotions&expand=promotions')
+        for product in payload['results']:
+            number = int(product['title'].split()[-1])
+            self.assertEqual(len(product['promotions']), number % 4)
+            for promotion in product['promotions']:
+                self.assertEqual(promotion, self.get_json(promotion['url']))
+
+    def test_expand_product_of_reviews(self):
+        payload = self.get_json('/rest/reviews/?expand=product')
+        for review in payload['results']:
+            self.assertEqual(review['product'], self.get_json(review['product']['url']))
+
+    def test_expand_products_of_promotions(self):
+        payload = self.get_json('/rest/promotions/?fields=title,products&expand=products')
+        titles = {
+            promotion['title']: {product['title'] for product in promotion['products']}
+            for promotion in payload['results']
+        }
+        self.assertEqual(titles['Sale 0'], {'Product 1', 'Product 2', 'Product 3', 'Product 5'})
+        self.assertEqual(titles['Sale 2'], {'Product 3'})
+
+    def test_expand_unselected(self):
+        payload = self.get_json(f'/rest/products/{self.product.id}/?fields=title&expand=category')
+        self.assertEqual(payload, {'title': 'Product 3'})
+
+    def test_invalid(self):
+        for url, parameter in (
+            ('/rest/products/?fields=title,secret', 'fields'),
+            ('/rest/products/?expand=title', 'expand'),
+            ('/rest/categories/?expand=products', 'expand'),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(parameter, response.json())
+
+    def test_empty_parameters(self):
+        self.assertEqual(
+            self.client.get('/rest/products/?fields=&expand=').content,
+            self.client.get('/rest/products/').content,
+        )
+
+    def test_projection_cache(self):
+        values_serializer = ProductViewSet.values_serializer_class
+        projected = values_serializer.project(QueryDict('fields=title,price&expand=category'))
+        self.assertIs(
+            values_serializer.project(QueryDict('fields=price,title&expand=category')), projected,
+        )
+        self.assertIs(values_serializer.project(QueryDict('')), values_serializer)
+        self.assertEqual(projected.columns, ('pk', 'title', 'price'))
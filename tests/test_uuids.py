@@ -0,0 +1,64 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from grocery_store_app.models import (Category, ClientToProduct, Product,
+                                      Promotion, Review, uuid7)
+
+
+class TestUUID7(TestCase):
+    def test_version(self):
+        uuid = uuid7()
+        self.assertEqual(uuid.version, 7)
+        self.assertEqual(uuid.variant, 'specified in RFC 4122')
+
+    def test_timestamp(self):
+        with mock.patch('grocery_store_app.models.time_ns', return_value=1700000000123456789):
+            with mock.patch.dict('grocery_store_app.models.uuid7_state', {'timestamp': 0}):
+                uuid = uuid7()
+        self.assertEqual(uuid.int >> 80, 1700000000123)
+        self.assertEqual(uuid.int >> 64 & 0xFFF, 456789 * 4096 // 1000000)
+
+    def test_same_fraction(self):
+        with mock.patch('grocery_store_app.models.time_ns', return_value=1700000000123456789):
+            with mock.patch.dict('grocery_store_app.models.uuid7_state', {'timestamp': 0}):
+                ids = [uuid7() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(uuid.version == 7 for uuid in ids))
+
+    def test_order_across_milliseconds(self):
+        with mock.patch.dict('grocery_store_app.models.uuid7_state', {'timestamp': 0}):
+            with mock.patch('grocery_store_app.models.time_ns', return_value=1999999999):
+                earlier = uuid7()
+            with mock.patch('grocery_store_app.models.time_ns', return_value=2000000000):
+                later = uuid7()
+        self.assertLess(earlier, later)
+        self.assertEqual((earlier.int >> 80, later.int >> 80), (1999, 2000))
+
+    def test_clock_going_back(self):
+        with mock.patch.dict('grocery_store_app.models.uuid7_state', {'timestamp': 0}):
+            with mock.patch('grocery_store_app.models.time_ns', return_value=2000000000):
+                earlier = uuid7()
+            with mock.patch('grocery_store_app.models.time_ns', return_value=1000000000):
+                later = uuid7()
+        self.assertLess(earlier, later)
+
+    def test_model_defaults(self):
+        category = Category.objects.create(title='Сыры')
+        product = Product.objects.create(title='Гауда', price=100, category=category)
+        self.assertEqual(product.id.version, 7)
+        self.assertEqual(category.id.version, 4)
+        for model_class in (Product, Review, ClientToProduct):
+            self.assertEqual(model_class._meta.pk.default, uuid7)
+        self.assertNotEqual(Promotion._meta.pk.default, uuid7)
+
+    def test_benchmark(self):
+        stdout = StringIO()
+        call_command('benchmark_uuids', '--rows', '3000', '--batch-size', '1000', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('uuid4', output)
+        self.assertIn('uuid7', output)
+        self.assertEqual(output.count('Primary key:'), 2)
@@ -0,0 +1,126 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from grocery_store_app.models import (Category, Client, ClientToProduct,
+                                      Product, ProductToPromotion, Promotion,
+                                      Review)
+from grocery_store_app.pricing import refresh_product_prices
+from grocery_store_app.serializers import (ProductSerializer,
+                                           create_values_serializer)
+from grocery_store_app.views import (CategoryViewSet, ProductViewSet,
+                                     PromotionViewSet, ReviewViewSet)
+
+VIEWSETS = {
+    'categories': CategoryViewSet,
+    'products': ProductViewSet,
+    'promotions': PromotionViewSet,
+    'reviews': ReviewViewSet,
+}
+
+
+class TestValuesSerializers(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='user')
+        client = Client.objects.create(user=self.user, money=1000)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user, token=Token.objects.create(user=self.user))
+        categories = [
+            Category.objects.create(title='Сыры', description=None),
+            Category.objects.create(title='Соки', description='Свежие'),
+        ]
+        # equal discounts make the order of the linked promotions depend on their ids
+        promotions = [
+            Promotion.objects.create(title=f'Sale {number}', discount_amount=10)
+            for number in range(3)
+        ]
+        for number in range(25):
+            product = Product.objects.create(
+                title=f'Product {number}', price=Decimal(f'{number + 1}.5'), category=categories[number % 2],
+            )
+            for promotion in promotions[:number % 4]:
+                ProductToPromotion.objects.create(product=product, promotion=promotion)
+            Review.objects.create(
+                text=f'Review {number}', rating=number % 5 + 1, product=product, client=client,
+            )
+            ClientToProduct.objects.create(client=client, product=product, price=1, quantity=1)
+        Product.objects.rebuild_ratings()
+        refresh_product_prices()
+        self.product = Product.objects.order_by('id').first()
+
+    def get_content(self, viewset, url, fast):
+        values_serializer_class = viewset.values_serializer_class if fast else None
+        with mock.patch.object(viewset, 'values_serializer_class', values_serializer_class):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.content
+
+    def assert_identical(self, viewset, url):
+        self.assertEqual(
+            self.get_content(viewset, url, fast=True), self.get_content(viewset, url, fast=False),
+        )
+
+    def test_lists(self):
+        for route, viewset in VIEWSETS.items():
+            for url in (f'/rest/{route}/', f'/rest/{route}/?page_size=100', f'/rest/{route}.json'):
+                with self.subTest(url=url):
+                    self.assert_identical(viewset, url)
+
+    def test_next_page(self):
+        response = self.client.get('/rest/products/?page_size=10')
+        next_url = response.json()['next']
+        self.assertIsNotNone(next_url)
+        self.assert_identical(ProductViewSet, next_url)
+
+    def test_details(self):
+        instances = {
+            'categories': self.product.category,
+            'products': self.product,
+            'promotions': Promotion.objects.first(),
+            'reviews': Review.objects.first(),
+        }
+        for route, viewset in VIEWSETS.items():
+            for url in (
+                f'/rest/{route}/{instances[route].id}/',
+                f'/rest/{route}/{instances[route].id}.json',
+            ):
+                with self.subTest(url=url):
+                    self.assert_identical(viewset, url)
+
+    def test_missing(self):
+        for url in (f'/rest/products/{Category.objects.first().id}/', '/rest/products/1/'):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_product_payload(self):
+        payload = self.client.get(f'/rest/products/{self.product.id}/').json()
+        self.assertEqual(payload['url'], f'http://testserver/rest/products/{self.product.id}/')
+        self.assertEqual(
+            payload['category'], f'http://testserver/rest/categories/{self.product.category_id}/',
+        )
+        self.assertEqual(payload['average_rating'], self.product.average_rating)
+        self.assertEqual(payload['price'], str(self.product.price))
+
+    def test_browsable_api(self):
+        response = self.client.get('/rest/products/', HTTP_ACCEPT='text/html')
+        self.assertContains(response, '&quot;Product 24&quot;')
+
+    def test_columns(self):
+        values_serializer = create_values_serializer(ProductSerializer)
+        self.assertEqual(values_serializer.columns[0], 'pk')
+        self.assertIn('category', values_serializer.columns)
+        self.assertNotIn('promotions', values_serializer.columns)
+        self.assertNotIn('average_rating', values_serializer.columns)
+        self.assertEqual([relation for relation, _ in values_serializer.relations], ['promotions'])
+
+    def test_benchmark(self):
+        stdout = StringIO()
+        call_command('benchmark_serializers', '--requests', '2', '--page-size', '10', stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn('/rest/products/?page_size=10', output)
+        self.assertEqual(output.count('Speedup: '), len(VIEWSETS))
@@ -1,11 +1,15 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.test.client import Client as TestClient
 from django.urls import reverse
 from rest_framework import status
 
-from grocery_store_app.models import (Category, Client, Product, Promotion,
-                                      Review)
+from grocery_store_app.models import (Category, Client, Product,
+                                      ProductToPromotion, Promotion, Review)
+from grocery_store_app.pricing import refresh_stale_prices
 
 
 def create_method_with_auth(url, page_name, template, login=False):
@@ -130,3 +134,69 @@ methods_intance = {
     f'test_{page[1]}': create_method_instance(
         *page) for page in instance_pages}
 TestInstancePages = type('TestInstancePages', (TestCase,), methods_intance)
+
+
+class TestListQueries(TestCase):
+    def setUp(self):
+        self.client = TestClient()
+        user = User.objects.create(username='user', password='user')
+        Client.objects.create(user=user)
+        self.client.force_login(user=user)
+        refresh_stale_prices()
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_products(self):
+        for index in range(2):
+            category = Category.objects.create(title=f'{index}')
+            Product.objects.create(title=f'{index}', price=1, category=category)
+        few_products_queries = self.count_queries('/products/')
+        for index in range(2, 10):
+            category = Category.objects.create(title=f'{index}')
+            Product.objects.create(title=f'{index}', price=1, category=category)
+        self.assertEqual(self.count_queries('/products/'), few_products_queries)
+
+
+class TestEntityQueries(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = TestClient()
+        user = User.objects.create(username='user', password='user')
+        self.grocery_store_client = Client.objects.create(user=user)
+        self.client.force_login(user=user)
+        self.categories = [Category.objects.create(title=title) for title in ('Сыры', 'Соки')]
+        self.promotion = Promotion.objects.create(title='Sale', discount_amount=10)
+        self.product = self.add_products(1)[0]
+        refresh_stale_prices()
+
+    def add_products(self, count):
+        products = []
+        for index in range(count):
+            product = Product.objects.create(
+                title=f'{index}', price=1, category=self.categories[index % 2])
+            ProductToPromotion.objects.create(product=product, promotion=self.promotion)
+            Review.objects.create(
+                text=f'{index}', rating=5, product=self.product if products else product,
+                client=self.grocery_store_client,
+            )
+            products.append(product)
+        return products
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_constant_queries(self):
+        urls = (
+            f'/category/?id={self.categories[0].id}',
+            f'/promotion/?id={self.promotion.id}',
+            f'/product/?id={self.product.id}',
+        )
+        few_instances_queries = [self.count_queries(url) for url in urls]
+        self.add_products(20)
+        self.assertEqual([self.count_queries(url) for url in urls], few_instances_queries)